@@ -0,0 +1,105 @@
+"""
+Base body benchmark: quadrant + two mirror unions vs. one closed-wire extrusion.
+
+Builds the solid body of every specimen family both ways, reports the
+per-part build time and checks that the closed-wire body has the minimal
+face count (one side face per outline segment plus the two caps).
+
+    python benchmarks/bench_base_body.py [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cadquery as cq
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from cadquery_models.outline import dogbone_outline
+from cadquery_models.profile import base_solid, outline_sketch
+
+# ==============================================================================
+# 1. SPECIMEN FAMILIES
+# ==============================================================================
+# name: (overall length, parallel length, narrow width, grip width, radius, thickness)
+FAMILIES = {
+    "ASTM_D638_TYPE_I": (165.0, 57.0, 13.0, 19.0, 76.0, 3.2),
+    "ASTM_D638_TYPE_II": (183.0, 57.0, 6.0, 19.0, 25.0, 3.2),
+    "ASTM_D638_TYPE_V": (63.5, 9.53, 3.18, 9.53, 12.7, 3.2),
+    "ISO_527-2_Type_1A": (170.0, 80.0, 10.0, 20.0, 60.0, 4.0),
+    "ISO_527-2_Type_1B": (150.0, 60.0, 10.0, 20.0, 60.0, 4.0),
+    "ISO_527-2_Type_2": (200.0, 80.0, 10.0, 20.0, 60.0, 4.0),
+}
+
+
+# ==============================================================================
+# 2. BUILDERS
+# ==============================================================================
+def mirror_union_body(outline, thickness):
+    """
+    Previous construction: top-right quadrant, mirrored across YZ and XZ
+    with two union booleans.
+    """
+    o = outline
+    quarter = (
+        cq.Workplane("XY")
+        .moveTo(0, 0)
+        .lineTo(0, o.y_narrow)
+        .lineTo(o.x_start_arc, o.y_narrow)
+        .radiusArc((o.x_end_arc, o.y_grip), -o.radius)
+        .lineTo(o.x_total, o.y_grip)
+        .lineTo(o.x_total, 0)
+        .close()
+        .extrude(thickness)
+    )
+    return quarter.mirror("YZ", union=True).mirror("XZ", union=True).val()
+
+
+def closed_wire_body(outline, thickness):
+    """
+    Current construction, bypassing the cache so every call really builds.
+    """
+    return base_solid.__wrapped__(outline, thickness)
+
+
+def time_per_part(builder, outline, thickness, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        solid = builder(outline, thickness)
+    return (time.perf_counter() - start) / repeat, solid
+
+
+# ==============================================================================
+# 3. EXECUTION
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="builds per measurement")
+    args = parser.parse_args()
+
+    print(f"{'Specimen':<20} {'mirror+union':>13} {'closed wire':>12} {'speedup':>8} {'faces':>6}  minimal")
+    print("-" * 72)
+
+    all_minimal = True
+    for name, (l0, l2, w_nar, w_grip, rad, thk) in FAMILIES.items():
+        outline = dogbone_outline(l0, l2, w_nar, w_grip, rad)
+
+        t_old, old = time_per_part(mirror_union_body, outline, thk, args.repeat)
+        t_new, new = time_per_part(closed_wire_body, outline, thk, args.repeat)
+
+        # Prism of an n-segment outline: n side faces + top + bottom
+        n_segments = len(outline_sketch(outline).val().Edges())
+        minimal = len(new.Faces()) == n_segments + 2
+        all_minimal = all_minimal and minimal
+
+        if abs(old.Volume() - new.Volume()) > 1e-6 * old.Volume():
+            print(f"[WARNING] {name}: volumes differ ({old.Volume():.4f} vs {new.Volume():.4f})")
+
+        print(f"{name:<20} {t_old * 1000:>10.2f} ms {t_new * 1000:>9.2f} ms "
+              f"{t_old / t_new:>7.2f}x {len(new.Faces()):>6}  {'yes' if minimal else 'NO'}")
+
+    return 0 if all_minimal else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
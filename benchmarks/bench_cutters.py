@@ -0,0 +1,146 @@
+"""
+Cutter build benchmark: holed cross-section built from arrays vs. the
+previous constructions, over a range of cell counts.
+
+Tiles the ISO 527-2 Type 1B outline with honeycomb cells of decreasing size
+and times each way of turning the cells into one holed cross-section:
+
+    bulk       : cutters.cutter_face() on holes passed by cutter_problems()
+                 (wires straight from the arrays, one face in a single
+                 pass, not checked by OCC)
+    makeFace   : the same wires through cq.Face.makeFromWires (orientation
+                 fix of every hole against the others)
+    workplane  : one Workplane.polyline().close() per cell, then extrude
+                 (the original auxetic construction; solid, not a face).
+                 Every cell adds to the parent chain, which the extrude
+                 walks recursively: past a few hundred cells it exceeds
+                 Python's recursion limit ("recursion").
+
+The reference constructions stop at --reference-limit cells. The script
+fits time ~ cells^k over the bulk timings and fails if k exceeds
+--max-exponent (linear growth).
+
+    python benchmarks/bench_cutters.py [--sizes 4,2.8,2,1.4,1,0.7,0.5] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cadquery as cq
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from cadquery_models.cutters import cutter_face, cutter_polygons, cutter_problems, cutter_wires, polygon_cutters, unpadded
+from cadquery_models.outline import dogbone_outline
+from cadquery_models.profile import outline_wire
+from cadquery_models.tiling import specimen_cells
+
+# ISO 527-2 Type 1B
+OUTLINE = (150.0, 60.0, 10.0, 20.0, 60.0)
+THICKNESS = 4.0
+WALL_RATIO = 0.2      # Cell wall as a fraction of the cell size
+PERIMETER_WALL = 0.8
+
+
+# ==============================================================================
+# 1. BUILDERS
+# ==============================================================================
+def bulk_face(outer_wire, cutters):
+    return cutter_face(outer_wire, cutters, check=False)
+
+
+def make_face(outer_wire, cutters):
+    return cq.Face.makeFromWires(outer_wire, cutter_wires(cutters))
+
+
+def workplane_chain(outer_wire, cutters):
+    """
+    Previous construction: every cell appended to one Workplane chain,
+    all pending wires extruded at the end.
+    """
+    sketch = cq.Workplane("XY")
+    for polygon in cutter_polygons(cutters):
+        sketch = sketch.polyline([(x, y) for x, y in unpadded(polygon).tolist()]).close()
+    return sketch.extrude(THICKNESS).val()
+
+
+def best_time(builder, outer_wire, cutters, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = builder(outer_wire, cutters)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def scaling_exponent(counts, times):
+    """
+    Slope of log(time) against log(count): 1 for linear growth.
+    """
+    return float(np.polyfit(np.log(counts), np.log(times), 1)[0])
+
+
+# ==============================================================================
+# 2. EXECUTION
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="4,2.8,2,1.4,1,0.7,0.5", help="comma separated cell sizes in mm")
+    parser.add_argument("--repeat", type=int, default=3, help="builds per measurement (best is kept)")
+    parser.add_argument("--reference-limit", type=int, default=2000, help="max cells for makeFace / workplane")
+    parser.add_argument("--max-exponent", type=float, default=1.2, help="fail above this growth exponent")
+    args = parser.parse_args()
+
+    outline = dogbone_outline(*OUTLINE)
+    outer_wire = outline_wire(outline)
+
+    print(f"{'cell':>5} {'cells':>6} {'arrays':>9} {'bulk':>9} {'per cell':>9} "
+          f"{'makeFace':>10} {'workplane':>10}  valid")
+    print("-" * 76)
+
+    counts, times = [], []
+    all_valid = True
+    for size in map(float, args.sizes.split(",")):
+        start = time.perf_counter()
+        cells = specimen_cells(outline, "honeycomb", size, WALL_RATIO * size, PERIMETER_WALL)
+        cutters = polygon_cutters(cells)
+        t_arrays = time.perf_counter() - start
+        n = len(cutters.centres)
+        if not n:
+            continue
+
+        if cutter_problems(outline, cutters, PERIMETER_WALL):
+            print(f"[WARNING] cell size {size}: holes fail cutter_problems(), skipped")
+            all_valid = False
+            continue
+
+        t_bulk, face = best_time(bulk_face, outer_wire, cutters, args.repeat)
+        valid = face.isValid() if n <= args.reference_limit else None
+        all_valid = all_valid and valid is not False
+        counts.append(n)
+        times.append(t_bulk)
+
+        columns = []
+        for builder in (make_face, workplane_chain):
+            if n > args.reference_limit:
+                columns.append(f"{'-':>10}")
+                continue
+            try:
+                t_ref, _ = best_time(builder, outer_wire, cutters, 1)
+                columns.append(f"{t_ref * 1000:>7.0f} ms")
+            except RecursionError:
+                columns.append(f"{'recursion':>10}")
+
+        print(f"{size:>5.2f} {n:>6} {t_arrays * 1000:>6.1f} ms {t_bulk * 1000:>6.1f} ms "
+              f"{t_bulk / n * 1e6:>6.1f} us {columns[0]} {columns[1]}  "
+              f"{'-' if valid is None else 'yes' if valid else 'NO'}")
+
+    exponent = scaling_exponent(counts, times) if len(counts) > 1 else 1.0
+    print(f"\nbulk build time ~ cells^{exponent:.2f}")
+
+    return 0 if all_valid and exponent <= args.max_exponent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Generator benchmark: every specimen in the registry at several scales.
+
+Each case runs in a fresh process (cold caches, clean peak RSS) and records
+the wall time of each phase, the peak resident memory, the model topology and
+the exported file sizes. Results go to a JSON file that can be diffed between
+commits, or compared directly with --compare.
+
+    python benchmarks/bench_generators.py [--scale coarse,default] [--only grid]
+                                          [--out results.json] [--compare old.json] [--spans]
+
+Phases:
+    build       : the generator call; its own phases (profile, pattern,
+                  boolean, ...) are recorded as instrumentation spans
+    tessellate  : BRep meshing at the STL tolerance
+    export_stl  : writing the STL (reuses the tessellation)
+    export_step : writing the STEP file
+    export_3mf  : writing the 3MF file (instanced and implicit models)
+    export_stl also covers the meshing of implicit models (marching
+    tetrahedra, streamed slab by slab).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import cadquery as cq
+from OCP.BRep import BRep_Tool
+from OCP.TopLoc import TopLoc_Location
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from cadquery_models import registry
+from cadquery_models.batch import export_model
+from cadquery_models.implicit import Implicit, grid_shape
+from cadquery_models.instances import Instanced, instance_count
+from cadquery_models.instrument import collect, peak_rss_mb
+from cadquery_models.mesh import Mesh
+
+TOLERANCE = 0.01
+ANGULAR_TOLERANCE = 0.1
+
+# ==============================================================================
+# 1. CASES
+# ==============================================================================
+# scale -> specimen -> parameter overrides (cell size, pitch, strut radius)
+SCALES = {
+    "coarse": {
+        "astm_d638": {"type": "TYPE_V"},
+        "iso527_1a": {},
+        "iso527_1b": {},
+        "iso527_2": {},
+        "iso527_1b_grid": {"grid_cell_size": 5.0, "grid_wall_thickness": 1.0},
+        "iso527_1b_grid_mesh": {"grid_cell_size": 5.0, "grid_wall_thickness": 1.0},
+        "iso527_1b_auxetic": {"cell": 5.0, "wall": 1.0},
+        "iso527_1b_auxetic_mesh": {"cell": 5.0, "wall": 1.0},
+        "iso527_1b_lattice": {"unit_cell_size": 5.0, "strut_radius": 0.6},
+        "iso527_1b_lattice_instanced": {"unit_cell_size": 5.0, "strut_radius": 0.6},
+        "iso527_1b_circular": {"hole_spacing": 4.5},
+        "iso527_1b_circular_mesh": {"hole_spacing": 4.5},
+        "iso527_1b_tpms": {"voxel_size": 0.3},
+        "iso527_1b_honeycomb": {"cell_size": 5.0, "wall_thickness": 1.0},
+        "iso527_1b_honeycomb_mesh": {"cell_size": 5.0, "wall_thickness": 1.0},
+    },
+    "default": {key: {} for key in registry.SPECIMENS},
+    "fine": {
+        "astm_d638": {"type": "TYPE_I"},
+        "iso527_1b_grid": {"grid_cell_size": 3.0, "grid_wall_thickness": 0.6},
+        "iso527_1b_grid_mesh": {"grid_cell_size": 3.0, "grid_wall_thickness": 0.6},
+        "iso527_1b_auxetic": {"cell": 3.0, "wall": 0.6},
+        "iso527_1b_auxetic_mesh": {"cell": 3.0, "wall": 0.6},
+        "iso527_1b_lattice": {"unit_cell_size": 3.0, "strut_radius": 0.4},
+        "iso527_1b_lattice_instanced": {"unit_cell_size": 3.0, "strut_radius": 0.4},
+        "iso527_1b_circular": {"hole_spacing": 3.2, "hole_radius": 1.2},
+        "iso527_1b_circular_mesh": {"hole_spacing": 3.2, "hole_radius": 1.2},
+        "iso527_1b_tpms": {"unit_cell_size": 3.0, "voxel_size": 0.1},
+        "iso527_1b_honeycomb": {"pattern": "voronoi", "cell_size": 1.1, "wall_thickness": 0.3},
+        "iso527_1b_honeycomb_mesh": {"pattern": "voronoi", "cell_size": 1.1, "wall_thickness": 0.3},
+    },
+}
+
+
+def bench_cases(scales, only=None):
+    """
+    (specimen, scale, overrides) for the selected scales, in a stable order.
+    """
+    cases = []
+    for scale in scales:
+        for specimen, overrides in SCALES[scale].items():
+            if only and not any(pattern in specimen for pattern in only):
+                continue
+            cases.append((specimen, scale, overrides))
+    return cases
+
+
+# ==============================================================================
+# 2. MEASUREMENT (runs in a child process)
+# ==============================================================================
+def triangle_count(shape):
+    """
+    Triangles of the current tessellation of a meshed shape.
+    """
+    location = TopLoc_Location()
+    count = 0
+    for face in shape.Faces():
+        triangulation = BRep_Tool.Triangulation_s(face.wrapped, location)
+        if triangulation is not None:
+            count += triangulation.NbTriangles()
+    return count
+
+
+def run_case(specimen, overrides):
+    """
+    Builds, tessellates and exports one case. Returns the result record.
+    """
+    registry.load_script(specimen)  # Import outside the timed phases
+    rss_base = peak_rss_mb()
+    phases = {}
+    result = {"phases": phases, "files": {}}
+
+    start = time.perf_counter()
+    with collect() as spans, contextlib.redirect_stdout(io.StringIO()):  # Silence progress banners
+        model = registry.build(specimen, overrides)
+    phases["build"] = time.perf_counter() - start
+    result["spans"] = spans
+
+    if isinstance(model, Mesh):
+        # Direct meshes skip tessellation and have no STEP output
+        result["triangles"] = len(model.faces)
+        formats = ("stl",)
+    elif isinstance(model, Instanced):
+        # Instanced models are tessellated by the exporters (3MF once per part)
+        result["parts"] = len(model.parts)
+        result["instances"] = instance_count(model)
+        formats = ("3mf", "stl")
+    elif isinstance(model, Implicit):
+        # Meshed by the exporters; STL streams slab by slab
+        result["voxels"] = int(grid_shape(model).prod())
+        formats = ("stl",)
+    else:
+        shapes = model.vals() if isinstance(model, cq.Workplane) else [model]
+        shape = shapes[0] if len(shapes) == 1 else cq.Compound.makeCompound(shapes)
+        result["solids"] = len(shape.Solids())
+        result["faces"] = len(shape.Faces())
+        result["volume"] = round(shape.Volume(), 4)
+
+        start = time.perf_counter()
+        shape.mesh(TOLERANCE, ANGULAR_TOLERANCE)
+        phases["tessellate"] = time.perf_counter() - start
+        result["triangles"] = triangle_count(shape)
+        formats = ("stl", "step")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formats:
+            path = os.path.join(tmp, f"model.{fmt}")
+            start = time.perf_counter()
+            export_model(model, path, fmt, TOLERANCE, ANGULAR_TOLERANCE)
+            phases[f"export_{fmt}"] = time.perf_counter() - start
+            result["files"][fmt] = os.path.getsize(path)
+
+    rss_peak = peak_rss_mb()
+    result["peak_rss_mb"] = None if rss_peak is None else round(rss_peak, 1)
+    result["rss_delta_mb"] = None if rss_peak is None else round(rss_peak - rss_base, 1)
+    return result
+
+
+def run_isolated(specimen, overrides):
+    """
+    Runs a case in a fresh worker process.
+    """
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_case, specimen, overrides).result()
+
+
+# ==============================================================================
+# 3. REPORTING
+# ==============================================================================
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def case_id(record):
+    return f"{record['specimen']}@{record['scale']}"
+
+
+def compare(results, baseline_path):
+    """
+    Prints the total time of each case against a previous results file.
+    """
+    with open(baseline_path) as f:
+        baseline = {case_id(r): r for r in json.load(f)["cases"]}
+
+    print(f"\nCompared with {baseline_path}:")
+    print(f"{'Case':<36} {'before':>10} {'after':>10} {'ratio':>7}")
+    for record in results["cases"]:
+        old = baseline.get(case_id(record))
+        if old is None or "phases" not in old or "phases" not in record:
+            continue
+        t_old = sum(old["phases"].values())
+        t_new = sum(record["phases"].values())
+        print(f"{case_id(record):<36} {t_old:>9.3f}s {t_new:>9.3f}s {t_new / t_old:>6.2f}x")
+
+
+# ==============================================================================
+# 4. EXECUTION
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", default="coarse,default", help=f"comma separated: {','.join(SCALES)}")
+    parser.add_argument("--only", default=None, help="comma separated substrings of specimen keys")
+    parser.add_argument("--out", default="bench_results.json", help="results file")
+    parser.add_argument("--compare", default=None, help="previous results file to compare with")
+    parser.add_argument("--spans", action="store_true", help="print the generator phases of every case")
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scale.split(",") if s.strip()]
+    only = [s.strip() for s in args.only.split(",")] if args.only else None
+    cases = bench_cases(scales, only)
+
+    results = {
+        "commit": git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "cadquery": cq.__version__,
+        "platform": platform.platform(),
+        "tolerance": TOLERANCE,
+        "angular_tolerance": ANGULAR_TOLERANCE,
+        "cases": [],
+    }
+
+    print(f"{'Case':<36} {'build':>9} {'tess':>8} {'stl':>8} {'step':>8} {'RSS MB':>8} {'STL KB':>8}")
+    print("-" * 92)
+
+    n_failed = 0
+    for specimen, scale, overrides in cases:
+        record = {"specimen": specimen, "scale": scale, "params": overrides}
+        try:
+            record.update(run_isolated(specimen, overrides))
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            n_failed += 1
+            print(f"{case_id(record):<36} FAILED: {record['error']}")
+            results["cases"].append(record)
+            continue
+
+        phases = record["phases"]
+        cols = [phases.get(name) for name in ("build", "tessellate", "export_stl", "export_step")]
+        cols = "".join(f"{t:>8.3f}s" if t is not None else f"{'-':>9}" for t in cols)
+        rss = f"{record['peak_rss_mb']:>8.0f}" if record["peak_rss_mb"] is not None else f"{'-':>8}"
+        print(f"{case_id(record):<36}{cols} {rss} {record['files']['stl'] / 1024:>8.0f}")
+        if args.spans:
+            for s in record["spans"]:
+                if s["name"] == specimen:
+                    continue  # Same as 'build'
+                counts = " ".join(f"{k}={s[k]}" for k in ("operands", "solids", "faces", "triangles", "parts", "instances")
+                                  if k in s)
+                rss = f"+{s['rss_peak_mb']:.0f} MB" if s["rss_peak_mb"] is not None else "RSS n/a"
+                print(f"    {s['name'].split('.', 1)[-1]:<30} {s['elapsed_s']:>8.3f}s {rss}  {counts}")
+        results["cases"].append(record)
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f"\n[INFO] Results: {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    return 1 if n_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
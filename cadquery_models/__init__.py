@@ -0,0 +1,7 @@
+"""
+Shared geometry kernels for the parametric tensile specimen scripts.
+
+The specimen scripts under ``astm/`` and ``iso/`` stay runnable on their own
+(CQ-Editor or ``python path/to/script.py``); the modules in this package hold
+the pieces they have in common.
+"""
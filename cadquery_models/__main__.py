@@ -0,0 +1,166 @@
+"""
+Command line front end for every registered specimen generator.
+
+    python -m cadquery_models list
+    python -m cadquery_models list iso527_1b_grid
+    python -m cadquery_models build iso527_1b_grid --set thickness=3 --option QUADRANT_SYMMETRY=true
+    python -m cadquery_models build --spec sweep.yaml --format stl,3mf --jobs 4 --out build/
+    python -m cadquery_models batch sweep.json ...
+    python -m cadquery_models plate plate.json ...
+
+`build` takes one or more specimen keys with --set overrides (values are
+read as JSON, so numbers, booleans and lists work; anything else is a
+string) and/or a JSON/YAML spec in the sweep format of batch.py. The jobs
+run through batch.run_batch, so --jobs, --cache and the manifest behave
+the same way. `batch` and `plate` hand their arguments to batch.py and
+plate.py.
+
+Nothing is built on import: the generator scripts are loaded when a
+specimen is listed or built.
+"""
+import argparse
+import json
+import sys
+
+from cadquery_models import batch, plate, registry
+from cadquery_models.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+
+
+# ==============================================================================
+# 1. ARGUMENTS
+# ==============================================================================
+def parse_assignment(text):
+    """
+    (name, value) of a NAME=VALUE argument. The value is parsed as JSON
+    when possible and kept as a string otherwise.
+    """
+    name, sep, raw = text.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    return name.strip(), value
+
+
+def parse_formats(text):
+    return [f.strip() for f in text.split(",") if f.strip()]
+
+
+def build_jobs(args):
+    """
+    Job list of the build command: one job per key, then the spec entries.
+    """
+    if not args.specimens and not args.spec:
+        raise ValueError("Give at least one specimen key or a --spec file")
+
+    overrides = dict(args.set)
+    options = dict(args.option)
+    jobs = []
+    for key in args.specimens:
+        jobs.extend(batch.expand_grid(key, overrides, None, options))
+    if args.spec:
+        jobs.extend(batch.load_sweep(args.spec))
+
+    # Unknown parameters or options fail here rather than in a worker
+    for job in jobs:
+        registry.resolve_params(job["specimen"], job["params"])
+        registry.check_options(job["specimen"], job.get("options"))
+
+    # Named after the specimen while that stays unique
+    keys = [job["specimen"] for job in jobs]
+    for job in jobs:
+        if keys.count(job["specimen"]) == 1:
+            job["name"] = job["specimen"]
+    return jobs
+
+
+# ==============================================================================
+# 2. COMMANDS
+# ==============================================================================
+def cmd_list(args):
+    if not args.specimen:
+        for key, spec in registry.SPECIMENS.items():
+            print(f"{key:32s} {spec.script}")
+        return 0
+
+    key = args.specimen
+    if key not in registry.SPECIMENS:
+        raise ValueError(f"Unknown specimen: {key}")
+    print(f"{key} ({registry.SPECIMENS[key].script})")
+    print("  params (--set):")
+    for name, value in registry.default_params(key).items():
+        print(f"    {name} = {json.dumps(value)}")
+    print("  options (--option):")
+    options = registry.default_options(key)
+    for name, value in options.items():
+        print(f"    {name} = {json.dumps(value)}")
+    if not options:
+        print("    (none)")
+    return 0
+
+
+def cmd_build(args):
+    manifest = batch.run_batch(
+        build_jobs(args),
+        args.out,
+        formats=args.formats,
+        max_workers=args.jobs,
+        tolerance=args.tolerance,
+        angular_tolerance=args.angular_tolerance,
+        cache_dir=args.cache,
+        cache_max_bytes=int(args.cache_size * 1024**2),
+        chordal_error=args.chordal_error,
+    )
+    return 1 if manifest["failed"] else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    # batch / plate keep their own parsers
+    if argv and argv[0] == "batch":
+        return batch.main(argv[1:])
+    if argv and argv[0] == "plate":
+        return plate.main(argv[1:])
+
+    parser = argparse.ArgumentParser(prog="python -m cadquery_models", description="Tensile specimen generators.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("batch", help="run a sweep file (see batch.py)")
+    commands.add_parser("plate", help="nest specimens on build plates (see plate.py)")
+
+    listing = commands.add_parser("list", help="list specimens, or the params and options of one")
+    listing.add_argument("specimen", nargs="?")
+
+    build = commands.add_parser("build", help="build specimens with overrides")
+    build.add_argument("specimens", nargs="*", metavar="KEY", help="specimen keys (see list)")
+    build.add_argument("--set", "-s", type=parse_assignment, action="append", default=[],
+                       metavar="NAME=VALUE", help="parameter override, repeatable")
+    build.add_argument("--option", type=parse_assignment, action="append", default=[],
+                       metavar="NAME=VALUE", help="script option, e.g. QUADRANT_SYMMETRY=true")
+    build.add_argument("--spec", help="JSON or YAML spec in the batch sweep format")
+    build.add_argument("--format", "--formats", dest="formats", type=parse_formats,
+                       default=list(batch.DEFAULT_FORMATS), help="comma separated: stl,step,3mf")
+    build.add_argument("--out", "-o", default="build", help="output directory")
+    build.add_argument("--jobs", "-j", type=int, default=None, help="worker processes (default: all cores)")
+    build.add_argument("--tolerance", type=float, default=0.01)
+    build.add_argument("--angular-tolerance", type=float, default=0.1)
+    build.add_argument("--chordal-error", type=float, default=None,
+                       help="STL deflection per face from its radius, max chord error in mm")
+    build.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_DIR, default=None,
+                       help=f"reuse cached exports (default dir: {DEFAULT_CACHE_DIR})")
+    build.add_argument("--cache-size", type=float, default=DEFAULT_MAX_BYTES / 1024**2,
+                       help="cache size limit in MB")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "list":
+            return cmd_list(args)
+        return cmd_build(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
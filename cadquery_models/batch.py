@@ -0,0 +1,338 @@
+"""
+Batch generator for specimen sweeps (DOE matrices).
+
+A sweep is a parameter grid per specimen; every combination becomes one
+job. Jobs are built in a process pool (OCC booleans are not thread-safe),
+each job is timed and exported, and the outcome of every job - including
+failures - is written to ``manifest.json`` in the output directory.
+
+    python -m cadquery_models.batch sweep.json --out build/ --jobs 16 [--cache]
+
+sweep.json (or .yaml) holds one entry or a list of entries:
+
+    {"specimen": "iso527_1b_grid",
+     "base": {"thickness": 4.0},
+     "grid": {"grid_cell_size": [3.0, 4.0], "grid_wall_thickness": [0.6, 0.8]},
+     "options": {"QUADRANT_SYMMETRY": true}}
+
+"params" is accepted as a synonym of "base"; "options" sets script
+settings for every job of the entry (see registry.py).
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+
+from cadquery_models import registry
+from cadquery_models.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ExportCache
+from cadquery_models.implicit import Implicit, implicit_mesh, stream_implicit_stl
+from cadquery_models.instances import Instanced, placed_shapes
+from cadquery_models.mesh import Mesh, write_stl
+
+DEFAULT_FORMATS = ("stl", "step")
+
+
+# ==============================================================================
+# 1. JOBS
+# ==============================================================================
+def expand_grid(specimen, base=None, grid=None, options=None):
+    """
+    Expands a parameter grid into one job per combination.
+    `base` is applied to every job, `grid` maps parameter -> list of values.
+    """
+    if specimen not in registry.SPECIMENS:
+        raise ValueError(f"Unknown specimen: {specimen}")
+
+    grid = grid or {}
+    names = list(grid)
+    jobs = []
+    for values in itertools.product(*(grid[n] for n in names)):
+        params = dict(base or {})
+        params.update(zip(names, values))
+        job = {"specimen": specimen, "params": params}
+        if options:
+            job["options"] = dict(options)
+        jobs.append(job)
+    return jobs
+
+
+def read_spec(path):
+    """
+    Reads a JSON or YAML (.yaml/.yml, needs PyYAML) spec file as a list of
+    entries.
+    """
+    with open(path) as f:
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(f"Reading {path} needs PyYAML (pip install pyyaml)") from None
+            entries = yaml.safe_load(f)
+        else:
+            entries = json.load(f)
+    return [entries] if isinstance(entries, dict) else list(entries)
+
+
+def load_sweep(path):
+    """
+    Reads a sweep file (one entry or a list of entries) into a job list.
+    """
+    jobs = []
+    for entry in read_spec(path):
+        base = entry.get("base") or entry.get("params")
+        jobs.extend(expand_grid(entry["specimen"], base, entry.get("grid"), entry.get("options")))
+    return jobs
+
+
+# ==============================================================================
+# 2. WORKER
+# ==============================================================================
+def model_formats(model):
+    """
+    Export formats a model can be written to: direct meshes and implicit
+    models have no BRep, so no STEP.
+    """
+    if isinstance(model, (Mesh, Implicit)):
+        return ("stl", "3mf")
+    return ("stl", "step", "3mf")
+
+
+def export_model(model, path, fmt, tolerance, angular_tolerance, chordal_error=None):
+    """
+    Exports a model in one of the supported formats.
+    Direct meshes (mesh.Mesh) are already tessellated and only go to STL
+    or 3MF; BRep models are tessellated and written to STL one solid at a
+    time, with per-face deflection if `chordal_error` is given. Instanced
+    models keep their instancing in 3MF; in STL every part is meshed once
+    and written at each placement, in STEP the copies are placed.
+    Implicit models (implicit.Implicit) are meshed slab by slab straight
+    into the STL, or meshed whole for 3MF.
+    """
+    # OpenCascade is only loaded once something is exported
+    import cadquery as cq
+
+    from cadquery_models.tessellate import stream_stl
+    from cadquery_models.threemf import write_3mf
+
+    if isinstance(model, Implicit):
+        if fmt == "stl":
+            stream_implicit_stl(model, path)
+            return
+        if fmt != "3mf":
+            raise ValueError(f"Implicit output supports stl and 3mf only, not {fmt}")
+        model = implicit_mesh(model)
+
+    if fmt == "3mf":
+        write_3mf(path, model, tolerance, angular_tolerance, chordal_error)
+    elif isinstance(model, Mesh):
+        if fmt != "stl":
+            raise ValueError(f"Mesh output supports stl and 3mf only, not {fmt}")
+        write_stl(path, model)
+    elif isinstance(model, Instanced) and fmt == "step":
+        cq.exporters.export(cq.Compound.makeCompound(placed_shapes(model)), path)
+    elif fmt == "stl":
+        stream_stl(model, path, tolerance, angular_tolerance, chordal_error)
+    elif fmt == "step":
+        cq.exporters.export(model, path)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def run_job(job, output_dir, formats, tolerance, angular_tolerance,
+            cache_dir=None, cache_max_bytes=DEFAULT_MAX_BYTES, chordal_error=None):
+    """
+    Builds and exports a single job. Never raises: errors are returned in
+    the result record together with the captured console output.
+    With a cache, formats already on disk are copied from it and the model
+    is only built if at least one format is missing. Formats the model
+    cannot be written to (STEP of a mesh) are skipped and listed in the
+    record's "skipped", the job still succeeds.
+    """
+    result = {
+        "name": job["name"],
+        "specimen": job["specimen"],
+        "params": job["params"],
+        "options": job.get("options") or {},
+        "status": "ok",
+        "files": {},
+        "skipped": {},
+        "build_s": 0.0,
+        "export_s": 0.0,
+    }
+    cache = ExportCache(cache_dir, cache_max_bytes) if cache_dir else None
+    model = None
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            for fmt in formats:
+                path = os.path.join(output_dir, f"{job['name']}.{fmt}")
+
+                key = None
+                if cache is not None:
+                    key = cache.key(job["specimen"], job["params"], fmt, tolerance, angular_tolerance,
+                                    chordal_error, job.get("options"))
+                    if cache.get(key, fmt, path) is not None:
+                        result["files"][fmt] = {"path": path, "bytes": os.path.getsize(path), "cached": True}
+                        continue
+
+                if model is None:
+                    start = time.perf_counter()
+                    model = registry.build(job["specimen"], job["params"], job.get("options"))
+                    result["build_s"] = time.perf_counter() - start
+
+                if fmt not in model_formats(model):
+                    result["skipped"][fmt] = f"{type(model).__name__} output supports {', '.join(model_formats(model))} only"
+                    continue
+
+                start = time.perf_counter()
+                export_model(model, path, fmt, tolerance, angular_tolerance, chordal_error)
+                result["export_s"] += time.perf_counter() - start
+
+                if key is not None:
+                    cache.put(key, fmt, path)
+                result["files"][fmt] = {"path": path, "bytes": os.path.getsize(path), "cached": False}
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+
+    result["log"] = log.getvalue()
+    return result
+
+
+def _run_isolated(job, *args):
+    """
+    Runs one job in its own process, so a hard crash (e.g. a segfault inside
+    OCC) only takes this job down.
+    """
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(run_job, job, *args)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            return {
+                "name": job["name"],
+                "specimen": job["specimen"],
+                "params": job["params"],
+                "status": "failed",
+                "files": {},
+                "error": "Worker process crashed",
+            }
+
+
+# ==============================================================================
+# 3. BATCH DRIVER
+# ==============================================================================
+def run_batch(jobs, output_dir, formats=DEFAULT_FORMATS, max_workers=None,
+              tolerance=0.01, angular_tolerance=0.1,
+              cache_dir=None, cache_max_bytes=DEFAULT_MAX_BYTES, chordal_error=None):
+    """
+    Builds all jobs across a process pool and writes manifest.json.
+    Uses every core by default. Returns the manifest dict.
+    Pass `cache_dir` to reuse previously exported files (see cache.py) and
+    `chordal_error` (mm) for adaptive STL tessellation (see tessellate.py).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    max_workers = max_workers or os.cpu_count()
+
+    # Stable, unique output names
+    jobs = [dict(job, name=job.get("name") or f"{job['specimen']}_{i:04d}") for i, job in enumerate(jobs)]
+    args = (output_dir, tuple(formats), tolerance, angular_tolerance, cache_dir, cache_max_bytes, chordal_error)
+
+    print(f"[INFO] Batch: {len(jobs)} jobs on {max_workers} processes")
+    start = time.perf_counter()
+    results = {}
+
+    def report(result):
+        results[result["name"]] = result
+        if result["status"] == "ok" and all(f["cached"] for f in result["files"].values()):
+            status = "ok (cached)"
+        elif result["status"] == "ok":
+            status = f"ok (build {result['build_s']:.2f} s, export {result['export_s']:.2f} s)"
+        else:
+            status = f"FAILED: {result['error']}"
+        if result.get("skipped"):
+            status += f", skipped {','.join(result['skipped'])}"
+        print(f"[{len(results)}/{len(jobs)}] {result['name']}: {status}")
+
+    # Shared pool for the whole batch
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(run_job, job, *args) for job in jobs]
+            for future in as_completed(futures):
+                report(future.result())
+    except BrokenProcessPool:
+        print("[WARNING] A worker crashed; re-running unfinished jobs in isolation...")
+
+    # Jobs lost to a crashed worker get one process each
+    unfinished = [job for job in jobs if job["name"] not in results]
+    if unfinished:
+        with ThreadPoolExecutor(max_workers=max_workers) as threads:
+            futures = [threads.submit(_run_isolated, job, *args) for job in unfinished]
+            for future in as_completed(futures):
+                report(future.result())
+
+    ordered = [results[job["name"]] for job in jobs]
+    n_failed = sum(1 for r in ordered if r["status"] != "ok")
+    manifest = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "formats": list(formats),
+        "tolerance": tolerance,
+        "angular_tolerance": angular_tolerance,
+        "chordal_error": chordal_error,
+        "workers": max_workers,
+        "wall_s": time.perf_counter() - start,
+        "ok": len(ordered) - n_failed,
+        "failed": n_failed,
+        "jobs": ordered,
+    }
+
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"[INFO] Done in {manifest['wall_s']:.1f} s: {manifest['ok']} ok, {n_failed} failed")
+    print(f"[INFO] Manifest: {manifest_path}")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a specimen parameter sweep.")
+    parser.add_argument("sweep", help="JSON or YAML sweep file")
+    parser.add_argument("--out", "-o", default="build", help="output directory")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--formats", default=",".join(DEFAULT_FORMATS), help="comma separated: stl,step,3mf")
+    parser.add_argument("--tolerance", type=float, default=0.01)
+    parser.add_argument("--angular-tolerance", type=float, default=0.1)
+    parser.add_argument("--chordal-error", type=float, default=None,
+                        help="STL deflection per face from its radius, max chord error in mm")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_DIR, default=None,
+                        help=f"reuse cached exports (default dir: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-size", type=float, default=DEFAULT_MAX_BYTES / 1024**2,
+                        help="cache size limit in MB")
+    args = parser.parse_args(argv)
+
+    manifest = run_batch(
+        load_sweep(args.sweep),
+        args.out,
+        formats=[f.strip() for f in args.formats.split(",") if f.strip()],
+        max_workers=args.jobs,
+        tolerance=args.tolerance,
+        angular_tolerance=args.angular_tolerance,
+        cache_dir=args.cache,
+        cache_max_bytes=int(args.cache_size * 1024**2),
+        chordal_error=args.chordal_error,
+    )
+    return 1 if manifest["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Tiled, hierarchical boolean scheduler.
+
+One boolean against hundreds of operands gets super-linearly slower, since
+OCC intersects every pair of candidates it cannot rule out. Here the
+operands are split into tiles along the specimen length (X). Each tile is
+combined with only its own slice of the body, and the tile results are then
+merged pairwise, level by level. Every boolean stays small, so total
+time grows roughly linearly with the operand count.
+
+Tiles are independent, and shapes are picklable, so tiles (and each
+merge level) can run in worker processes when `processes` is set.
+"""
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+import cadquery as cq
+import numpy as np
+
+DEFAULT_TILES = 8
+
+
+# ==============================================================================
+# 1. TILING
+# ==============================================================================
+def tile_edges(x_min, x_max, n_tiles):
+    """
+    X positions of the n_tiles + 1 tile boundaries.
+    """
+    return np.linspace(x_min, x_max, n_tiles + 1)
+
+
+def assign_tiles(shapes, edges):
+    """
+    Groups shapes by the tile that contains their bounding box centre.
+    """
+    groups = [[] for _ in range(len(edges) - 1)]
+    for shape in shapes:
+        x = shape.BoundingBox().center.x
+        k = int(np.clip(np.searchsorted(edges, x) - 1, 0, len(groups) - 1))
+        groups[k].append(shape)
+    return groups
+
+
+def slab_box(bb, x0, x1, margin=1.0):
+    """
+    Box from x0 to x1 covering the full Y/Z extent of the bounding box `bb`.
+    """
+    return cq.Solid.makeBox(
+        x1 - x0,
+        bb.ylen + 2.0 * margin,
+        bb.zlen + 2.0 * margin,
+        cq.Vector(x0, bb.ymin - margin, bb.zmin - margin),
+    )
+
+
+def tile_slabs(shape, n_tiles, margin=1.0):
+    """
+    One box per tile along X; the outer tiles extend past the shape so that
+    the slabs always cover it completely.
+    """
+    bb = shape.BoundingBox()
+    edges = tile_edges(bb.xmin, bb.xmax, n_tiles)
+    lo = edges[:-1].copy()
+    hi = edges[1:].copy()
+    lo[0] -= margin
+    hi[-1] += margin
+    return edges, [slab_box(bb, x0, x1, margin) for x0, x1 in zip(lo, hi)]
+
+
+def bounding_slab(shapes, margin=1.0):
+    """
+    Box around the combined bounding box of `shapes`.
+    """
+    bb = cq.Compound.makeCompound(shapes).BoundingBox()
+    return slab_box(bb, bb.xmin - margin, bb.xmax + margin, margin)
+
+
+# ==============================================================================
+# 2. WORKERS (module level so they can run in a process pool)
+# ==============================================================================
+def _union_tile(job):
+    base, slab, operands = job
+    piece = base.intersect(slab)
+    return piece.fuse(*operands) if operands else piece
+
+
+def _cut_tile(job):
+    base, slab, cutters = job
+    piece = base.intersect(slab)
+    return piece.cut(*cutters) if cutters else piece
+
+
+def _intersect_tile(job):
+    operands, tool = job
+    return cq.Compound.makeCompound(operands).intersect(tool.intersect(bounding_slab(operands)))
+
+
+def _fuse_pair(pair):
+    return pair[0].fuse(pair[1]) if len(pair) == 2 else pair[0]
+
+
+@contextlib.contextmanager
+def _executor(processes):
+    if processes and processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            yield pool
+    else:
+        yield None
+
+
+def _map(pool, fn, items):
+    if pool is None or len(items) < 2:
+        return [fn(item) for item in items]
+    return list(pool.map(fn, items))
+
+
+# ==============================================================================
+# 3. SCHEDULER
+# ==============================================================================
+def merge_tree(shapes, pool=None):
+    """
+    Fuses shapes pairwise, level by level (neighbours first).
+    """
+    shapes = list(shapes)
+    while len(shapes) > 1:
+        pairs = [shapes[i:i + 2] for i in range(0, len(shapes), 2)]
+        shapes = _map(pool, _fuse_pair, pairs)
+    return shapes[0]
+
+
+def tiled_union(base, operands, n_tiles=DEFAULT_TILES, processes=None):
+    """
+    base U operands. Each tile fuses its slice of `base` with the operands
+    centred in it; the tiles are then merged hierarchically and the seams
+    of the slicing are removed.
+    """
+    if not operands:
+        return base
+
+    edges, slabs = tile_slabs(base, n_tiles)
+    groups = assign_tiles(operands, edges)
+    with _executor(processes) as pool:
+        tiles = _map(pool, _union_tile, [(base, slab, group) for slab, group in zip(slabs, groups)])
+        return merge_tree(tiles, pool).clean()
+
+
+def tiled_cut(base, cutters, n_tiles=DEFAULT_TILES, processes=None):
+    """
+    base - cutters. Each slice of `base` is cut only by the cutters whose
+    bounding box reaches into it; the slices are merged hierarchically and
+    the seams of the slicing are removed.
+    """
+    if not cutters:
+        return base
+
+    edges, slabs = tile_slabs(base, n_tiles)
+    extents = [cutter.BoundingBox() for cutter in cutters]
+    jobs = []
+    for k, slab in enumerate(slabs):
+        x0 = -np.inf if k == 0 else edges[k]
+        x1 = np.inf if k == len(slabs) - 1 else edges[k + 1]
+        near = [c for c, bb in zip(cutters, extents) if bb.xmax > x0 and bb.xmin < x1]
+        jobs.append((base, slab, near))
+
+    with _executor(processes) as pool:
+        tiles = _map(pool, _cut_tile, jobs)
+        return merge_tree(tiles, pool).clean()
+
+
+def tiled_intersect(operands, tool, n_tiles=DEFAULT_TILES, processes=None):
+    """
+    operands ^ tool, as one compound per tile. Each tile intersects its
+    operands with only the part of `tool` around them. Pieces of one tile
+    come from a single boolean and share their common faces; pieces of
+    different tiles may still overlap and are fused later.
+    """
+    if not operands:
+        return []
+
+    bb = cq.Compound.makeCompound(operands).BoundingBox()
+    groups = [g for g in assign_tiles(operands, tile_edges(bb.xmin, bb.xmax, n_tiles)) if g]
+    with _executor(processes) as pool:
+        return _map(pool, _intersect_tile, [(group, tool) for group in groups])
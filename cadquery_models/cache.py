@@ -0,0 +1,153 @@
+"""
+Content-addressed disk cache for exported specimen files.
+
+The cache key is a SHA-256 over everything that determines the file: the
+specimen, its fully resolved parameters (pattern settings included), the
+fingerprint of the generator code, its script options (defaults included,
+so an option left unset and one set to its default share a key), the format
+and - for mesh formats - the tessellation settings passed to the exporter.
+A hit returns the stored file without building anything; the least recently
+used entries are evicted once the cache grows past its size limit.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from cadquery_models import registry
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "CADQUERY_MODELS_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "cadquery_models")
+)
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+# Formats whose content depends on the tessellation settings
+MESH_FORMATS = ("stl", "3mf")
+
+
+class ExportCache:
+    """
+    Export cache rooted at `root`, limited to `max_bytes` of stored files.
+    Entries live in root/<2 hex>/<sha256>.<fmt>; the file mtime is refreshed
+    on every hit and is used as the LRU clock.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    # --------------------------------------------------------------------------
+    # Keys
+    # --------------------------------------------------------------------------
+    def key(self, specimen, params, fmt, tolerance=None, angular_tolerance=None, chordal_error=None,
+            options=None):
+        """
+        Cache key of one export.
+        """
+        material = {
+            "specimen": specimen,
+            "params": registry.resolve_params(specimen, params),
+            "generator": registry.generator_fingerprint(specimen),
+            "format": fmt,
+        }
+        options = dict(registry.check_options(specimen, options), **(options or {}))
+        if options:
+            material["options"] = options
+        if fmt in MESH_FORMATS:
+            material["tolerance"] = tolerance
+            material["angular_tolerance"] = angular_tolerance
+            if chordal_error:
+                material["chordal_error"] = chordal_error
+
+        blob = json.dumps(material, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def path(self, key, fmt):
+        return os.path.join(self.root, key[:2], f"{key}.{fmt}")
+
+    # --------------------------------------------------------------------------
+    # Lookup / store
+    # --------------------------------------------------------------------------
+    def get(self, key, fmt, dest=None):
+        """
+        Returns the cached file for `key` (copied to `dest` if given),
+        or None on a miss.
+        """
+        path = self.path(key, fmt)
+        try:
+            os.utime(path)  # Mark as recently used
+            if dest is None:
+                return path
+            shutil.copyfile(path, dest)
+            return dest
+        except FileNotFoundError:
+            # Never stored, or evicted by another process in the meantime
+            return None
+
+    def put(self, key, fmt, src):
+        """
+        Stores a copy of `src` under `key` and trims the cache to size.
+        """
+        path = self.path(key, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Copy to a temporary name first so readers never see partial files
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        self.evict()
+        return path
+
+    def evict(self):
+        """
+        Deletes least recently used entries until the cache fits max_bytes.
+        """
+        entries = []
+        total = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+        return total
+
+    # --------------------------------------------------------------------------
+    # Convenience
+    # --------------------------------------------------------------------------
+    def export(self, specimen, params, dest, fmt, export, tolerance=None, angular_tolerance=None,
+               chordal_error=None, options=None):
+        """
+        Produces `dest` from the cache, or by calling export(dest) on a miss
+        and storing the result. Returns True on a cache hit.
+        """
+        key = self.key(specimen, params, fmt, tolerance, angular_tolerance, chordal_error, options)
+        if self.get(key, fmt, dest) is not None:
+            return True
+
+        export(dest)
+        self.put(key, fmt, dest)
+        return False
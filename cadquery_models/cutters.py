@@ -0,0 +1,422 @@
+"""
+Array-backed cutter geometry shared by the prismatic (2D) patterns.
+
+A pattern describes its holes with NumPy arrays instead of one Python
+object per cell:
+
+    Cutters(centres, template, radius=None)
+        centres  : (N, 2) hole positions
+        template : (K, 2) outline shared by every hole, relative to its
+                   centre, or (N, K, 2) one outline per hole; both
+                   counter-clockwise, shorter outlines padded by repeating
+                   their last vertex. None for circles.
+        radius   : circle radius when template is None
+
+A shared template is broadcast over the centres only when the absolute
+vertices are needed. The arrays pickle cheaply, and every downstream stage
+reads them directly:
+
+    cutter_wires    : OCC wires for section faces (profile.section_face)
+    cutter_face     : the whole cross-section face in one pass
+    cutter_problems : clearance and overlap checks, no BRep needed
+    write_dxf       : 2D cross-section for laser cutters / drawings
+    section_mesh    : extruded triangle mesh of the cross-section
+
+Nothing here imports CadQuery at module level.
+"""
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from cadquery_models.grid_mesh import arc_crossing, arc_samples
+from cadquery_models.mesh import extrude_polygon_mesh
+from cadquery_models.outline import half_widths, signed_distance
+
+Cutters = namedtuple("Cutters", ["centres", "template", "radius"], defaults=(None, None))
+
+# Holes smaller than this (mm^2) are dropped, as are vertices closer than EPS
+MIN_AREA = 1e-4
+EPS = 1e-9
+
+
+# ==============================================================================
+# 1. POLYGON ARRAYS
+# ==============================================================================
+def polygon_areas(polygons):
+    """
+    Signed areas of (N, K, 2) polygons (positive for counter-clockwise).
+    """
+    x, y = polygons[..., 0], polygons[..., 1]
+    return 0.5 * np.sum(x * np.roll(y, -1, axis=-1) - np.roll(x, -1, axis=-1) * y, axis=-1)
+
+
+def pad_polygons(polygons, k=None):
+    """
+    Stacks (k_i, 2) polygons into one (N, K, 2) array, repeating the last
+    vertex of the shorter ones.
+    """
+    if not len(polygons):
+        return np.zeros((0, k or 3, 2))
+    k = max(k or 0, max(len(p) for p in polygons))
+    return np.stack([np.vstack([p, np.repeat(p[-1:], k - len(p), axis=0)]) for p in polygons])
+
+
+def widen(polygons, k):
+    """
+    (N, K, 2) polygons padded to k vertices.
+    """
+    return np.concatenate([polygons, np.repeat(polygons[:, -1:], k - polygons.shape[1], axis=1)], axis=1)
+
+
+def unpadded(polygon):
+    """
+    Vertices of one padded polygon without the repeated ones.
+    """
+    step = np.any(np.abs(np.diff(polygon, axis=0)) > EPS, axis=1)
+    return polygon[np.concatenate([[True], step])]
+
+
+# ==============================================================================
+# 2. CUTTERS
+# ==============================================================================
+def polygon_cutters(polygons):
+    """
+    Cutters of absolute (N, K, 2) polygons, centred on their vertex mean.
+    """
+    polygons = np.asarray(polygons, dtype=float)
+    centres = polygons.mean(axis=1)
+    return Cutters(centres, polygons - centres[:, None, :])
+
+
+def select(cutters, mask):
+    """
+    Cutters of the holes selected by a boolean mask (or index array).
+    """
+    template = cutters.template
+    if template is not None and template.ndim == 3:
+        template = template[mask]
+    return Cutters(cutters.centres[mask], template, cutters.radius)
+
+
+def circle_template(radius, tolerance=0.01):
+    """
+    Polygon circumscribed about a circle, with vertices at most `tolerance`
+    outside it, so a hole cut with it is never smaller than the circle.
+    """
+    n = max(8, math.ceil(math.pi / math.acos(radius / (radius + tolerance))))
+    angles = np.arange(n) * (2.0 * math.pi / n)
+    return radius / math.cos(math.pi / n) * np.column_stack([np.cos(angles), np.sin(angles)])
+
+
+def cutter_polygons(cutters, tolerance=0.01):
+    """
+    Absolute hole outlines (N, K, 2); circles become inscribed polygons.
+    """
+    template = cutters.template
+    if template is None:
+        template = circle_template(cutters.radius, tolerance)
+    if template.ndim == 2:
+        template = template[None]
+    return cutters.centres[:, None, :] + template
+
+
+def cutter_bounds(cutters):
+    """
+    Bounding boxes of the holes: (low (N, 2), high (N, 2)).
+    """
+    if cutters.template is None:
+        return cutters.centres - cutters.radius, cutters.centres + cutters.radius
+    template = cutters.template if cutters.template.ndim == 3 else cutters.template[None]
+    return cutters.centres + template.min(axis=1), cutters.centres + template.max(axis=1)
+
+
+def cutter_wires(cutters, counter_clockwise=True):
+    """
+    One closed OCC wire per hole (circles stay exact circles), running
+    counter-clockwise seen from +Z unless `counter_clockwise` is False.
+    """
+    import cadquery as cq
+
+    from cadquery_models.profile import polygon_wires
+
+    if cutters.template is None:
+        normal = cq.Vector(0, 0, 1 if counter_clockwise else -1)
+        return [
+            cq.Wire.makeCircle(cutters.radius, cq.Vector(x, y, 0), normal)
+            for x, y in cutters.centres.tolist()
+        ]
+    polygons = cutter_polygons(cutters)
+    return polygon_wires((unpadded(polygon) for polygon in polygons), reverse=not counter_clockwise)
+
+
+def cutter_face(outer_wire, cutters, check=True):
+    """
+    Cross-section face bounded by `outer_wire` with every hole as an inner
+    wire. With check=False the holes are wired in the direction the face
+    needs and added in one linear pass (profile.trusted_face); the face is
+    not checked, so only pass holes for which cutter_problems() reported
+    nothing. Otherwise this is profile.section_face(), with its check and
+    boolean fallback.
+    """
+    from cadquery_models.profile import holes_counter_clockwise, section_face, trusted_face
+
+    if check:
+        return section_face(outer_wire, cutter_wires(cutters))
+    return trusted_face(outer_wire, cutter_wires(cutters, holes_counter_clockwise(outer_wire)))
+
+
+# ==============================================================================
+# 3. VALIDATION
+# ==============================================================================
+def candidate_pairs(low, high):
+    """
+    Pairs (i, j) of boxes that overlap, found with a sweep along X: the
+    boxes are sorted by their left side and each is compared with the
+    following ones while they still start before its right side.
+    """
+    order = np.argsort(low[:, 0], kind="stable")
+    low, high = low[order], high[order]
+    pairs = []
+    for step in range(1, len(order)):
+        i = np.arange(len(order) - step)
+        near = low[i + step, 0] <= high[i, 0]
+        if not near.any():
+            break
+        i = i[near]
+        j = i + step
+        overlap = np.all((low[j] <= high[i]) & (low[i] <= high[j]), axis=1)
+        pairs.append(np.column_stack([i[overlap], j[overlap]]))
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64)
+    return order[np.concatenate(pairs)]
+
+
+def separated(a, b):
+    """
+    True for each pair of polygons a[p], b[p] (P, K, 2) that one of their
+    edge normals separates with a gap (separating axis test; exact for
+    convex polygons, conservative otherwise).
+    """
+    edges = np.concatenate([np.roll(a, -1, axis=1) - a, np.roll(b, -1, axis=1) - b], axis=1)
+    axes = np.stack([-edges[..., 1], edges[..., 0]], axis=-1)
+    project_a = np.einsum("pkc,pac->pak", a, axes)
+    project_b = np.einsum("pkc,pac->pak", b, axes)
+    length = np.linalg.norm(axes, axis=2)
+    gap = np.maximum(project_b.min(axis=2) - project_a.max(axis=2), project_a.min(axis=2) - project_b.max(axis=2))
+    return np.any((length > EPS) & (gap > EPS * np.maximum(length, 1.0)), axis=1)
+
+
+def cutter_problems(outline, cutters, clearance=0.0, tolerance=0.01):
+    """
+    Checks the holes without building any BRep: each must keep `clearance`
+    from the outline (vertices and edge points sampled, `tolerance` slack
+    for cells clipped onto the clearance) and must not touch another hole.
+    A hole within `tolerance` of the outline is always reported, whatever
+    the clearance, since it may touch or cross it. Returns a list of
+    messages, empty if the holes can be added to the section face as they
+    are.
+    """
+    problems = []
+    if not len(cutters.centres):
+        return problems
+
+    if cutters.template is None:
+        edge = signed_distance(outline, cutters.centres[:, 0], cutters.centres[:, 1]) - cutters.radius
+    else:
+        polygons = cutter_polygons(cutters)
+        samples = polygons[:, :, None, :] + np.linspace(0.0, 1.0, 4, endpoint=False)[None, None, :, None] * (
+            np.roll(polygons, -1, axis=1) - polygons
+        )[:, :, None, :]
+        edge = signed_distance(outline, samples[..., 0], samples[..., 1]).reshape(len(polygons), -1).min(axis=1)
+        if np.any(polygon_areas(polygons) <= 0.0):
+            problems.append(f"{int(np.sum(polygon_areas(polygons) <= 0.0))} holes are not counter-clockwise")
+    crossing = edge < tolerance
+    if np.any(crossing):
+        problems.append(f"{int(np.sum(crossing))} holes touch or cross the outline (within {tolerance} mm)")
+    close = int(np.sum(~crossing & (edge < clearance - tolerance)))
+    if close:
+        problems.append(f"{close} holes closer than {clearance} mm to the outline")
+
+    pairs = candidate_pairs(*cutter_bounds(cutters))
+    if len(pairs):
+        if cutters.template is None:
+            gap = np.linalg.norm(cutters.centres[pairs[:, 0]] - cutters.centres[pairs[:, 1]], axis=1)
+            # the circles are meshed circumscribed (circle_template)
+            touching = int(np.sum(gap <= 2.0 * (cutters.radius + tolerance) + EPS))
+        else:
+            touching = int(np.sum(~separated(polygons[pairs[:, 0]], polygons[pairs[:, 1]])))
+        if touching:
+            problems.append(f"{touching} pairs of holes touch or overlap")
+    return problems
+
+
+# ==============================================================================
+# 4. DXF EXPORT
+# ==============================================================================
+def outline_entities(outline):
+    """
+    DXF entities of the exact outline: 8 lines (the two narrow edges, the
+    two grip ends and the four grip sides) and the 4 shoulder arcs.
+    """
+    o = outline
+    cy = o.y_narrow + o.radius
+    end = math.degrees(math.atan2(o.y_grip - cy, o.x_end_arc - o.x_start_arc))
+    lines = [
+        ((-o.x_start_arc, o.y_narrow), (o.x_start_arc, o.y_narrow)),
+        ((-o.x_start_arc, -o.y_narrow), (o.x_start_arc, -o.y_narrow)),
+        ((o.x_total, -o.y_grip), (o.x_total, o.y_grip)),
+        ((-o.x_total, -o.y_grip), (-o.x_total, o.y_grip)),
+    ]
+    for sx in (1.0, -1.0):
+        for sy in (1.0, -1.0):
+            lines.append(((sx * o.x_end_arc, sy * o.y_grip), (sx * o.x_total, sy * o.y_grip)))
+
+    # Arc angles are counter-clockwise; mirroring reverses the sweep
+    arcs = [
+        ((o.x_start_arc, cy), -90.0, end),
+        ((-o.x_start_arc, cy), 180.0 - end, 270.0),
+        ((o.x_start_arc, -cy), -end, 90.0),
+        ((-o.x_start_arc, -cy), 90.0, 180.0 + end),
+    ]
+    records = []
+    for (x0, y0), (x1, y1) in lines:
+        records += ["0", "LINE", "8", "OUTLINE", "10", x0, "20", y0, "30", 0.0, "11", x1, "21", y1, "31", 0.0]
+    for (x, y), start, stop in arcs:
+        records += ["0", "ARC", "8", "OUTLINE", "10", x, "20", y, "30", 0.0, "40", o.radius, "50", start, "51", stop]
+    return records
+
+
+def write_dxf(path, outline, cutters):
+    """
+    Writes the cross-section as an ASCII DXF (R12, entities only): the
+    outline on layer OUTLINE with its true arcs, the holes on layer HOLES
+    as circles or closed polylines.
+    """
+    records = ["0", "SECTION", "2", "ENTITIES"] + outline_entities(outline)
+    if cutters.template is None:
+        for x, y in cutters.centres.tolist():
+            records += ["0", "CIRCLE", "8", "HOLES", "10", x, "20", y, "30", 0.0, "40", cutters.radius]
+    else:
+        for polygon in cutter_polygons(cutters):
+            records += ["0", "POLYLINE", "8", "HOLES", "66", "1", "70", "1", "10", 0.0, "20", 0.0, "30", 0.0]
+            for x, y in unpadded(polygon).tolist():
+                records += ["0", "VERTEX", "8", "HOLES", "10", x, "20", y, "30", 0.0]
+            records += ["0", "SEQEND", "8", "HOLES"]
+    records += ["0", "ENDSEC", "0", "EOF"]
+
+    with open(path, "w") as f:
+        f.write("\n".join(r if isinstance(r, str) else f"{float(r):.6f}" for r in records) + "\n")
+
+
+# ==============================================================================
+# 5. MESH
+# ==============================================================================
+def core_profile(outline, inset, tolerance=0.01):
+    """
+    Half width of the core (outline shrunk by `inset`) as a polyline
+    (xs, half widths) from -x to +x end. The inset arcs are chorded to
+    `tolerance`, the chords lying on the outer side.
+    """
+    o = outline
+    core_x = o.x_total - inset
+    arc_end = min(arc_crossing(o, inset, o.y_grip - inset), core_x)
+    half = np.concatenate([
+        [0.0, min(o.x_start_arc, core_x), core_x],
+        arc_samples(o.x_start_arc, o.radius + inset, arc_end, tolerance),
+    ])
+    half = np.unique(np.round(half[half <= core_x], 9))
+    xs = np.concatenate([-half[:0:-1], half])
+    return xs, half_widths(o, xs, inset)
+
+
+def outline_polygon(outline, tolerance=0.01):
+    """
+    Outline as a counter-clockwise polygon, arcs chorded to `tolerance`.
+    """
+    xs, half = core_profile(outline, 0.0, tolerance)
+    return np.vstack([np.column_stack([xs, -half]), np.column_stack([xs[::-1], half[::-1]])])
+
+
+def section_triangles(outline, cutters, tolerance=0.01, max_rounds=32):
+    """
+    Conforming triangulation of the cross-section (outline minus holes).
+    Returns (vertices (V, 2), triangles (T, 3)), counter-clockwise.
+
+    The boundary vertices are triangulated with Delaunay (SciPy); boundary
+    edges missing from the triangulation are split at their midpoint and
+    the triangulation is redone until every one is present. Triangles are
+    then labelled from the boundary edges (region on the left of each,
+    holes turned clockwise) and the labels flood across the other edges.
+    """
+    try:
+        from scipy.spatial import Delaunay
+    except ImportError:
+        raise ValueError("Meshing a cross-section needs SciPy (pip install scipy)") from None
+
+    rings = [unpadded(outline_polygon(outline, tolerance))]
+    rings += [unpadded(polygon)[::-1] for polygon in cutter_polygons(cutters, tolerance)]
+    points = np.vstack(rings)
+    sizes = np.array([len(ring) for ring in rings])
+    start = np.repeat(np.cumsum(sizes) - sizes, sizes)
+    index = np.arange(len(points))
+    edges = np.column_stack([index, start + (index - start + 1) % np.repeat(sizes, sizes)])
+
+    for _ in range(max_rounds):
+        triangles = Delaunay(points).simplices
+        a, b, c = (points[triangles[:, k]] for k in range(3))
+        cross = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+        triangles[cross < 0.0] = triangles[cross < 0.0][:, ::-1]
+
+        m = len(points)
+        directed = np.stack([triangles, np.roll(triangles, -1, axis=1)], axis=-1)
+        undirected = np.sort(directed, axis=-1)
+        present = np.isin(np.min(edges, axis=1) * m + np.max(edges, axis=1), undirected[..., 0] * m + undirected[..., 1])
+        if present.all():
+            break
+
+        # Split the missing edges and try again
+        missing = edges[~present]
+        middle = len(points) + np.arange(len(missing))
+        points = np.vstack([points, (points[missing[:, 0]] + points[missing[:, 1]]) / 2.0])
+        edges = np.vstack([
+            edges[present],
+            np.column_stack([missing[:, 0], middle]),
+            np.column_stack([middle, missing[:, 1]]),
+        ])
+    else:
+        raise ValueError("Cross-section could not be triangulated (holes too close to each other?)")
+
+    # +1 inside, -1 outside, 0 unknown; seeded by the boundary edges
+    keys = directed[..., 0] * m + directed[..., 1]
+    forward = np.isin(keys, edges[:, 0] * m + edges[:, 1])
+    backward = np.isin(keys, edges[:, 1] * m + edges[:, 0])
+    label = np.where(forward.any(axis=1), 1, np.where(backward.any(axis=1), -1, 0))
+
+    # Each inner edge is shared by two triangles: spread the labels across
+    keys_flat = (undirected[..., 0] * m + undirected[..., 1]).reshape(-1)
+    boundary = (forward | backward).reshape(-1)
+    order = np.argsort(keys_flat, kind="stable")
+    sorted_keys = keys_flat[order]
+    twin = np.full(len(keys_flat), -1)
+    same = sorted_keys[1:] == sorted_keys[:-1]
+    twin[order[1:][same]] = order[:-1][same]
+    twin[order[:-1][same]] = order[1:][same]
+    open_edge = (twin >= 0) & ~boundary
+    source = np.flatnonzero(open_edge) // 3
+    target = twin[open_edge] // 3
+    while np.any(label == 0):
+        spread = (label[source] != 0) & (label[target] == 0)
+        if not spread.any():
+            break
+        label[target[spread]] = label[source[spread]]
+
+    return points, triangles[label > 0]
+
+
+def section_mesh(outline, cutters, thickness, tolerance=0.01):
+    """
+    Watertight triangle mesh of the cross-section extruded to `thickness`.
+    """
+    points, triangles = section_triangles(outline, cutters, tolerance)
+    return extrude_polygon_mesh(points, triangles, thickness)
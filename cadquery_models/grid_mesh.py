@@ -0,0 +1,187 @@
+"""
+Direct triangle mesh of the walled grid specimen (no BRep, no booleans).
+
+The 2D region "outline minus the square holes clipped to the inset core" is
+cut into vertical slabs at every X where something changes: hole edges, the
+end of the core, crossings of the core arc with hole edges and the chord
+samples of the transition arcs. Inside a slab the region is a stack of
+trapezoids; neighbouring slabs share all vertices on their common line, so
+the triangulation is conforming and the extruded mesh is watertight.
+"""
+import math
+
+import numpy as np
+
+from cadquery_models.mesh import extrude_polygon_mesh
+from cadquery_models.outline import half_widths
+
+
+# ==============================================================================
+# 1. BREAKPOINTS
+# ==============================================================================
+def arc_samples(x_start, radius, x_stop, tolerance):
+    """
+    X positions along a transition arc (centre above x_start) such that no
+    chord deviates more than `tolerance` from the arc.
+    """
+    if x_stop <= x_start:
+        return np.array([x_start])
+    phi_end = math.asin(min(1.0, (x_stop - x_start) / radius))
+    step = 2.0 * math.acos(max(-1.0, 1.0 - tolerance / radius))
+    n = max(1, math.ceil(phi_end / step))
+    return x_start + radius * np.sin(np.linspace(0.0, phi_end, n + 1))
+
+
+def arc_crossing(outline, inset, y):
+    """
+    X (> x_start_arc) where the inset transition arc reaches height y.
+    """
+    o = outline
+    r_off = o.radius + inset
+    return o.x_start_arc + math.sqrt(r_off**2 - (o.y_narrow + o.radius - y) ** 2)
+
+
+def grid_holes(outline, cell_size, wall_thickness):
+    """
+    Hole centres of the grid cutter (same layout as rarray(..., center=True))
+    and the hole size.
+    """
+    count_x = int(2.0 * outline.x_total / cell_size) + 2
+    count_y = int(2.0 * outline.y_grip / cell_size) + 2
+    cx = (np.arange(count_x) - (count_x - 1) / 2.0) * cell_size
+    cy = (np.arange(count_y) - (count_y - 1) / 2.0) * cell_size
+    return cx, cy, cell_size - wall_thickness
+
+
+# ==============================================================================
+# 2. SLAB TRIANGULATION
+# ==============================================================================
+def _zip_chains(left, right, a_left, b_left, a_right, b_right, triangles):
+    """
+    Triangulates the trapezoid between two vertical vertex chains
+    (lists of (index, y), ascending). Triangles are CCW seen from +Z.
+    """
+    i = j = 0
+    span_left = b_left - a_left
+    span_right = b_right - a_right
+    while i < len(left) - 1 or j < len(right) - 1:
+        if j == len(right) - 1:
+            advance_left = True
+        elif i == len(left) - 1:
+            advance_left = False
+        else:
+            t_left = (left[i + 1][1] - a_left) / span_left
+            t_right = (right[j + 1][1] - a_right) / span_right
+            advance_left = t_left <= t_right
+
+        if advance_left:
+            triangles.append((left[i][0], right[j][0], left[i + 1][0]))
+            i += 1
+        else:
+            triangles.append((left[i][0], right[j][0], right[j + 1][0]))
+            j += 1
+
+
+def grid_region_triangles(outline, cell_size, wall_thickness, perimeter_wall, tolerance=0.01):
+    """
+    Conforming triangulation of the walled grid region.
+    Returns (vertices (V, 2), triangles (T, 3)).
+    """
+    o = outline
+    w = perimeter_wall
+    cx, cy, hole = grid_holes(o, cell_size, wall_thickness)
+    core_x = o.x_total - w
+
+    # Hole edges in X, clipped to the core
+    hole_x0 = np.maximum(cx - hole / 2.0, -core_x)
+    hole_x1 = np.minimum(cx + hole / 2.0, core_x)
+    keep = hole_x1 > hole_x0
+    hole_x0, hole_x1 = hole_x0[keep], hole_x1[keep]
+    hole_y0, hole_y1 = cy - hole / 2.0, cy + hole / 2.0
+    edge_levels = np.unique(np.abs(np.concatenate([hole_y0, hole_y1])))
+
+    # Breakpoints of the right half, mirrored afterwards
+    core_grip_y = o.y_grip - w
+    core_arc_end = min(arc_crossing(o, w, core_grip_y), core_x)
+    xs = [
+        [0.0, o.x_start_arc, o.x_end_arc, o.x_total, core_x, core_arc_end],
+        arc_samples(o.x_start_arc, o.radius, o.x_end_arc, tolerance),
+        arc_samples(o.x_start_arc, o.radius + w, core_arc_end, tolerance),
+        np.abs(np.concatenate([hole_x0, hole_x1])),
+        [arc_crossing(o, w, y) for y in edge_levels if o.y_narrow - w < y < core_grip_y],
+    ]
+    half = np.unique(np.round(np.concatenate([np.ravel(x) for x in xs]), 9))
+    half = half[(half >= 0.0) & (half <= o.x_total)]
+    X = np.unique(np.concatenate([-half, half]))
+
+    # Boundaries sampled on every line; linear in between
+    outer = half_widths(o, X)
+    core = half_widths(o, X, w)
+    # Snap the core onto hole edges it crosses, so the crossing is exact
+    for y in edge_levels:
+        core[np.abs(core - y) < 1e-9] = y
+
+    # Material intervals of every slab: (a_left, b_left, a_right, b_right)
+    slabs = []
+    for k in range(len(X) - 1):
+        xm = 0.5 * (X[k] + X[k + 1])
+        ends = (k, k + 1)
+        cuts = []
+        if abs(xm) < core_x and ((hole_x0 < xm) & (xm < hole_x1)).any():
+            core_mid = 0.5 * (core[k] + core[k + 1])
+            for y0, y1 in zip(hole_y0, hole_y1):
+                if min(y1, core_mid) > max(y0, -core_mid):
+                    lo = [max(y0, -core[e]) for e in ends]
+                    hi = [min(y1, core[e]) for e in ends]
+                    cuts.append((lo, hi))
+
+        bottom = [-outer[e] for e in ends]
+        pieces = []
+        for lo, hi in sorted(cuts):
+            pieces.append((bottom, lo))
+            bottom = hi
+        pieces.append((bottom, [outer[e] for e in ends]))
+        slabs.append(pieces)
+
+    # Vertices: every interval end on every line, shared by both slabs
+    line_ys = [set() for _ in X]
+    for k, pieces in enumerate(slabs):
+        for a, b in pieces:
+            line_ys[k].update((a[0], b[0]))
+            line_ys[k + 1].update((a[1], b[1]))
+
+    vertices = []
+    chains = []
+    for x, ys in zip(X, line_ys):
+        ys = sorted(ys)
+        chains.append([(len(vertices) + n, y) for n, y in enumerate(ys)])
+        vertices.extend((x, y) for y in ys)
+
+    triangles = []
+    for k, pieces in enumerate(slabs):
+        for a, b in pieces:
+            if b[0] <= a[0] and b[1] <= a[1]:
+                continue  # Empty strip
+            left = [v for v in chains[k] if a[0] <= v[1] <= b[0]]
+            right = [v for v in chains[k + 1] if a[1] <= v[1] <= b[1]]
+            _zip_chains(left, right, a[0], b[0], a[1], b[1], triangles)
+
+    return np.array(vertices, dtype=float), np.array(triangles, dtype=np.int64)
+
+
+# ==============================================================================
+# 3. MESH
+# ==============================================================================
+def grid_specimen_mesh(outline, thickness, cell_size, wall_thickness, perimeter_wall, tolerance=0.01):
+    """
+    Watertight mesh of the walled grid specimen, extruded from Z = 0 to
+    `thickness`. `tolerance` is the chord deviation allowed on the arcs.
+    """
+    if perimeter_wall <= 0:
+        # Holes would touch the outline and pinch the surface
+        raise ValueError(f"Perimeter wall ({perimeter_wall}) must be positive for mesh output.")
+
+    vertices, triangles = grid_region_triangles(
+        outline, cell_size, wall_thickness, perimeter_wall, tolerance
+    )
+    return extrude_polygon_mesh(vertices, triangles, thickness)
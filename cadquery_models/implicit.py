@@ -0,0 +1,389 @@
+"""
+Implicit solids meshed on a voxel grid (no BRep, no OpenCascade).
+
+An implicit model is a field that is negative inside the solid and positive
+outside, sampled on a regular grid over a box:
+
+    Implicit(field, low, high, voxel, classify=None)
+        field     : field(x, y, z) -> values; x, y, z are the grid axes shaped
+                    (n, 1, 1), (1, n, 1) and (1, 1, n), so per-axis terms
+                    broadcast instead of being evaluated on the full grid
+                    (adaptive sampling passes the axes of L leaf blocks,
+                    shaped (L, m, 1, 1), (L, 1, m, 1) and (L, 1, 1, m))
+        low, high : corners of the sampled box; the field must be positive
+                    on its faces so that the surface is closed
+        voxel     : sample spacing (mm)
+        classify  : optional classify(x, y, z, radius) -> int8 states of the
+                    balls around the points: +1 if the field is positive in
+                    the whole ball, -1 if negative, 0 if it may change sign
+
+The surface is extracted with marching tetrahedra: every grid cell is split
+into the six tetrahedra around its 000-111 diagonal (neighbouring cells
+split their shared faces the same way) and the zero level of the linear
+interpolant is a triangle or a quad in each tetrahedron. The surface points
+sit on grid edges, so each is computed from the same two samples wherever
+it is used and the mesh is watertight without any tolerance.
+
+The grid is processed in slabs along X. A slab reuses the last sample layer
+of the previous one, so memory follows the slab size, not the grid size,
+and triangles can be streamed straight to an STL file.
+
+With `classify` the samples are placed adaptively: each slab is cut into
+blocks that are classified from their bounding ball (e.g. with Lipschitz
+bounds of the field) and split like an octree while undecided. Only the
+samples of undecided leaf blocks are evaluated; decided blocks get a value
+of their sign, which leaves all their cells without a crossing. The mesh is
+the one dense sampling gives, for a fraction of the field evaluations when
+the surface is sparse or the voxels are fine.
+"""
+import itertools
+from collections import namedtuple
+
+import numpy as np
+
+from cadquery_models.mesh import Mesh, StlWriter
+
+Implicit = namedtuple("Implicit", ["field", "low", "high", "voxel", "classify"], defaults=(None,))
+
+# Grid samples evaluated per slab
+SLAB_SAMPLES = 1 << 21
+
+# Adaptive sampling: top-level blocks (also the slab thickness) and leaf
+# blocks, in cells (powers of two)
+BLOCK_CELLS = 16
+LEAF_CELLS = 4
+
+# Relative slack of the bound tests (rounding of the field evaluation)
+BOUND_SLACK = 1e-9
+
+
+# ==============================================================================
+# 1. TABLES
+# ==============================================================================
+def _kuhn_tetrahedra():
+    """
+    Corner offsets (6, 4, 3) of the tetrahedra of a unit cell: one per
+    order in which the path from 000 to 111 steps along the axes. The
+    corners of each tetrahedron are sorted, so every edge goes from its
+    lower to its upper corner.
+    """
+    tetrahedra = []
+    for order in itertools.permutations(range(3)):
+        corner = [0, 0, 0]
+        corners = [tuple(corner)]
+        for axis in order:
+            corner[axis] = 1
+            corners.append(tuple(corner))
+        tetrahedra.append(corners)
+    return np.array(tetrahedra, dtype=np.int64)
+
+
+def _case_table():
+    """
+    For each inside/outside pattern of the four corners (bit v set if
+    corner v is inside): the triangles as triples of corner edges, ordered
+    so that they face the outside corners in a positively oriented
+    tetrahedron. The order is found once on a reference tetrahedron, which
+    keeps it exact for slivers where a cross product would be noise.
+    """
+    reference = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=float)
+    table = {}
+    for case in range(1, 15):
+        inside = [v for v in range(4) if case >> v & 1]
+        outside = [v for v in range(4) if not case >> v & 1]
+        if len(inside) == 1:
+            triangles = [[(inside[0], v) for v in outside]]
+        elif len(outside) == 1:
+            triangles = [[(outside[0], v) for v in inside]]
+        else:
+            (a, b), (c, d) = inside, outside
+            triangles = [[(a, c), (a, d), (b, d)], [(a, c), (b, d), (b, c)]]
+        # Edges from lower to upper corner
+        triangles = [[(min(e), max(e)) for e in triangle] for triangle in triangles]
+
+        outwards = reference[outside[0]] - reference[inside[0]]
+        for triangle in triangles:
+            a, b, c = (reference[list(edge)].mean(axis=0) for edge in triangle)
+            if np.dot(np.cross(b - a, c - a), outwards) < 0.0:
+                triangle.reverse()
+        table[case] = triangles
+    return table
+
+
+TETRAHEDRA = _kuhn_tetrahedra()
+CASES = _case_table()
+
+# Tetrahedra with negative orientation get their triangles reversed
+MIRRORED = np.linalg.det((TETRAHEDRA[:, 1:] - TETRAHEDRA[:, :1]).astype(float)) < 0.0
+
+# Code of an edge direction (upper minus lower corner, all in {0, 1})
+DIRECTION_CODE = np.array([4, 2, 1], dtype=np.int64)
+
+
+# ==============================================================================
+# 2. BOUNDS
+# ==============================================================================
+def lipschitz_state(value, lipschitz, radius):
+    """
+    State of a field with Lipschitz constant `lipschitz` in the balls of
+    `radius` around points where it takes `value`.
+    """
+    reach = lipschitz * np.asarray(radius) * (1.0 + BOUND_SLACK) + BOUND_SLACK
+    return np.where(value > reach, 1, np.where(value < -reach, -1, 0)).astype(np.int8)
+
+
+def state_max(*states):
+    """
+    State of the maximum of fields (intersection of solids).
+    """
+    states = np.broadcast_arrays(*states)
+    return np.where(np.any([s == 1 for s in states], axis=0), 1,
+                    np.where(np.all([s == -1 for s in states], axis=0), -1, 0)).astype(np.int8)
+
+
+def state_min(*states):
+    """
+    State of the minimum of fields (union of solids).
+    """
+    return -state_max(*(-np.asarray(s) for s in states))
+
+
+# ==============================================================================
+# 3. SAMPLING
+# ==============================================================================
+def grid_shape(model):
+    """
+    Number of cells along each axis.
+    """
+    extent = np.asarray(model.high, dtype=float) - np.asarray(model.low, dtype=float)
+    return np.maximum(np.ceil(extent / model.voxel).astype(np.int64), 1)
+
+
+def grid_axes(model):
+    n = grid_shape(model)
+    low = np.asarray(model.low, dtype=float)
+    return tuple(low[axis] + np.arange(n[axis] + 1) * model.voxel for axis in range(3))
+
+
+def slab_values(model, layers=None):
+    """
+    Yields (i0, values): the samples of the cell layers from i0 on, one
+    slab at a time; values[0] is the sample layer at X index i0. Models
+    with a `classify` are sampled adaptively.
+    """
+    if model.classify is not None:
+        yield from adaptive_slab_values(model)
+        return
+
+    n = grid_shape(model)
+    x, y, z = grid_axes(model)
+    if layers is None:
+        layers = max(1, SLAB_SAMPLES // int((n[1] + 1) * (n[2] + 1)))
+
+    previous = None
+    for i0 in range(0, int(n[0]), layers):
+        i1 = min(i0 + layers, int(n[0]))
+        start = i0 if previous is None else i0 + 1
+        values = model.field(x[start:i1 + 1, None, None], y[None, :, None], z[None, None, :])
+        values = np.broadcast_to(values, (i1 + 1 - start, len(y), len(z)))
+        if previous is not None:
+            values = np.concatenate([previous, values])
+        yield i0, values
+        previous = values[-1:]
+
+
+def leaf_states(model, i0, layers):
+    """
+    States of the leaf blocks of the slab of cell layers i0 .. i0 + layers,
+    indexed (X, Y, Z) in leaf units. Blocks are classified from the top
+    level down; undecided ones are split in eight until they are leaves,
+    which stay 0 (to be sampled).
+    """
+    n = grid_shape(model)
+    cell_low = np.array([i0, 0, 0])
+    cell_high = np.array([i0 + layers, n[1], n[2]])
+    leaves = -(-(cell_high - cell_low) // LEAF_CELLS)
+    states = np.zeros(leaves, dtype=np.int8)
+
+    size = BLOCK_CELLS // LEAF_CELLS
+    origins = np.stack(np.meshgrid(*(np.arange(0, m, size) for m in leaves), indexing="ij"), axis=-1).reshape(-1, 3)
+    low = np.asarray(model.low, dtype=float)
+    while len(origins):
+        # Cell box of every block, clipped to the slab
+        lo = cell_low + origins * LEAF_CELLS
+        hi = np.minimum(lo + size * LEAF_CELLS, cell_high)
+        centre = low + (lo + hi) * (model.voxel / 2.0)
+        radius = np.linalg.norm(hi - lo, axis=1) * (model.voxel / 2.0)
+        state = np.asarray(model.classify(centre[:, 0], centre[:, 1], centre[:, 2], radius), dtype=np.int8)
+
+        decided = state != 0
+        offsets = np.stack(np.meshgrid(*[np.arange(size)] * 3, indexing="ij"), axis=-1).reshape(-1, 3)
+        index = (origins[decided][:, None, :] + offsets[None]).reshape(-1, 3)
+        fill = np.repeat(state[decided], len(offsets))
+        valid = (index < leaves).all(axis=1)
+        states[tuple(index[valid].T)] = fill[valid]
+        if size == 1:
+            break
+
+        size //= 2
+        children = origins[~decided][:, None, :] + np.array(list(itertools.product((0, size), repeat=3)))[None]
+        children = children.reshape(-1, 3)
+        origins = children[(children < leaves).all(axis=1)]
+    return states
+
+
+def cell_mask(leaf_mask, shape):
+    """
+    Leaf block mask expanded to cells and cropped to `shape`.
+    """
+    for axis in range(3):
+        leaf_mask = np.repeat(leaf_mask, LEAF_CELLS, axis=axis)
+    return leaf_mask[:shape[0], :shape[1], :shape[2]]
+
+
+def corner_mask(cells):
+    """
+    Samples that are a corner of at least one of the `cells`.
+    """
+    m, ny, nz = cells.shape
+    corners = np.zeros((m + 1, ny + 1, nz + 1), dtype=bool)
+    for dx, dy, dz in itertools.product((0, 1), repeat=3):
+        corners[dx:dx + m, dy:dy + ny, dz:dz + nz] |= cells
+    return corners
+
+
+def adaptive_slab_values(model):
+    """
+    slab_values() for models with a `classify`: one slab per layer of top
+    blocks, evaluating only the undecided leaf blocks. Each leaf is sampled
+    as a small grid, so the field still broadcasts over its axes. Samples
+    shared by neighbouring leaves end up with one value in the slab. On the
+    layer shared with the previous slab, a real sample from either side
+    wins over a placeholder, so every cell face is seen the same way from
+    both sides and no crossing is placed from a placeholder.
+    """
+    n = grid_shape(model)
+    x, y, z = grid_axes(model)
+    corners = np.arange(LEAF_CELLS + 1)
+
+    previous = previous_sampled = None
+    for i0 in range(0, int(n[0]), BLOCK_CELLS):
+        layers = min(BLOCK_CELLS, int(n[0]) - i0)
+        states = leaf_states(model, i0, layers)
+        shape = (layers, int(n[1]), int(n[2]))
+
+        values = np.ones((layers + 1, len(y), len(z)))
+        values[corner_mask(cell_mask(states == -1, shape))] = -1.0
+        sampled = np.zeros(values.shape, dtype=bool)
+
+        # Sample axes of every undecided leaf, slab local, (L, LEAF_CELLS + 1)
+        leaves = np.argwhere(states == 0) * LEAF_CELLS
+        i, j, k = (np.minimum(leaves[:, axis, None] + corners, size - 1) for axis, size in enumerate(values.shape))
+        if len(leaves):
+            i, j, k = i[:, :, None, None], j[:, None, :, None], k[:, None, None, :]
+            values[i, j, k] = model.field(x[i + i0], y[j], z[k])
+            sampled[i, j, k] = True
+        if previous is not None:
+            values[0] = np.where(previous_sampled, previous, values[0])
+            sampled[0] |= previous_sampled
+        yield i0, values
+        previous, previous_sampled = values[-1], sampled[-1]
+
+
+# ==============================================================================
+# 4. MARCHING TETRAHEDRA
+# ==============================================================================
+def slab_triangles(model, i0, values):
+    """
+    Surface triangles of one slab: points (T, 3, 3), oriented outwards, and
+    edge keys (T, 3) that identify each point across the whole grid.
+    """
+    inside = values < 0.0
+    m, ny, nz = (s - 1 for s in inside.shape)
+
+    # Cells with corners on both sides
+    any_in = np.zeros((m, ny, nz), dtype=bool)
+    all_in = np.ones((m, ny, nz), dtype=bool)
+    for dx, dy, dz in itertools.product((0, 1), repeat=3):
+        corner = inside[dx:dx + m, dy:dy + ny, dz:dz + nz]
+        any_in |= corner
+        all_in &= corner
+    cells = np.column_stack(np.nonzero(any_in & ~all_in))
+    if not len(cells):
+        return np.zeros((0, 3, 3)), np.zeros((0, 3), dtype=np.int64)
+
+    # Corner sample indices of every tetrahedron (C * 6, 4, 3), slab local
+    corners = (cells[:, None, None, :] + TETRAHEDRA[None]).reshape(-1, 4, 3)
+    phi = values[corners[..., 0], corners[..., 1], corners[..., 2]]
+    case = ((phi < 0.0) * np.array([1, 2, 4, 8])).sum(axis=1)
+    mirrored = np.tile(MIRRORED, len(cells))
+
+    low = np.asarray(model.low, dtype=float)
+    offset = np.array([i0, 0, 0])
+    points = []
+    keys = []
+    for code, triangles in CASES.items():
+        selected = np.nonzero(case == code)[0]
+        if not len(selected):
+            continue
+        index = corners[selected] + offset
+        position = low + index * model.voxel
+        value = phi[selected]
+        flip = mirrored[selected]
+
+        for triangle in triangles:
+            p = np.empty((len(selected), 3, 3))
+            k = np.empty((len(selected), 3), dtype=np.int64)
+            for slot, (a, b) in enumerate(triangle):
+                t = value[:, a] / (value[:, a] - value[:, b])
+                p[:, slot] = position[:, a] + t[:, None] * (position[:, b] - position[:, a])
+                linear = (index[:, a, 0] * (ny + 1) + index[:, a, 1]) * (nz + 1) + index[:, a, 2]
+                k[:, slot] = linear * 7 + (index[:, b] - index[:, a]) @ DIRECTION_CODE - 1
+            p[flip] = p[flip][:, ::-1]
+            k[flip] = k[flip][:, ::-1]
+            points.append(p)
+            keys.append(k)
+
+    return np.vstack(points), np.vstack(keys)
+
+
+def implicit_chunks(model):
+    """
+    Yields (points (T, 3, 3), keys (T, 3)) slab by slab.
+    """
+    for i0, values in slab_values(model):
+        points, keys = slab_triangles(model, i0, values)
+        if len(points):
+            yield points, keys
+
+
+# ==============================================================================
+# 5. OUTPUT
+# ==============================================================================
+def implicit_mesh(model):
+    """
+    Meshes an implicit model into one indexed mesh.Mesh. Points are merged
+    by their grid edge, so the mesh is closed by construction.
+    """
+    all_points = []
+    all_keys = []
+    for points, keys in implicit_chunks(model):
+        all_points.append(points.reshape(-1, 3))
+        all_keys.append(keys.reshape(-1))
+    if not all_keys:
+        return Mesh(np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64))
+
+    _, first, inverse = np.unique(np.concatenate(all_keys), return_index=True, return_inverse=True)
+    vertices = np.vstack(all_points)[first]
+    return Mesh(vertices, inverse.reshape(-1, 3))
+
+
+def stream_implicit_stl(model, path):
+    """
+    Writes an implicit model to a binary STL slab by slab; only one slab of
+    samples and triangles is held in memory. Returns the triangle count.
+    """
+    with StlWriter(path, b"cadquery_models implicit") as stl:
+        for points, _ in implicit_chunks(model):
+            stl.write(points.reshape(-1, 3), np.arange(3 * len(points)).reshape(-1, 3))
+    return stl.count
@@ -0,0 +1,172 @@
+"""
+Instanced models: geometry that is stored once and placed many times.
+
+A lattice or a build plate repeats the same solid over and over. Instead of
+fusing or copying it, an instanced model keeps one entry per distinct
+geometry together with the transforms it is placed at. Exporters that
+support instancing (3MF) write each geometry once; the others place the
+copies (see `placed_shapes`).
+
+    Part(geometry, transforms)
+        geometry   : cadquery Shape or mesh.Mesh, in its own coordinates
+        transforms : (K, 3, 4) array of [R | t] placements
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from cadquery_models.mesh import Mesh, bounding_box
+
+Part = namedtuple("Part", ["geometry", "transforms"])
+Instanced = namedtuple("Instanced", ["parts"])
+
+IDENTITY = np.hstack([np.eye(3), np.zeros((3, 1))])
+
+
+# ==============================================================================
+# 1. TRANSFORMS
+# ==============================================================================
+def trsf_matrix(trsf):
+    """
+    [R | t] matrix (3, 4) of an OCC gp_Trsf.
+    """
+    return np.array([[trsf.Value(r, c) for c in range(1, 5)] for r in range(1, 4)])
+
+
+def location_matrix(location):
+    """
+    [R | t] matrix (3, 4) of a cadquery Location.
+    """
+    return trsf_matrix(location.wrapped.Transformation())
+
+
+def matrix_location(matrix):
+    """
+    cadquery Location of a [R | t] matrix.
+    """
+    import cadquery as cq
+    from OCP.gp import gp_Trsf
+
+    trsf = gp_Trsf()
+    trsf.SetValues(*np.asarray(matrix, dtype=float).ravel())
+    return cq.Location(trsf)
+
+
+def apply_transform(vertices, matrix):
+    """
+    Vertices (N, 3) placed by a [R | t] matrix.
+    """
+    return vertices @ matrix[:, :3].T + matrix[:, 3]
+
+
+def compose(outer, inner):
+    """
+    [R | t] of `inner` followed by `outer`.
+    """
+    return np.hstack([outer[:, :3] @ inner[:, :3], (outer[:, :3] @ inner[:, 3] + outer[:, 3])[:, None]])
+
+
+# ==============================================================================
+# 2. BUILDING
+# ==============================================================================
+def group_instances(shapes):
+    """
+    Groups the solids of located shapes by the geometry they share
+    (instances made with Shape.moved of one prototype). Returns one Part
+    per distinct solid, with the solid unplaced and one transform per
+    instance. Shapes are split into solids so that every part is a closed
+    surface on its own.
+    """
+    import cadquery as cq
+    from OCP.TopLoc import TopLoc_Location
+
+    groups = []
+    for shape in (solid for s in shapes for solid in (s.Solids() or [s])):
+        prototype = shape.wrapped.Located(TopLoc_Location())
+        matrix = location_matrix(shape.location())
+        for geometry, transforms in groups:
+            if geometry.wrapped.IsSame(prototype):
+                transforms.append(matrix)
+                break
+        else:
+            groups.append((cq.Shape.cast(prototype), [matrix]))
+    return [Part(geometry, np.array(transforms)) for geometry, transforms in groups]
+
+
+def placed_shapes(model):
+    """
+    Every instance of an instanced model as a located shape, e.g. for STEP
+    export. Only BRep parts can be placed this way.
+    """
+    shapes = []
+    for part in model.parts:
+        if isinstance(part.geometry, Mesh):
+            raise ValueError("Instanced model holds direct meshes; export it as stl or 3mf")
+        for matrix in part.transforms:
+            shapes.append(part.geometry.moved(matrix_location(matrix)))
+    return shapes
+
+
+def instance_count(model):
+    return sum(len(part.transforms) for part in model.parts)
+
+
+def as_instanced(model):
+    """
+    Any generator result as an Instanced model (a single part placed once
+    if it is not instanced already).
+    """
+    if isinstance(model, Instanced):
+        return model
+
+    import cadquery as cq
+
+    if isinstance(model, cq.Workplane):
+        shapes = [v for v in model.vals() if isinstance(v, cq.Shape)]
+        model = shapes[0] if len(shapes) == 1 else cq.Compound.makeCompound(shapes)
+    return Instanced([Part(model, IDENTITY[None])])
+
+
+def model_bounds(model):
+    """
+    (min_xyz, max_xyz) of an instanced model: the bounding box corners of
+    every part, placed by each of its transforms.
+    """
+    corners = []
+    for part in model.parts:
+        if isinstance(part.geometry, Mesh):
+            low, high = bounding_box(part.geometry)
+        else:
+            bb = part.geometry.BoundingBox()
+            low, high = np.array([bb.xmin, bb.ymin, bb.zmin]), np.array([bb.xmax, bb.ymax, bb.zmax])
+        box = np.array([[x, y, z] for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])])
+        for matrix in part.transforms:
+            corners.append(apply_transform(box, matrix))
+    corners = np.vstack(corners)
+    return corners.min(axis=0), corners.max(axis=0)
+
+
+def place(model, matrix):
+    """
+    Instanced model moved as a whole by a [R | t] matrix.
+    """
+    return Instanced([
+        Part(part.geometry, np.array([compose(matrix, t) for t in part.transforms]))
+        for part in model.parts
+    ])
+
+
+def merge(models):
+    """
+    One Instanced model from several; parts with the same geometry object
+    are merged into one part with all their transforms.
+    """
+    parts = {}
+    for model in models:
+        for part in model.parts:
+            key = id(part.geometry)
+            if key in parts:
+                parts[key] = Part(part.geometry, np.vstack([parts[key].transforms, part.transforms]))
+            else:
+                parts[key] = part
+    return Instanced(list(parts.values()))
@@ -0,0 +1,190 @@
+"""
+Lightweight phase instrumentation for the generators.
+
+Generators wrap their phases in `span("name")`. Every finished span is sent
+to the registered sinks as a plain dict:
+
+    name          : dotted path of the enclosing spans ("iso527_1b_lattice.union")
+    elapsed_s     : wall time
+    rss_peak_mb   : growth of the process peak RSS during the span (None if
+                    it cannot be read, see peak_rss_mb())
+    solids, faces : topology of the phase output (if reported with .output())
+    triangles     : for direct meshes
+    parts, instances : for instanced models (distinct geometries, placements)
+    voxels        : grid size of implicit models
+    operands      : boolean operand count (if reported)
+
+The peak RSS is the lifetime high-water mark of the process: it never goes
+down, so a span only shows growth when it sets a new peak. A phase that
+stays below the peak of an earlier phase (or an earlier build in the same
+process) reads 0 even if it allocated a lot. Run one build per process
+(as bench_generators.py does) to compare phases by memory.
+
+With no sink registered a span costs next to nothing (nothing is measured or
+counted). Set CADQUERY_MODELS_TRACE=1 to print every span to the console.
+"""
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from cadquery_models.implicit import Implicit, grid_shape
+from cadquery_models.instances import Instanced, instance_count
+from cadquery_models.mesh import Mesh
+
+try:
+    import resource
+except ImportError:  # Windows: peak working set from psutil, if installed
+    resource = None
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+_SINKS = []
+_LOCAL = threading.local()
+
+
+# ==============================================================================
+# 1. SINKS
+# ==============================================================================
+def add_sink(sink):
+    """
+    Registers a callable that receives every finished span record.
+    """
+    _SINKS.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    if sink in _SINKS:
+        _SINKS.remove(sink)
+
+
+def print_sink(record):
+    """
+    Console sink in the style of the generator banners.
+    """
+    details = "".join(
+        f", {key} {record[key]}" for key in ("operands", "solids", "faces", "triangles", "parts", "instances", "voxels")
+        if key in record
+    )
+    rss = "n/a" if record["rss_peak_mb"] is None else f"+{record['rss_peak_mb']:.1f} MB"
+    print(f"[TIME] {record['name']}: {record['elapsed_s']:.3f} s, peak RSS {rss}{details}")
+
+
+@contextmanager
+def collect():
+    """
+    Collects the span records of the enclosed block into a list.
+    """
+    records = []
+    add_sink(records.append)
+    try:
+        yield records
+    finally:
+        remove_sink(records.append)
+
+
+if os.environ.get("CADQUERY_MODELS_TRACE"):
+    add_sink(print_sink)
+
+
+# ==============================================================================
+# 2. SPANS
+# ==============================================================================
+def peak_rss_mb():
+    """
+    Lifetime peak resident set size of this process in MB (peak working set
+    on Windows), or None where it cannot be read (Windows without psutil).
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+    if psutil is not None:
+        return psutil.Process().memory_info().peak_wset / 1024**2
+    return None
+
+
+class Span:
+    """
+    Handle of an open span; lets the phase report what it produced.
+    """
+
+    def __init__(self, name, active):
+        self.active = active
+        self.record = {"name": name}
+
+    def output(self, model):
+        """
+        Records the solid/face count of a Workplane, Shape, list of shapes or
+        mesh.Mesh produced by the phase. Returns `model` unchanged.
+        """
+        if self.active:
+            self.record.update(topology(model))
+        return model
+
+    def operands(self, count):
+        """
+        Records the number of boolean operands of the phase.
+        """
+        if self.active:
+            self.record["operands"] = int(count)
+
+
+def topology(model):
+    """
+    Solid and face counts of a model (triangles for direct meshes, parts
+    and placements for instanced models, grid samples for implicit ones).
+    """
+    if isinstance(model, Mesh):
+        return {"triangles": len(model.faces)}
+    if isinstance(model, Instanced):
+        return {"parts": len(model.parts), "instances": instance_count(model)}
+    if isinstance(model, Implicit):
+        return {"voxels": int(grid_shape(model).prod())}
+
+    if hasattr(model, "vals"):
+        shapes = model.vals()
+    elif isinstance(model, (list, tuple)):
+        shapes = model
+    else:
+        shapes = [model]
+
+    shapes = [s for s in shapes if hasattr(s, "Solids")]
+    return {
+        "solids": sum(len(s.Solids()) for s in shapes),
+        "faces": sum(len(s.Faces()) for s in shapes),
+    }
+
+
+@contextmanager
+def span(name):
+    """
+    Times the enclosed phase and reports it to the sinks. Nested spans are
+    named after their parents.
+    """
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    stack.append(name)
+    handle = Span(".".join(stack), bool(_SINKS))
+
+    if not handle.active:
+        try:
+            yield handle
+        finally:
+            stack.pop()
+        return
+
+    rss_start = peak_rss_mb()
+    start = time.perf_counter()
+    try:
+        yield handle
+    finally:
+        stack.pop()
+        handle.record["elapsed_s"] = time.perf_counter() - start
+        handle.record["rss_peak_mb"] = None if rss_start is None else peak_rss_mb() - rss_start
+        for sink in list(_SINKS):
+            sink(handle.record)
@@ -1,6 +1,11 @@
-import cadquery as cq
-import math
 import os
+import sys
+
+# Make the shared kernels importable when this file is run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from cadquery_models.instrument import span
+from cadquery_models.outline import dogbone_outline
+from cadquery_models.profile import base_body
 
 # 1. User Parameters (Type 1A) 
 params = {
@@ -27,19 +32,11 @@ def generate_type_1a(p):
     R  = p["transition_radius"]
     h  = p["thickness"]
     
-    # Y-Coordinates
-    y_narrow = b2 / 2.0  # 5.0 mm
-    y_grip   = b1 / 2.0  # 10.0 mm
-    
-    # Calculate Transition Geometry (dx)
-    dy = y_grip - y_narrow      # 5.0 mm
-    # Pythagoras: dx = sqrt(R^2 - (R - dy)^2)
-    dx = math.sqrt(R**2 - (R - dy)**2) # approx 23.98 mm
-
-    # X-Coordinates
-    x_start_arc = L2 / 2.0      # 40.0 mm (End of parallel part)
-    x_end_arc   = x_start_arc + dx
-    x_total     = L0 / 2.0      # 85.0 mm
+    # Outline Coordinates
+    # Transition dx from Pythagoras: dx = sqrt(R^2 - (R - dy)^2) (approx 23.98 mm)
+    outline = dogbone_outline(L0, L2, b2, b1, R)
+    x_end_arc = outline.x_end_arc
+    x_total   = outline.x_total     # 85.0 mm
     
     # Actual Physical Grip Length Result
     actual_grip_len = x_total - x_end_arc
@@ -50,36 +47,21 @@ def generate_type_1a(p):
     print(f"Resulting Grip Length: {actual_grip_len:.2f} mm")
     
     # 3. Modeling 
-    # Sketch Top-Right Quadrant
-    q_sketch = (
-        cq.Workplane("XY")
-        .moveTo(0, 0)
-        .lineTo(0, y_narrow)            # Center -> Narrow Width
-        .lineTo(x_start_arc, y_narrow)  # Parallel Section (40mm)
-        
-        # Negative R (-R) for Inner/Concave Arc
-        .radiusArc((x_end_arc, y_grip), -R) 
-        
-        .lineTo(x_total, y_grip)        # Grip Section
-        .lineTo(x_total, 0)             # Close Loop
-        .close()
-    )
-
-    # Extrude and Union 
-    quarter_solid = q_sketch.extrude(h)
-    half_solid    = quarter_solid.union(quarter_solid.mirror("YZ"))
-    final_body    = half_solid.union(half_solid.mirror("XZ"))
+    # Shared profile kernel (full closed outline extruded once; cached)
+    with span("profile") as phase:
+        final_body = phase.output(base_body(outline, h))
     
     return final_body
 
-# 4. Execution 
-final_model = generate_type_1a(params)
+if __name__ in ("__main__", "__cq_main__"):
+    # 4. Execution 
+    final_model = generate_type_1a(params)
 
-# 5. Render in CQ-Editor 
-if 'show_object' in globals():
-    show_object(final_model, name=params["type_name"])
+    # 5. Render in CQ-Editor 
+    if 'show_object' in globals():
+        show_object(final_model, name=params["type_name"])
 
-# 6. Export (Optional) 
-# output_folder = r"C:\Users\taner\Downloads"
-# file_path = os.path.join(output_folder, params["type_name"] + ".step")
-# cq.exporters.export(final_model, file_path)
\ No newline at end of file
+    # 6. Export (Optional) 
+    # output_folder = r"C:\Users\taner\Downloads"
+    # file_path = os.path.join(output_folder, params["type_name"] + ".step")
+    # cq.exporters.export(final_model, file_path)
\ No newline at end of file
@@ -1,6 +1,11 @@
-import cadquery as cq
-import math
 import os
+import sys
+
+# Make the shared kernels importable when this file is run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from cadquery_models.instrument import span
+from cadquery_models.outline import dogbone_outline
+from cadquery_models.profile import base_body
 
 # 1. User Parameters
 params = {
@@ -24,24 +29,12 @@ def generate_from_params(p):
     R = p["transition_radius"]
     H = p["thickness"]
 
-    # Y-Coordinates (Heights)
-    y_narrow = W_narrow / 2.0
-    y_grip = W_grip / 2.0
+    # Outline Coordinates
+    # Transition Length (dx) from Pythagoras: R^2 = dx^2 + (R - dy)^2
+    outline = dogbone_outline(L_total, L_parallel, W_narrow, W_grip, R)
 
-    # Calculate Transition Length (dx)
-    # Pythagoras: R^2 = dx^2 + (R - dy)^2
-    dy = y_grip - y_narrow
-    dx = math.sqrt(R**2 - (R - dy)**2)
-
-    # X-Coordinates
-    # 1. End of the straight narrow part
-    x_start_arc = L_parallel / 2.0
-    
-    # 2. End of the curve (Start of the wide grip)
-    x_end_arc = x_start_arc + dx
-    
-    # 3. Total half-length
-    x_total = L_total / 2.0
+    # End of the curve (Start of the wide grip)
+    x_end_arc = outline.x_end_arc
 
     # Console Info
     shoulder_dist = x_end_arc * 2
@@ -52,36 +45,21 @@ def generate_from_params(p):
     print(f"Status: Grip distance is outside the curve? {'YES' if p['gauge_length'] >= shoulder_dist else 'WARNING: Grips overlap curve'}")
 
     # 3. Modeling ---
-    # Top-Right Quadrant Sketch
-    q_sketch = (
-        cq.Workplane("XY")
-        .moveTo(0, 0)
-        .lineTo(0, y_narrow)            # Center -> Narrow Width
-        .lineTo(x_start_arc, y_narrow)  # Parallel Section
-        
-        # Negative R (-R) for Inner/Concave Arc
-        .radiusArc((x_end_arc, y_grip), -R) 
-        
-        .lineTo(x_total, y_grip)        # Grip Section
-        .lineTo(x_total, 0)             # Close Loop
-        .close()
-    )
-
-    # Extrude and Union (It prevents split lines)
-    quarter_solid = q_sketch.extrude(H)
-    half_solid = quarter_solid.union(quarter_solid.mirror("YZ"))
-    final_body = half_solid.union(half_solid.mirror("XZ"))
+    # Shared profile kernel (full closed outline extruded once; cached)
+    with span("profile") as phase:
+        final_body = phase.output(base_body(outline, H))
     
     return final_body
 
-# 4. Execution ---
-final_model = generate_from_params(params)
+if __name__ in ("__main__", "__cq_main__"):
+    # 4. Execution ---
+    final_model = generate_from_params(params)
 
-# 5. Render in CQ-Editor
-if 'show_object' in globals():
-    show_object(final_model, name="ISO_527_From_Params")
+    # 5. Render in CQ-Editor
+    if 'show_object' in globals():
+        show_object(final_model, name="ISO_527_From_Params")
 
-# 6. Export (Optional) 
-# output_folder = r"C:\Users\taner\Downloads" #Change the selected directory
-# file_path = os.path.join(output_folder, "ISO_527_Parametric.step")
-# cq.exporters.export(final_model, file_path)
\ No newline at end of file
+    # 6. Export (Optional) 
+    # output_folder = r"C:\Users\taner\Downloads" #Change the selected directory
+    # file_path = os.path.join(output_folder, "ISO_527_Parametric.step")
+    # cq.exporters.export(final_model, file_path)
\ No newline at end of file
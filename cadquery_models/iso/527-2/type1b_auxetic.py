@@ -1,6 +1,15 @@
 import cadquery as cq
-import math
+import numpy as np
 import os
+import sys
+
+# Make the shared kernels importable when this file is run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from cadquery_models.cutters import Cutters, cutter_face, cutter_problems, cutter_wires, section_mesh, select, write_dxf
+from cadquery_models.instrument import span
+from cadquery_models.outline import classify_points, dogbone_outline
+from cadquery_models.profile import base_body, extrude_section, outline_wire
+from cadquery_models.symmetry import mirror_quadrant, quadrant_mask, quadrant_section
 
 # ==============================================================================
 # 1. CONFIGURATION
@@ -22,96 +31,47 @@ PATTERN = {
 
 OUTPUT_DIR = r"C:\Users\taner\Downloads"
 
+# Build only the top-right quadrant and mirror it (see symmetry.py)
+QUADRANT_SYMMETRY = False
+
 # ==============================================================================
 # 2. BOUNDARY
 # ==============================================================================
-def is_inside_boundary(x, y):
+def is_inside_boundary(x, y, p=PARAMS, pattern=PATTERN):
     """
-    Mathematically checks if a point (x,y) is inside the ISO 527 shape.
-    Uses rounding to strictly solve the 'Left Quadrant' missing issue.
+    Checks which points (x,y) are inside the ISO 527 shape.
+    Accepts scalars or NumPy arrays and classifies all points in one call.
     """
-    p = PARAMS
     # Effective margin required
-    safe_margin = PATTERN["margin"] + (PATTERN["cell"] / 2.0)
-    
-    # Use absolute values for perfect symmetry (Left = Right)
-    ax = round(abs(x), 5)
-    ay = round(abs(y), 5)
-    
-    # 1. Check Total Length limits
-    if ax > ((p["L_tot"] / 2.0) - safe_margin):
-        return False
-
-    # 2. Check Width limits (Y-Axis)
-    max_y = 0.0
-
-    # Region A: Parallel Narrow Section
-    if ax <= (p["L_par"] / 2.0):
-        max_y = p["W_nar"] / 2.0
-
-    # Region B: Grip & Transition
-    else:
-        # Calculate transition parameters
-        dy = (p["W_grip"] - p["W_nar"]) / 2.0
-        dx = math.sqrt(p["Rad"]**2 - (p["Rad"] - dy)**2)
-        x_grip_start = (p["L_par"] / 2.0) + dx
-
-        if ax >= x_grip_start:
-            # Straight Grip Section
-            max_y = p["W_grip"] / 2.0
-        else:
-            # Transition Curve (Fillet)
-            x_local = ax - (p["L_par"] / 2.0)
-            if x_local > p["Rad"]: x_local = p["Rad"] # Clamp
-            
-            # Curve Formula
-            drop = p["Rad"] - math.sqrt(p["Rad"]**2 - x_local**2)
-            max_y = (p["W_nar"] / 2.0) + drop
+    safe_margin = pattern["margin"] + (pattern["cell"] / 2.0)
 
-    # Final Check
-    return ay <= (max_y - safe_margin)
+    outline = dogbone_outline(p["L_tot"], p["L_par"], p["W_nar"], p["W_grip"], p["Rad"])
+    inside, _ = classify_points(outline, x, y, safe_margin)
+    return inside
 
 # ==============================================================================
 # 3. GENERATION
 # ==============================================================================
-def generate_ultimate_specimen():
-    print("STEP 1: Generating Base Solid...")
-    p = PARAMS
-    
-    # A. Base Geometry 
-    yn, yg = p["W_nar"]/2.0, p["W_grip"]/2.0
-    dy = yg - yn
-    dx = math.sqrt(p["Rad"]**2 - (p["Rad"] - dy)**2)
-    xs, xe, xt = p["L_par"]/2.0, p["L_par"]/2.0 + dx, p["L_tot"]/2.0
-
-    # Draw quadrant
-    edge = (
-        cq.Workplane("XY").moveTo(0,0).lineTo(0, yn)
-        .lineTo(xs, yn).radiusArc((xe, yg), -p["Rad"])
-        .lineTo(xt, yg).lineTo(xt, 0).close()
-    )
-    # Extrude and Mirror
-    base = edge.extrude(p["Thick"])
-    base = base.mirror("YZ", union=True).mirror("XZ", union=True)
-
-    print("STEP 2: Calculating Pattern Coordinates...")
-    
+def auxetic_cutters(p=PARAMS, pattern=PATTERN):
+    """
+    Bow-tie cells as arrays: the centres that fit and one shared template.
+    """
     # B. Define Pattern Shape 
-    c = PATTERN["cell"]
-    w = PATTERN["wall"]
+    c = pattern["cell"]
+    w = pattern["wall"]
     h = c - w
     d = h / 2.0
-    xi = d - (h * PATTERN["depth"])
+    xi = d - (h * pattern["depth"])
     
-    # Standard Vertices (Horizontal)
-    pts_std = [
+    # Standard Vertices (Horizontal, counter-clockwise)
+    pts_std = np.array([
         (xi, 0), (d, d), (-d, d), 
         (-xi, 0), (-d, -d), (d, -d)
-    ]
+    ])
     
-    # Rotate 90 Degrees if requested
-    if PATTERN["rotate"]:
-        pts_draw = [(y, x) for x, y in pts_std]
+    # Rotate 90 Degrees if requested (swapping X and Y also reverses the order)
+    if pattern["rotate"]:
+        pts_draw = pts_std[::-1, ::-1]
     else:
         pts_draw = pts_std
 
@@ -120,71 +80,101 @@ def generate_ultimate_specimen():
     rx = int((p["L_tot"] / 2.0) / c) + 2
     ry = int((p["W_grip"] / 2.0) / c) + 2
     
-    # We create a single Workplane
-    cutter_sketch = cq.Workplane("XY")
-    count = 0
-
-    # Loop from Negative to Positive
-    for i in range(-rx, rx + 1):
-        for j in range(-ry, ry + 1):
-            
-            # Center of the cell
-            cx = i * c
-            cy = j * c
-            
-            # Mathematical Check
-            if is_inside_boundary(cx, cy):
-                # Calculate Absolute Coordinates for this cell
-                abs_pts = [(vx + cx, vy + cy) for vx, vy in pts_draw]
-                
-                # Add this polygon to the stack
-                cutter_sketch = cutter_sketch.polyline(abs_pts).close()
-                count += 1
-                
+    # Cell centers from Negative to Positive
+    i, j = np.meshgrid(np.arange(-rx, rx + 1), np.arange(-ry, ry + 1), indexing="ij")
+    centers_x = (i * c).ravel()
+    centers_y = (j * c).ravel()
+
+    # Mathematical Check (all candidates at once)
+    inside = is_inside_boundary(centers_x, centers_y, p, pattern)
+    return Cutters(np.column_stack([centers_x[inside], centers_y[inside]]), pts_draw)
+
+
+def generate_ultimate_specimen(p=PARAMS, pattern=PATTERN):
+    print("STEP 1: Generating Base Solid...")
+    
+    # A. Base Geometry (shared cached body)
+    outline = dogbone_outline(p["L_tot"], p["L_par"], p["W_nar"], p["W_grip"], p["Rad"])
+    with span("profile") as phase:
+        base = phase.output(base_body(outline, p["Thick"]))
+
+    print("STEP 2: Calculating Pattern Coordinates...")
+    with span("pattern"):
+        cutters = auxetic_cutters(p, pattern)
+        if QUADRANT_SYMMETRY:
+            reach = np.abs(cutters.template).max()
+            cutters = select(cutters, quadrant_mask(*cutters.centres.T, reach))
+    
+    count = len(cutters.centres)
     print(f"STEP 3: Pattern Generated. Total Cells: {count}")
 
     if count == 0:
         print("ERROR: No cells fit inside. Reduce margin or cell size.")
         return base
 
-    # --- D. Single Boolean Cut ---
-    print("STEP 4: Extruding and Cutting...")
+    # --- D. Single Extrusion ---
+    print("STEP 4: Building Cross-Section and Extruding...")
     
-    # Extrude all accumulated wires at once
-    cut_tool = cutter_sketch.extrude(p["Thick"] * 2).translate((0, 0, -p["Thick"]))
-    
-    # Final Cut
-    final_model = base.cut(cut_tool)
+    # Outline with all cells as holes, built in one pass from the arrays (cells
+    # keep the margin, no boolean needed; checked on the arrays, so OCC does
+    # not have to compare every pair)
+    with span("extrude") as phase:
+        if QUADRANT_SYMMETRY:
+            # Top-right quadrant of the section, mirrored into the full face
+            section = mirror_quadrant(quadrant_section(outline, cutter_wires(cutters)))
+        else:
+            problems = cutter_problems(outline, cutters)
+            for problem in problems:
+                print(f"[WARNING] {problem}")
+            section = cutter_face(outline_wire(outline), cutters, check=bool(problems))
+        final_model = phase.output(extrude_section(section, p["Thick"]))
     
     return final_model
 
+
+def generate_auxetic_mesh(p=PARAMS, pattern=PATTERN):
+    # Same specimen as a watertight triangle mesh of the extruded section
+    # (no BRep; STL / 3MF only)
+    outline = dogbone_outline(p["L_tot"], p["L_par"], p["W_nar"], p["W_grip"], p["Rad"])
+    with span("pattern"):
+        cutters = auxetic_cutters(p, pattern)
+    with span("mesh") as phase:
+        return phase.output(section_mesh(outline, cutters, p["Thick"]))
+
 # ==============================================================================
 # 4. EXECUTION & EXPORT
 # ==============================================================================
-try:
-    # 1. Run Generator
-    model = generate_ultimate_specimen()
-    
-    # 2. Show in CQ
-    if 'show_object' in globals():
-        show_object(model, name="Final_Auxetic_Specimen")
-
-    # 3. Export to STL
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
-    
-    fpath = os.path.join(OUTPUT_DIR, "ISO527_Auxetic_Vertical_Final.stl")
-    cq.exporters.export(model, fpath, tolerance=0.01, angularTolerance=0.05)
-    print(f"SUCCESS: File saved to {fpath}")
-
-    # ==========================================================================
-    # 4. OPTIONAL: STEP EXPORT (Uncomment to enable)
-    # ==========================================================================
-    # step_path = os.path.join(OUTPUT_DIR, "ISO527_Auxetic_Vertical_Final.step")
-    # cq.exporters.export(model, step_path)
-    # print(f"SUCCESS: STEP File saved to {step_path}")
-
-except Exception as e:
-    import traceback
-    traceback.print_exc()
-    print(f"CRITICAL ERROR: {e}")
\ No newline at end of file
+if __name__ in ("__main__", "__cq_main__"):
+    try:
+        # 1. Run Generator
+        model = generate_ultimate_specimen()
+
+        # 2. Show in CQ
+        if 'show_object' in globals():
+            show_object(model, name="Final_Auxetic_Specimen")
+
+        # 3. Export to STL
+        if not os.path.exists(OUTPUT_DIR):
+            os.makedirs(OUTPUT_DIR)
+
+        fpath = os.path.join(OUTPUT_DIR, "ISO527_Auxetic_Vertical_Final.stl")
+        cq.exporters.export(model, fpath, tolerance=0.01, angularTolerance=0.05)
+        print(f"SUCCESS: File saved to {fpath}")
+
+        # Cross-section as DXF (outline and cell outlines)
+        dxf_path = os.path.join(OUTPUT_DIR, "ISO527_Auxetic_Vertical_Final.dxf")
+        outline = dogbone_outline(PARAMS["L_tot"], PARAMS["L_par"], PARAMS["W_nar"], PARAMS["W_grip"], PARAMS["Rad"])
+        write_dxf(dxf_path, outline, auxetic_cutters())
+        print(f"SUCCESS: File saved to {dxf_path}")
+
+        # ==========================================================================
+        # 4. OPTIONAL: STEP EXPORT (Uncomment to enable)
+        # ==========================================================================
+        # step_path = os.path.join(OUTPUT_DIR, "ISO527_Auxetic_Vertical_Final.step")
+        # cq.exporters.export(model, step_path)
+        # print(f"SUCCESS: STEP File saved to {step_path}")
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"CRITICAL ERROR: {e}")
\ No newline at end of file
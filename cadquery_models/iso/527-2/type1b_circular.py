@@ -1,6 +1,15 @@
 import cadquery as cq
-import math
+import numpy as np
 import os
+import sys
+
+# Make the shared kernels importable when this file is run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from cadquery_models.cutters import Cutters, cutter_face, cutter_problems, cutter_wires, section_mesh, select, write_dxf
+from cadquery_models.instrument import span
+from cadquery_models.outline import classify_points, dogbone_outline
+from cadquery_models.profile import base_body, extrude_section, outline_wire
+from cadquery_models.symmetry import mirror_quadrant, quadrant_mask, quadrant_section
 
 # ==============================================================================
 # 1. PARAMETERS
@@ -21,9 +30,45 @@ params = {
     "perimeter_clearance": 0.8,  # Minimum solid wall thickness to maintain
 }
 
+# Build only the top-right quadrant and mirror it (see symmetry.py)
+QUADRANT_SYMMETRY = False
+
 # ==============================================================================
 # 2. GEOMETRY GENERATION
 # ==============================================================================
+def compliant_cutters(p, outline):
+    """
+    Hole centres that keep the perimeter clearance, as Cutters (circles).
+    """
+    r_hole = p["hole_radius"]
+    pitch = p["hole_spacing"]
+    clearance = p["perimeter_clearance"]
+    
+    # Minimum Distance Constraint:
+    # A hole center must be at least (Clearance + Radius) away from any edge.
+    min_edge_dist = clearance + r_hole
+    
+    # Define Scanning Grid
+    # Create a grid slightly larger than the bounding box
+    grid_count_x = int(p["overall_length"] / pitch) + 4
+    grid_count_y = int(p["tab_width"] / pitch) + 4
+    
+    origin_x = - (grid_count_x * pitch) / 2
+    origin_y = - (grid_count_y * pitch) / 2
+    
+    # Candidate Points (full scanning grid)
+    i, j = np.meshgrid(np.arange(grid_count_x), np.arange(grid_count_y), indexing="ij")
+    candidates_x = (origin_x + i * pitch).ravel()
+    candidates_y = (origin_y + j * pitch).ravel()
+    
+    # Compliance Check (all candidates in one call)
+    # Keeps every point whose distance to the End Tabs, Side Walls and
+    # Transition Fillet is at least min_edge_dist.
+    compliant, _ = classify_points(outline, candidates_x, candidates_y, min_edge_dist)
+    centres = np.column_stack([candidates_x[compliant], candidates_y[compliant]])
+    return Cutters(centres, None, r_hole)
+
+
 def generate_boundary_compliant_specimen(p):
     # --- A. Extract Geometric Definitions ---
     L_total = p["overall_length"]
@@ -33,167 +78,115 @@ def generate_boundary_compliant_specimen(p):
     R = p["transition_radius"]
     H = p["thickness"]
     
-    # Calculate semi-widths (distance from neutral axis Y=0)
-    semi_w_narrow = W_narrow / 2.0
-    semi_w_grip = W_grip / 2.0
-    
     # Calculate Transition Tangency
-    # Determine the horizontal length (dx) required for the arc R 
-    # to transition smoothly between the two widths.
-    dy = semi_w_grip - semi_w_narrow
-    dx = math.sqrt(R**2 - (R - dy)**2)
-    
-    # Define Critical Longitudinal Coordinates (X-Axis)
-    x_parallel_end = L_parallel / 2.0       # End of parallel gauge
-    x_grip_start = x_parallel_end + dx      # Start of grip tab
-    x_terminus = L_total / 2.0              # Physical end of specimen
+    # The outline determines the horizontal length (dx) required for the
+    # arc R to transition smoothly between the two widths.
+    outline = dogbone_outline(L_total, L_parallel, W_narrow, W_grip, R)
 
     # B. Construct Base Solid Body 
     print("[INFO] Generative Design: Creating base solid geometry...")
     
-    # Generate 2D Profile (Top-Right Quadrant -> Mirrored)
-    profile_sketch = (
-        cq.Workplane("XY")
-        .moveTo(x_parallel_end, semi_w_narrow)
-        .radiusArc((x_grip_start, semi_w_grip), -R)     # Concave transition fillet
-        .lineTo(x_terminus, semi_w_grip)
-        .lineTo(x_terminus, -semi_w_grip)
-        .lineTo(x_grip_start, -semi_w_grip)
-        .radiusArc((x_parallel_end, -semi_w_narrow), -R)
-        .lineTo(-x_parallel_end, -semi_w_narrow)
-        .radiusArc((-x_grip_start, -semi_w_grip), -R)
-        .lineTo(-x_terminus, -semi_w_grip)
-        .lineTo(-x_terminus, semi_w_grip)
-        .lineTo(-x_grip_start, semi_w_grip)
-        .radiusArc((-x_parallel_end, semi_w_narrow), -R)
-        .close()
-    )
-    
-    solid_body = profile_sketch.extrude(H)
+    # Shared cached body (Full Closed Outline -> Extruded)
+    with span("profile") as phase:
+        solid_body = phase.output(base_body(outline, H))
 
     # C. Compute Compliant Coordinates (Boundary Check) 
     print("[INFO] Pattern Logic: Computing boundary-compliant coordinates...")
     
-    r_hole = p["hole_radius"]
-    pitch = p["hole_spacing"]
-    clearance = p["perimeter_clearance"]
-    
-    # Minimum Distance Constraint:
-    # A hole center must be at least (Clearance + Radius) away from any edge.
-    min_edge_dist = clearance + r_hole
-    
-    # Define Scanning Grid
-    # Create a grid slightly larger than the bounding box
-    grid_count_x = int(L_total / pitch) + 4
-    grid_count_y = int(W_grip / pitch) + 4
-    
-    origin_x = - (grid_count_x * pitch) / 2
-    origin_y = - (grid_count_y * pitch) / 2
-    
-    compliant_points = []
-    
-    for i in range(grid_count_x):
-        for j in range(grid_count_y):
-            # Current Candidate Point
-            px = origin_x + i * pitch
-            py = origin_y + j * pitch
-            
-            abs_px = abs(px)
-            abs_py = abs(py)
-            
-            # CONSTRAINT 1: Longitudinal Limits (End Tabs) 
-            # Check if point violates the ends of the specimen
-            if abs_px > (x_terminus - min_edge_dist):
-                continue 
-
-            # CONSTRAINT 2: Transverse Limits (Side Walls) 
-            # Determine the maximum allowable Y for the current X position
-            max_transverse_pos = 0.0
-            
-            # Zone 1: Narrow Gauge Section
-            if abs_px <= x_parallel_end:
-                max_transverse_pos = semi_w_narrow - min_edge_dist
-                
-            # Zone 2: Grip Tab Section
-            elif abs_px >= x_grip_start:
-                max_transverse_pos = semi_w_grip - min_edge_dist
-                
-            # Zone 3: Transition Region (Fillet)
-            # Analytically calculate the curve height at this X
-            else:
-                # Arc center coordinates relative to quadrant
-                arc_center_y = semi_w_narrow + R
-                x_relative = abs_px - x_parallel_end
-                
-                # Circle Equation: y = y_center - sqrt(R^2 - x^2)
-                curve_height = arc_center_y - math.sqrt(R**2 - x_relative**2)
-                
-                max_transverse_pos = curve_height - min_edge_dist
-
-            # Final Compliance Check
-            if abs_py <= max_transverse_pos:
-                compliant_points.append((px, py))
-
-    # D. Apply Boolean Operations
-    if compliant_points:
-        print(f"[INFO] Boolean Operation: Subtracting {len(compliant_points)} features...")
-        
-        # Create machining tool (all cylinders combined)
-        machining_tool = (
-            cq.Workplane("XY")
-            .pushPoints(compliant_points)
-            .circle(r_hole)
-            .extrude(H * 3)         # Oversize extrusion for clean cut
-            .translate((0, 0, -H))  # Center vertically
-        )
+    with span("pattern"):
+        cutters = compliant_cutters(p, outline)
+        if QUADRANT_SYMMETRY:
+            cutters = select(cutters, quadrant_mask(*cutters.centres.T, cutters.radius))
+
+    # D. Build the Perforated Cross-Section
+    if len(cutters.centres):
+        print(f"[INFO] Cross-Section: Adding {len(cutters.centres)} holes and extruding once...")
         
-        final_part = solid_body.cut(machining_tool)
+        # Hole outlines as 2D circles (all keep the clearance, no boolean needed;
+        # checked on the arrays, so OCC does not have to compare every pair)
+        with span("extrude") as phase:
+            if QUADRANT_SYMMETRY:
+                # Top-right quadrant of the section, mirrored into the full face
+                section = mirror_quadrant(quadrant_section(outline, cutter_wires(cutters)))
+            else:
+                problems = cutter_problems(outline, cutters)
+                for problem in problems:
+                    print(f"[WARNING] {problem}")
+                section = cutter_face(outline_wire(outline), cutters, check=bool(problems))
+            final_part = phase.output(extrude_section(section, H))
         return final_part
     else:
         print("[WARNING] Pattern Generation Failed: No coordinates fit within the defined clearance.")
         return solid_body
 
+
+def generate_circular_mesh(p):
+    # Same specimen as a watertight triangle mesh of the extruded section
+    # (no BRep; STL / 3MF only)
+    outline = dogbone_outline(
+        p["overall_length"], p["parallel_length"], p["gauge_width"], p["tab_width"], p["transition_radius"]
+    )
+    with span("pattern"):
+        cutters = compliant_cutters(p, outline)
+    with span("mesh") as phase:
+        return phase.output(section_mesh(outline, cutters, p["thickness"]))
+
 # ==============================================================================
 # 3. EXPORT AND VISUALIZATION
 # ==============================================================================
 
-# Execute Generation
-final_model = generate_boundary_compliant_specimen(params)
+if __name__ in ("__main__", "__cq_main__"):
+    # Execute Generation
+    final_model = generate_boundary_compliant_specimen(params)
 
-# Visualization in CQ-Editor
-if 'show_object' in globals():
-    show_object(final_model, name="ISO_527_Perforated_Specimen")
+    # Visualization in CQ-Editor
+    if 'show_object' in globals():
+        show_object(final_model, name="ISO_527_Perforated_Specimen")
 
-# File Output Configuration
-output_directory = r"C:\Users\taner\Downloads"
-filename_stl = "ISO_527_Type1b_Circular_v1.stl"
-filename_step = "ISO_527_Type1b_Circular_v1.step"
+    # File Output Configuration
+    output_directory = r"C:\Users\taner\Downloads"
+    filename_stl = "ISO_527_Type1b_Circular_v1.stl"
+    filename_step = "ISO_527_Type1b_Circular_v1.step"
+    filename_dxf = "ISO_527_Type1b_Circular_v1.dxf"
 
-if os.path.exists(output_directory):
-    
-    # --- 1. STL Export (Standard for 3D Printing) ---
-    file_path_stl = os.path.join(output_directory, filename_stl)
-    try:
-        # Export Settings:
-        # tolerance=0.01: High mesh density
-        # angularTolerance=0.1: Smooth curvature for DLP
-        cq.exporters.export(final_model, file_path_stl, tolerance=0.01, angularTolerance=0.1)
-        
-        print("-" * 60)
-        print(f"[SUCCESS] STL Export Complete.")
-        print(f"File: {file_path_stl}")
-    except Exception as e:
-        print(f"[ERROR] STL Export Failed: {e}")
-
-    # --- 2. STEP Export (Standard for CAD/Engineering) ---
-    file_path_step = os.path.join(output_directory, filename_step)
-    try:
-        cq.exporters.export(final_model, file_path_step)
-        print(f"[SUCCESS] STEP Export Complete.")
-        print(f"File: {file_path_step}")
-        print("-" * 60)
-    except Exception as e:
-        print(f"[ERROR] STEP Export Failed: {e}")
-
-else:
-    print(f"[ERROR] Directory Not Found: {output_directory}")
\ No newline at end of file
+    if os.path.exists(output_directory):
+
+        # --- 1. STL Export (Standard for 3D Printing) ---
+        file_path_stl = os.path.join(output_directory, filename_stl)
+        try:
+            # Export Settings:
+            # tolerance=0.01: High mesh density
+            # angularTolerance=0.1: Smooth curvature for DLP
+            cq.exporters.export(final_model, file_path_stl, tolerance=0.01, angularTolerance=0.1)
+
+            print("-" * 60)
+            print(f"[SUCCESS] STL Export Complete.")
+            print(f"File: {file_path_stl}")
+        except Exception as e:
+            print(f"[ERROR] STL Export Failed: {e}")
+
+        # --- 2. STEP Export (Standard for CAD/Engineering) ---
+        file_path_step = os.path.join(output_directory, filename_step)
+        try:
+            cq.exporters.export(final_model, file_path_step)
+            print(f"[SUCCESS] STEP Export Complete.")
+            print(f"File: {file_path_step}")
+            print("-" * 60)
+        except Exception as e:
+            print(f"[ERROR] STEP Export Failed: {e}")
+
+        # --- 3. DXF Export (Cross-Section for Laser / Waterjet Cutting) ---
+        file_path_dxf = os.path.join(output_directory, filename_dxf)
+        try:
+            outline = dogbone_outline(
+                params["overall_length"], params["parallel_length"], params["gauge_width"],
+                params["tab_width"], params["transition_radius"],
+            )
+            write_dxf(file_path_dxf, outline, compliant_cutters(params, outline))
+            print(f"[SUCCESS] DXF Export Complete.")
+            print(f"File: {file_path_dxf}")
+        except Exception as e:
+            print(f"[ERROR] DXF Export Failed: {e}")
+
+    else:
+        print(f"[ERROR] Directory Not Found: {output_directory}")
\ No newline at end of file
@@ -1,6 +1,17 @@
 import cadquery as cq
-import math
+import numpy as np
 import os
+import sys
+
+# Make the shared kernels importable when this file is run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from cadquery_models.cutters import Cutters, cutter_problems, cutter_polygons, cutter_wires, select
+from cadquery_models.grid_mesh import grid_holes, grid_specimen_mesh
+from cadquery_models.instrument import span
+from cadquery_models.mesh import write_stl
+from cadquery_models.outline import INSIDE, STRADDLE, classify_boxes, dogbone_outline
+from cadquery_models.profile import extrude_section, outline_sketch, outline_wire, section_face
+from cadquery_models.symmetry import mirror_quadrant, quadrant_mask, quadrant_section
 
 # 1. User Parameters 
 params = {
@@ -18,6 +29,12 @@ params = {
     "perimeter_wall": 0.8,       # Thickness of the solid outer shell
 }
 
+# Output mode: "brep" (OCC solid, STL + STEP) or "mesh" (direct triangle mesh, STL only)
+OUTPUT_MODE = "brep"
+
+# Build only the top-right quadrant and mirror it (see symmetry.py)
+QUADRANT_SYMMETRY = False
+
 def generate_iso_with_wall(p):
     # 1. Extract Dimensions
     L_total = p["overall_length"]
@@ -28,105 +45,106 @@ def generate_iso_with_wall(p):
     H = p["thickness"]
     
     # 2. Geometry Math
-    y_narrow = W_narrow / 2.0
-    y_grip = W_grip / 2.0
-    dy = y_grip - y_narrow
-    dx = math.sqrt(R**2 - (R - dy)**2)
-    x_start_arc = L_parallel / 2.0
-    x_end_arc = x_start_arc + dx
-    x_total = L_total / 2.0
+    outline = dogbone_outline(L_total, L_parallel, W_narrow, W_grip, R)
 
-    # 3. Create the 2D Profile (Full Closed Loop)
-    q_edge = (
-        cq.Workplane("XY")
-        .moveTo(0, 0)
-        .lineTo(0, y_narrow)
-        .lineTo(x_start_arc, y_narrow)
-        .radiusArc((x_end_arc, y_grip), -R)
-        .lineTo(x_total, y_grip)
-        .lineTo(x_total, 0)
-        .close()
-    )
-    
-    # Create the full solid profile (Outer Shell)
-    quarter_solid = q_edge.extrude(H)
-    half_solid = quarter_solid.union(quarter_solid.mirror("YZ"))
-    main_body = half_solid.union(half_solid.mirror("XZ"))
-    
-    # 4. Create the Inner Core (For the Grid) 
-    full_profile = (
-        cq.Workplane("XY")
-        .moveTo(x_start_arc, y_narrow)
-        .radiusArc((x_end_arc, y_grip), -R)
-        .lineTo(x_total, y_grip)
-        .lineTo(x_total, -y_grip)
-        .lineTo(x_end_arc, -y_grip)
-        .radiusArc((x_start_arc, -y_narrow), -R)
-        .lineTo(-x_start_arc, -y_narrow)
-        .radiusArc((-x_end_arc, -y_grip), -R)
-        .lineTo(-x_total, -y_grip)
-        .lineTo(-x_total, y_grip)
-        .lineTo(-x_end_arc, y_grip)
-        .radiusArc((-x_start_arc, y_narrow), -R)
-        .close()
-    )
-    
-    # Shrink the profile by the wall thickness
-    inner_core_solid = (
-        full_profile
-        .offset2D(-p["perimeter_wall"]) 
-        .extrude(H)
-    )
+    # 3. Create the Inner Core (2D, for the Grid)
+    # 2D Profile (Full Closed Loop), shrunk by the wall thickness
+    with span("profile"):
+        inner_core_face = cq.Face.makeFromWires(
+            outline_sketch(outline).offset2D(-p["perimeter_wall"]).val()
+        )
 
-    # 5. Generate Grid Cutter 
+    # 4. Generate Grid Holes (2D wires, same layout as rarray(..., center=True))
     cell_size = p["grid_cell_size"]
-    hole_size = cell_size - p["grid_wall_thickness"]
+    centers_x, centers_y, hole_size = grid_holes(outline, cell_size, p["grid_wall_thickness"])
+    half = hole_size / 2.0
     
-    count_x = int(L_total / cell_size) + 2
-    count_y = int(W_grip / cell_size) + 2
+    with span("pattern"):
+        # Every square of the grid as one shared template, classified at once
+        cx, cy = np.meshgrid(centers_x, centers_y, indexing="ij")
+        square = half * np.array([(-1.0, -1.0), (1.0, -1.0), (1.0, 1.0), (-1.0, 1.0)])
+        squares = Cutters(np.column_stack([cx.ravel(), cy.ravel()]), square)
+        if QUADRANT_SYMMETRY:
+            squares = select(squares, quadrant_mask(*squares.centres.T, half))
+        
+        x, y = squares.centres.T
+        fit = classify_boxes(outline, x - half, x + half, y - half, y + half, p["perimeter_wall"])
+        inside = select(squares, fit == INSIDE)
+        hole_wires = cutter_wires(inside)
+        straddling = cutter_polygons(select(squares, fit == STRADDLE))
     
-    raw_grid = (
-        cq.Workplane("XY")
-        .rarray(cell_size, cell_size, count_x, count_y, center=True)
-        .rect(hole_size, hole_size)
-        .extrude(H * 2)             # Extrude tall
-        .translate((0, 0, -H/2))    # Center in Z
-    )
+    # Clip the holes that cross the inner core (small 2D boolean per hole)
+    with span("boolean") as phase:
+        phase.operands(2 * len(straddling))
+        for corners in straddling:
+            wire = cq.Wire.makePolygon([(px, py, 0) for px, py in corners], close=True)
+            clipped = cq.Face.makeFromWires(wire).intersect(inner_core_face)
+            hole_wires.extend(face.outerWire() for face in clipped.Faces())
     
-    # 6. Boolean Logic 
-    constrained_holes = raw_grid.intersect(inner_core_solid)
-    final_part = main_body.cut(constrained_holes)
+    # 5. Cross-section (outline minus holes), extruded once. The whole squares
+    # are checked on the arrays; the clipped ones lie in the inner core face.
+    with span("extrude") as phase:
+        if QUADRANT_SYMMETRY:
+            # Top-right quadrant of the section, mirrored into the full face
+            section = mirror_quadrant(quadrant_section(outline, hole_wires))
+        else:
+            problems = cutter_problems(outline, inside, p["perimeter_wall"])
+            for problem in problems:
+                print(f"[WARNING] {problem}")
+            section = section_face(outline_wire(outline), hole_wires, check=bool(problems))
+        final_part = phase.output(extrude_section(section, H))
     
     return final_part
 
-# Execution 
-final_model = generate_iso_with_wall(params)
+def generate_iso_with_wall_mesh(p, tolerance=0.01):
+    # Same specimen as generate_iso_with_wall, meshed directly from the 2D
+    # layout (no BRep booleans, no tessellation). `tolerance` is the chord
+    # deviation on the transition arcs.
+    outline = dogbone_outline(
+        p["overall_length"], p["parallel_length"], p["gauge_width"], p["tab_width"], p["transition_radius"]
+    )
+    with span("mesh") as phase:
+        return phase.output(grid_specimen_mesh(
+            outline, p["thickness"],
+            p["grid_cell_size"], p["grid_wall_thickness"], p["perimeter_wall"],
+            tolerance,
+        ))
+
+if __name__ in ("__main__", "__cq_main__"):
+    # Execution 
+    if OUTPUT_MODE == "mesh":
+        final_model = generate_iso_with_wall_mesh(params)
+    else:
+        final_model = generate_iso_with_wall(params)
 
-# Render 
-if 'show_object' in globals():
-    show_object(final_model, name="ISO_527_Walled_Grid")
+    # Render 
+    if 'show_object' in globals() and OUTPUT_MODE != "mesh":
+        show_object(final_model, name="ISO_527_Walled_Grid")
 
-# EXPORT SECTION,
-output_folder = r"C:\Users\taner\Downloads"
+    # EXPORT SECTION,
+    output_folder = r"C:\Users\taner\Downloads"
 
-if not os.path.exists(output_folder):
-    print(f"Warning: Directory '{output_folder}' does not exist.")
-else:
-    # 1. STL Export
-    stl_name = "ISO_527_Walled_Grid.stl"
-    stl_path = os.path.join(output_folder, stl_name)
-    try:
-        cq.exporters.export(final_model, stl_path, tolerance=0.01, angularTolerance=0.1)
-        print(f"SUCCESS: STL Saved -> {stl_path}")
-    except Exception as e:
-        print(f"STL Error: {e}")
+    if not os.path.exists(output_folder):
+        print(f"Warning: Directory '{output_folder}' does not exist.")
+    else:
+        # 1. STL Export
+        stl_name = "ISO_527_Walled_Grid.stl"
+        stl_path = os.path.join(output_folder, stl_name)
+        try:
+            if OUTPUT_MODE == "mesh":
+                write_stl(stl_path, final_model)
+            else:
+                cq.exporters.export(final_model, stl_path, tolerance=0.01, angularTolerance=0.1)
+            print(f"SUCCESS: STL Saved -> {stl_path}")
+        except Exception as e:
+            print(f"STL Error: {e}")
 
-# STEP Export (Optional)
-# Uncomment the lines below carefully
-#    step_name = "ISO_527_Walled_Grid.step"   # <--- Aligned with stl_name above
-#    step_path = os.path.join(output_folder, step_name)
-#    try:
-#        cq.exporters.export(final_model, step_path)
-#        print(f"SUCCESS: STEP Saved -> {step_path}")
-#    except Exception as e:
-#        print(f"STEP Error: {e}")
+    # STEP Export (Optional)
+    # Uncomment the lines below carefully
+    #    step_name = "ISO_527_Walled_Grid.step"   # <--- Aligned with stl_name above
+    #    step_path = os.path.join(output_folder, step_name)
+    #    try:
+    #        cq.exporters.export(final_model, step_path)
+    #        print(f"SUCCESS: STEP Saved -> {step_path}")
+    #    except Exception as e:
+    #        print(f"STEP Error: {e}")
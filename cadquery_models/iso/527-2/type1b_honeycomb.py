@@ -0,0 +1,118 @@
+import cadquery as cq
+import os
+import sys
+
+# Make the shared kernels importable when this file is run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from cadquery_models.cutters import cutter_face, cutter_problems, polygon_cutters, section_mesh, write_dxf
+from cadquery_models.instrument import span
+from cadquery_models.outline import dogbone_outline
+from cadquery_models.profile import base_body, extrude_section, outline_wire
+from cadquery_models.tiling import specimen_cells
+
+# ==============================================================================
+# 1. PARAMETERS
+# ==============================================================================
+params = {
+    # --- Specimen Geometry (ISO 527-2 Type 1B) ---
+    "overall_length": 150.0,
+    "gauge_length": 110.0,
+    "parallel_length": 60.0,
+    "gauge_width": 10.0,
+    "tab_width": 20.0,
+    "thickness": 4.0,
+    "transition_radius": 60.0,
+
+    # --- Cell Pattern ---
+    "pattern": "honeycomb",      # "honeycomb" (regular hexagons) or "voronoi" (stochastic foam, needs SciPy)
+    "cell_size": 4.0,            # Hexagon width across flats / mean seed spacing of the foam
+    "wall_thickness": 0.8,       # Thickness of the cell walls
+    "perimeter_wall": 0.8,       # Thickness of the solid outer shell
+    "rotate": False,             # True = tiling turned 90 degrees (pointy-topped hexagons)
+    "randomness": 0.5,           # Voronoi: seed jitter, 0 (honeycomb) to 1
+    "random_seed": 1,            # Voronoi: same seed, same foam
+}
+
+# ==============================================================================
+# 2. GEOMETRY GENERATION
+# ==============================================================================
+def specimen_outline(p):
+    return dogbone_outline(
+        p["overall_length"], p["parallel_length"], p["gauge_width"], p["tab_width"], p["transition_radius"]
+    )
+
+
+def honeycomb_cutters(p, outline):
+    # Hole polygons, inset by half the wall and clipped to the core (2D, NumPy)
+    cells = specimen_cells(
+        outline, p["pattern"], p["cell_size"], p["wall_thickness"], p["perimeter_wall"],
+        rotate=p["rotate"], randomness=p["randomness"], seed=p["random_seed"],
+    )
+    return polygon_cutters(cells)
+
+
+def generate_honeycomb_specimen(p):
+    outline = specimen_outline(p)
+    with span("pattern"):
+        cutters = honeycomb_cutters(p, outline)
+    print(f"[INFO] {p['pattern']} infill: {len(cutters.centres)} cells")
+
+    if not len(cutters.centres):
+        print("[WARNING] No cell fits inside the perimeter wall.")
+        return base_body(outline, p["thickness"])
+
+    # Cross-section (outline with every cell as a hole), extruded once. The
+    # cells are checked on the arrays, so OCC only checks the face if that fails.
+    with span("extrude") as phase:
+        problems = cutter_problems(outline, cutters, p["perimeter_wall"])
+        for problem in problems:
+            print(f"[WARNING] {problem}")
+        section = cutter_face(outline_wire(outline), cutters, check=bool(problems))
+        final_part = phase.output(extrude_section(section, p["thickness"]))
+
+    return final_part
+
+
+def generate_honeycomb_mesh(p):
+    # Same specimen as a watertight triangle mesh of the extruded section
+    # (no BRep; STL / 3MF only)
+    outline = specimen_outline(p)
+    with span("pattern"):
+        cutters = honeycomb_cutters(p, outline)
+    with span("mesh") as phase:
+        return phase.output(section_mesh(outline, cutters, p["thickness"]))
+
+# ==============================================================================
+# 3. EXPORT AND VISUALIZATION
+# ==============================================================================
+if __name__ in ("__main__", "__cq_main__"):
+    final_model = generate_honeycomb_specimen(params)
+
+    if 'show_object' in globals():
+        show_object(final_model, name="ISO_527_Honeycomb_Specimen")
+
+    output_folder = r"C:\Users\taner\Downloads"
+    if os.path.exists(output_folder):
+        stl_path = os.path.join(output_folder, f"ISO_527_Type1b_{params['pattern'].capitalize()}.stl")
+        try:
+            cq.exporters.export(final_model, stl_path, tolerance=0.01, angularTolerance=0.1)
+            print(f"[SUCCESS] STL Exported: {stl_path}")
+        except Exception as e:
+            print(f"[ERROR] STL Export Failed: {e}")
+
+        step_path = os.path.join(output_folder, f"ISO_527_Type1b_{params['pattern'].capitalize()}.step")
+        try:
+            cq.exporters.export(final_model, step_path)
+            print(f"[SUCCESS] STEP Exported: {step_path}")
+        except Exception as e:
+            print(f"[ERROR] STEP Export Failed: {e}")
+
+        dxf_path = os.path.join(output_folder, f"ISO_527_Type1b_{params['pattern'].capitalize()}.dxf")
+        try:
+            outline = specimen_outline(params)
+            write_dxf(dxf_path, outline, honeycomb_cutters(params, outline))
+            print(f"[SUCCESS] DXF Exported: {dxf_path}")
+        except Exception as e:
+            print(f"[ERROR] DXF Export Failed: {e}")
+    else:
+        print(f"Warning: Directory '{output_folder}' does not exist.")
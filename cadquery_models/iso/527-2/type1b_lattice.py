@@ -1,6 +1,19 @@
 import cadquery as cq
 import math
 import os
+import sys
+
+# Make the shared kernels importable when this file is run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from cadquery_models.booleans import tiled_intersect, tiled_union
+from cadquery_models.instances import Instanced, group_instances
+from cadquery_models.instrument import span
+from cadquery_models.lattice import classify_bcc_cells
+from cadquery_models.outline import dogbone_outline
+from cadquery_models.profile import base_body, outline_sketch
+from cadquery_models.symmetry import mirror_quadrant, quadrant_box, split_by_quadrant
+from cadquery_models.tessellate import stream_stl
+from cadquery_models.threemf import write_3mf
 
 # ==============================================================================
 # 1. PARAMETERS
@@ -21,53 +34,28 @@ params = {
     "perimeter_wall": 0.8,       # Thickness of the solid side walls
 }
 
-# ==============================================================================
-# 2. HELPER: FAST LATTICE GENERATION
-# ==============================================================================
-def create_bcc_lattice_block(cell_size, strut_radius, nx, ny, nz):
-    """
-    Generates a large block of BCC lattice structure as a single Compound.
-    Optimized for performance using makeCylinder.
-    """
-    s = cell_size / 2.0
-    # BCC vectors (Center to 8 corners)
-    directions = [
-        (s, s, s), (s, s, -s), (s, -s, s), (s, -s, -s),
-        (-s, s, s), (-s, s, -s), (-s, -s, s), (-s, -s, -s)
-    ]
-    
-    solids = []
-    
-    # Calculate offset to center the grid around (0,0)
-    offset_x = -((nx - 1) * cell_size) / 2
-    offset_y = -((ny - 1) * cell_size) / 2
-    
-    # Generate struts
-    for k in range(nz):
-        for j in range(ny):
-            for i in range(nx):
-                cx = offset_x + i * cell_size
-                cy = offset_y + j * cell_size
-                # Start Z at half cell size to center in the layer
-                cz = (cell_size / 2.0) + k * cell_size 
-                
-                center_pt = cq.Vector(cx, cy, cz)
-                
-                for d in directions:
-                    dir_vec = cq.Vector(d)
-                    length = abs(dir_vec)
-                    
-                    # Create geometric cylinder
-                    c = cq.Solid.makeCylinder(strut_radius, length, center_pt, dir_vec)
-                    solids.append(c)
-                    
-    # Combine all struts into one lightweight Compound object
-    return cq.Compound.makeCompound(solids)
+# Boolean scheduling: the lattice is trimmed and fused in tiles along the
+# length (see booleans.py); set BOOLEAN_PROCESSES > 1 to run tiles in parallel
+BOOLEAN_TILES = 8
+BOOLEAN_PROCESSES = None
+
+# Output format: "stl" (fused solid) or "3mf" (frame + instanced unit cells, see threemf.py)
+OUTPUT_FORMAT = "stl"
+
+# STL export: set EXPORT_PROCESSES > 1 to tessellate in parallel (see tessellate.py)
+EXPORT_PROCESSES = None
+
+# Build only the top-right quadrant and mirror it (see symmetry.py). Fused
+# builds only: the instanced model (fuse=False) is always built whole.
+QUADRANT_SYMMETRY = False
 
 # ==============================================================================
-# 3. MAIN GEOMETRY GENERATOR
+# 2. MAIN GEOMETRY GENERATOR
 # ==============================================================================
-def generate_open_lattice_specimen(p):
+def generate_open_lattice_specimen(p, fuse=True):
+    # fuse=False skips the final union and returns the frame and the cells
+    # as an instances.Instanced model (inside cells share their unit cell);
+    # QUADRANT_SYMMETRY does not apply to it
     # --- A. Extract Dimensions ---
     L_total = p["overall_length"]
     W_narrow = p["gauge_width"]
@@ -76,38 +64,22 @@ def generate_open_lattice_specimen(p):
     R = p["transition_radius"]
     H = p["thickness"]
     
-    y_narrow = W_narrow / 2.0
-    y_grip = W_grip / 2.0
-    dy = y_grip - y_narrow
-    dx = math.sqrt(R**2 - (R - dy)**2)
-    x_start_arc = L_parallel / 2.0
-    x_end_arc = x_start_arc + dx
-    x_total = L_total / 2.0
+    # Analytic outline (also used to pre-clip the lattice cells)
+    outline = dogbone_outline(L_total, L_parallel, W_narrow, W_grip, R)
+
+    if QUADRANT_SYMMETRY and not fuse:
+        print("[WARNING] QUADRANT_SYMMETRY is ignored for the instanced lattice (fuse=False).")
 
     print("[INFO] Step 1: Generating base profile...")
     
     # Create the 2D Profile (Wire)
-    base_sketch = (
-        cq.Workplane("XY")
-        .moveTo(x_start_arc, y_narrow)
-        .radiusArc((x_end_arc, y_grip), -R)
-        .lineTo(x_total, y_grip)
-        .lineTo(x_total, -y_grip)
-        .lineTo(x_end_arc, -y_grip)
-        .radiusArc((x_start_arc, -y_narrow), -R)
-        .lineTo(-x_start_arc, -y_narrow)
-        .radiusArc((-x_end_arc, -y_grip), -R)
-        .lineTo(-x_total, -y_grip)
-        .lineTo(-x_total, y_grip)
-        .lineTo(-x_end_arc, y_grip)
-        .radiusArc((-x_start_arc, y_narrow), -R)
-        .close()
-    )
+    base_sketch = outline_sketch(outline)
     
     print("[INFO] Step 2: Creating Frame and Core Volume...")
 
-    # 1. Create Full Solid Block (Reference)
-    full_block = base_sketch.extrude(H)
+    # 1. Full Solid Block (Reference, shared cached body)
+    with span("profile") as phase:
+        full_block = phase.output(base_body(outline, H))
     
     # 2. Calculate Offset Wires (Inner boundary)
     # Using 'intersection' mode to handle topology changes if neck is thin
@@ -134,9 +106,11 @@ def generate_open_lattice_specimen(p):
     
     # 4. Create the Frame (Walls Only)
     # Subtract inner volume from full block -> Leaves a tube/frame
-    frame_solid = full_block.cut(inner_volume_solid)
+    with span("frame") as phase:
+        phase.operands(2)
+        frame_solid = phase.output(full_block.cut(inner_volume_solid))
 
-    print("[INFO] Step 3: Generating Lattice Block...")
+    print("[INFO] Step 3: Classifying Lattice Cells...")
     
     # Lattice Parameters
     cell_size = p["unit_cell_size"]
@@ -147,49 +121,107 @@ def generate_open_lattice_specimen(p):
     ny = int(W_grip / cell_size) + 4
     nz = int(math.ceil(H / cell_size)) # Ensure Z covers thickness
     
-    # Generate Raw Lattice Compound
-    raw_lattice = create_bcc_lattice_block(cell_size, strut_r, nx, ny, nz)
+    # Sort cells against the analytic inner core.
+    # Outside cells are never built, inside cells skip the boolean.
+    with span("classify"):
+        inside_cells, straddling_cells, n_outside = classify_bcc_cells(
+            outline, p["perimeter_wall"], H, cell_size, strut_r, nx, ny, nz
+        )
+    print(f"[INFO] Cells: {len(inside_cells)} inside, "
+          f"{len(straddling_cells)} straddling, {n_outside} skipped")
+    
+    # Convert Workplane objects to shapes for the booleans
+    inner_shape = inner_volume_solid.val()
+    frame_shape = frame_solid.val()
+    
+    if QUADRANT_SYMMETRY and fuse:
+        # Keep the top-right quadrant only; cells crossing a symmetry
+        # plane are trimmed to it like the ones crossing the core wall
+        quadrant = quadrant_box(outline, 0.0, H)
+        inner_shape = inner_shape.intersect(quadrant)
+        frame_shape = frame_shape.intersect(quadrant)
+        inside_cells, crossing_cells = split_by_quadrant(inside_cells)
+        straddling_cells = crossing_cells + sum(split_by_quadrant(straddling_cells), [])
+        print(f"[INFO] Quadrant: {len(inside_cells)} inside, {len(straddling_cells)} to trim")
     
     print("[INFO] Step 4: Cutting Lattice to fit...")
     
     # 5. Trim Lattice
-    # We intersect the huge lattice block with the Inner Volume.
-    # This keeps lattice only where the hole is.
-    # Note: intersect works between Compound and Solid.
-    try:
-        # Convert Workplane object to shape for intersection
-        inner_shape = inner_volume_solid.val()
-        fitted_lattice = raw_lattice.intersect(inner_shape)
-    except Exception as e:
-        print(f"[WARNING] Lattice intersection failed: {e}")
-        return frame_solid # Return frame only if lattice fails
-    
+    # Only the straddling cells are intersected with the Inner Volume,
+    # tile by tile against the matching part of it.
+    fitted_cells = list(inside_cells)
+    if straddling_cells:
+        try:
+            with span("trim") as phase:
+                phase.operands(len(straddling_cells) + 1)
+                trimmed = tiled_intersect(
+                    straddling_cells, inner_shape, BOOLEAN_TILES, BOOLEAN_PROCESSES
+                )
+                fitted_cells.extend(phase.output(trimmed))
+        except Exception as e:
+            print(f"[WARNING] Lattice intersection failed: {e}")
+            return frame_solid # Return frame only if lattice fails
+
+    if not fitted_cells:
+        print("[WARNING] No lattice cells fit inside the core.")
+        return frame_solid
+
+    if not fuse:
+        parts = group_instances([frame_shape] + fitted_cells)
+        print(f"[INFO] Instanced: {len(parts)} distinct parts for {len(fitted_cells) + 1} placements")
+        return Instanced(parts)
+
     # 6. Final Union
-    final_part = frame_solid.union(fitted_lattice)
+    # Keep the cells as separate union operands: untrimmed instances still
+    # overlap at their corner nodes and must be fused with each other.
+    # Each tile fuses its slice of the frame with its own cells.
+    with span("union") as phase:
+        phase.operands(len(fitted_cells) + 1)
+        fused = phase.output(tiled_union(frame_shape, fitted_cells, BOOLEAN_TILES, BOOLEAN_PROCESSES))
+    
+    if QUADRANT_SYMMETRY and fuse:
+        with span("mirror") as phase:
+            fused = phase.output(mirror_quadrant(fused))
+    
+    final_part = cq.Workplane("XY").add(fused)
     
     return final_part
 
+def generate_open_lattice_instances(p):
+    # Unfused lattice for instanced export (3MF)
+    return generate_open_lattice_specimen(p, fuse=False)
+
 # ==============================================================================
-# 4. EXPORT
+# 3. EXPORT
 # ==============================================================================
-try:
-    final_model = generate_open_lattice_specimen(params)
+if __name__ in ("__main__", "__cq_main__"):
+    try:
+        if OUTPUT_FORMAT == "3mf":
+            final_model = generate_open_lattice_instances(params)
+        else:
+            final_model = generate_open_lattice_specimen(params)
 
-    if 'show_object' in globals():
-        show_object(final_model, name="ISO_527_SLA_Lattice")
+        if 'show_object' in globals() and OUTPUT_FORMAT != "3mf":
+            show_object(final_model, name="ISO_527_SLA_Lattice")
 
-    output_folder = r"C:\Users\taner\Downloads"
-    if os.path.exists(output_folder):
-        stl_path = os.path.join(output_folder, "ISO_527_SLA_Lattice.stl")
-        
-        # High quality export for SLA printing
-        cq.exporters.export(final_model, stl_path, tolerance=0.01, angularTolerance=0.1)
-        print("-" * 50)
-        print(f"[SUCCESS] STL Exported: {stl_path}")
-        print("Note: Top and Bottom skins are OPEN for resin drainage.")
-        print("-" * 50)
-
-except Exception as e:
-    import traceback
-    traceback.print_exc()
-    print(f"[CRITICAL ERROR] {e}")
\ No newline at end of file
+        output_folder = r"C:\Users\taner\Downloads"
+        if os.path.exists(output_folder) and OUTPUT_FORMAT == "3mf":
+            threemf_path = os.path.join(output_folder, "ISO_527_SLA_Lattice.3mf")
+
+            # Unit cells are stored once and placed by transform
+            write_3mf(threemf_path, final_model, tolerance=0.01, angular_tolerance=0.1)
+            print(f"[SUCCESS] 3MF Exported: {threemf_path}")
+        elif os.path.exists(output_folder):
+            stl_path = os.path.join(output_folder, "ISO_527_SLA_Lattice.stl")
+
+            # High quality export for SLA printing (streamed, one solid at a time)
+            stream_stl(final_model, stl_path, tolerance=0.01, angular_tolerance=0.1, processes=EXPORT_PROCESSES)
+            print("-" * 50)
+            print(f"[SUCCESS] STL Exported: {stl_path}")
+            print("Note: Top and Bottom skins are OPEN for resin drainage.")
+            print("-" * 50)
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"[CRITICAL ERROR] {e}")
\ No newline at end of file
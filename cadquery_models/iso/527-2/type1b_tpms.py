@@ -0,0 +1,79 @@
+import os
+import sys
+
+# Make the shared kernels importable when this file is run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from cadquery_models.implicit import grid_shape, stream_implicit_stl
+from cadquery_models.instrument import span
+from cadquery_models.outline import dogbone_outline
+from cadquery_models.tpms import VOXELS_PER_WALL, tpms_specimen, wall_voxel
+
+# ==============================================================================
+# 1. PARAMETERS
+# ==============================================================================
+params = {
+    # --- Specimen Geometry (ISO 527-2 Type 1B) ---
+    "overall_length": 150.0,
+    "gauge_length": 110.0,
+    "parallel_length": 60.0,
+    "gauge_width": 10.0,
+    "tab_width": 20.0,
+    "thickness": 4.0,
+    "transition_radius": 60.0,
+
+    # --- TPMS Settings ---
+    "tpms_surface": "gyroid",    # "gyroid", "diamond" (Schwarz D) or "bcc" (struts)
+    "unit_cell_size": 4.0,       # Period of the surface
+    "sheet_thickness": 0.5,      # Wall thickness of the TPMS sheet (strut diameter for bcc)
+    "perimeter_wall": 0.8,       # Thickness of the solid side walls
+    "voxel_size": None,          # Sampling step; None = sheet_thickness / 4 (0.125 mm ~ 400 MB STL)
+}
+
+# Sample only the blocks near the surface (octree with Lipschitz bounds, see
+# implicit.py); False samples every voxel (same mesh, for comparison)
+ADAPTIVE_SAMPLING = True
+
+# ==============================================================================
+# 2. MAIN GEOMETRY GENERATOR
+# ==============================================================================
+def generate_tpms_specimen(p):
+    # Same open frame as type1b_lattice.py, filled with a TPMS sheet instead
+    # of struts. Returns an implicit model (see implicit.py): nothing is
+    # meshed until it is exported, and then slab by slab.
+    outline = dogbone_outline(
+        p["overall_length"], p["parallel_length"], p["gauge_width"], p["tab_width"], p["transition_radius"]
+    )
+
+    # The sheet needs a few samples across it, or its volume is off
+    voxel = p["voxel_size"] or wall_voxel(p["sheet_thickness"])
+    if voxel > wall_voxel(p["sheet_thickness"]) * (1.0 + 1e-9):
+        print(f"[WARNING] voxel_size {voxel} mm puts fewer than {VOXELS_PER_WALL} samples across the "
+              f"{p['sheet_thickness']} mm sheet; the mesh has not converged (use <= {wall_voxel(p['sheet_thickness'])} mm).")
+
+    with span("field"):
+        model = tpms_specimen(
+            outline, p["thickness"], p["perimeter_wall"],
+            p["tpms_surface"], p["unit_cell_size"], p["sheet_thickness"], voxel,
+            adaptive=ADAPTIVE_SAMPLING,
+        )
+
+    nx, ny, nz = grid_shape(model)
+    print(f"[INFO] {p['tpms_surface']} infill, {nx} x {ny} x {nz} voxels of {voxel:g} mm")
+    return model
+
+# ==============================================================================
+# 3. EXPORT
+# ==============================================================================
+if __name__ in ("__main__", "__cq_main__"):
+    final_model = generate_tpms_specimen(params)
+
+    output_folder = r"C:\Users\taner\Downloads"
+    if os.path.exists(output_folder):
+        stl_path = os.path.join(output_folder, "ISO_527_TPMS.stl")
+
+        # Meshed and written slab by slab
+        with span("mesh"):
+            n_triangles = stream_implicit_stl(final_model, stl_path)
+        print(f"[SUCCESS] STL Exported: {stl_path} ({n_triangles} triangles)")
+    else:
+        print(f"Warning: Directory '{output_folder}' does not exist.")
@@ -1,6 +1,12 @@
 import cadquery as cq
-import math
 import os
+import sys
+
+# Make the shared kernels importable when this file is run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from cadquery_models.instrument import span
+from cadquery_models.outline import dogbone_outline
+from cadquery_models.profile import base_body
 
 # 1. User Parameters (Type 2) 
 params = {
@@ -27,19 +33,12 @@ def generate_type_2(p):
     R  = p["transition_radius"]
     h  = p["thickness"]
     
-    # Y-Coordinates
-    y_narrow = b_narrow / 2.0  # 5.0 mm
-    y_grip   = b_grip / 2.0    # 10.0 mm
-    
-    # Calculate Transition Geometry (dx)
-    dy = y_grip - y_narrow      # 5.0 mm
-    # Pythagoras: R^2 = dx^2 + (R - dy)^2
-    dx = math.sqrt(R**2 - (R - dy)**2) # ~23.98 mm
-
-    # X-Coordinates
-    x_start_arc = L2 / 2.0      # 40.0 mm (End of parallel part)
-    x_end_arc   = x_start_arc + dx
-    x_total     = L0 / 2.0      # 100.0 mm
+    # Outline Coordinates
+    # Transition dx from Pythagoras: R^2 = dx^2 + (R - dy)^2 (~23.98 mm)
+    outline = dogbone_outline(L0, L2, b_narrow, b_grip, R)
+    dx        = outline.x_end_arc - outline.x_start_arc
+    x_end_arc = outline.x_end_arc
+    x_total   = outline.x_total     # 100.0 mm
     
     # Check Resulting Grip Length
     actual_grip_len = x_total - x_end_arc
@@ -51,37 +50,22 @@ def generate_type_2(p):
     print(f"Remaining Grip Length: {actual_grip_len:.2f} mm")
     
     # 3. Modeling 
-    # Sketch Top-Right Quadrant
-    q_sketch = (
-        cq.Workplane("XY")
-        .moveTo(0, 0)
-        .lineTo(0, y_narrow)            # Center -> Narrow Width
-        .lineTo(x_start_arc, y_narrow)  # Parallel Section
-        
-        # Negative R (-R) for Inner/Concave Arc
-        .radiusArc((x_end_arc, y_grip), -R) 
-        
-        .lineTo(x_total, y_grip)        # Grip Section
-        .lineTo(x_total, 0)             # Close Loop
-        .close()
-    )
-
-    # Extrude and Union
-    quarter_solid = q_sketch.extrude(h)
-    half_solid    = quarter_solid.union(quarter_solid.mirror("YZ"))
-    final_body    = half_solid.union(half_solid.mirror("XZ"))
+    # Shared profile kernel (full closed outline extruded once; cached)
+    with span("profile") as phase:
+        final_body = phase.output(base_body(outline, h))
     
     return final_body
 
-# 4. Execution 
-final_model = generate_type_2(params)
+if __name__ in ("__main__", "__cq_main__"):
+    # 4. Execution 
+    final_model = generate_type_2(params)
 
-# 5. Render in CQ-Editor 
-if 'show_object' in globals():
-    show_object(final_model, name=params["type_name"])
+    # 5. Render in CQ-Editor 
+    if 'show_object' in globals():
+        show_object(final_model, name=params["type_name"])
 
-# 6. Export (Optional) 
-output_folder = r"C:\Users\taner\Downloads"
-file_path = os.path.join(output_folder, params["type_name"] + ".step")
+    # 6. Export (Optional) 
+    output_folder = r"C:\Users\taner\Downloads"
+    file_path = os.path.join(output_folder, params["type_name"] + ".step")
 
-cq.exporters.export(final_model, file_path)
+    cq.exporters.export(final_model, file_path)
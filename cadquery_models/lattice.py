@@ -0,0 +1,152 @@
+"""
+Lattice engine: one unit-cell prototype, many located instances.
+
+Every cell of a strut lattice is the same solid, so it is built (and fused)
+once and then placed with ``Shape.moved``. The instances share the prototype's
+TShape and only carry a different ``Location``, which keeps construction time
+and memory proportional to the number of distinct cell types instead of the
+number of struts.
+"""
+from functools import lru_cache
+
+import cadquery as cq
+
+from cadquery_models.outline import INSIDE, OUTSIDE, classify_box
+
+
+# ==============================================================================
+# 1. UNIT CELL PROTOTYPES
+# ==============================================================================
+@lru_cache(maxsize=16)
+def bcc_unit_cell(cell_size, strut_radius):
+    """
+    Builds a single BCC unit cell centred on the origin.
+    The eight centre-to-corner struts are fused once here, so the
+    strut/strut intersections at the node are never recomputed per cell.
+    """
+    s = cell_size / 2.0
+    # BCC vectors (Center to 8 corners)
+    directions = [
+        (s, s, s), (s, s, -s), (s, -s, s), (s, -s, -s),
+        (-s, s, s), (-s, s, -s), (-s, -s, s), (-s, -s, -s)
+    ]
+
+    struts = []
+    for d in directions:
+        dir_vec = cq.Vector(d)
+        struts.append(
+            cq.Solid.makeCylinder(strut_radius, dir_vec.Length, cq.Vector(0, 0, 0), dir_vec)
+        )
+
+    return struts[0].fuse(*struts[1:]).clean()
+
+
+@lru_cache(maxsize=64)
+def trimmed_unit_cell(cell_size, strut_radius, z_min, z_max):
+    """
+    Unit cell clipped to the local slab z_min <= z <= z_max.
+    Used for the bottom/top layers, where the struts leave the specimen
+    thickness; one boolean per distinct layer instead of one per cell.
+    """
+    prototype = bcc_unit_cell(cell_size, strut_radius)
+    extent = cell_size + 2.0 * strut_radius
+    slab = cq.Solid.makeBox(
+        extent, extent, z_max - z_min, cq.Vector(-extent / 2.0, -extent / 2.0, z_min)
+    )
+    return prototype.intersect(slab)
+
+
+# ==============================================================================
+# 2. INSTANCING
+# ==============================================================================
+def cell_centers(cell_size, nx, ny, nz):
+    """
+    Returns the centre of every cell of an nx * ny * nz block.
+    The block is centred on (0,0) in XY and starts at Z = 0.
+    """
+    # Calculate offset to center the grid around (0,0)
+    offset_x = -((nx - 1) * cell_size) / 2
+    offset_y = -((ny - 1) * cell_size) / 2
+
+    centers = []
+    for k in range(nz):
+        for j in range(ny):
+            for i in range(nx):
+                cx = offset_x + i * cell_size
+                cy = offset_y + j * cell_size
+                # Start Z at half cell size to center in the layer
+                cz = (cell_size / 2.0) + k * cell_size
+                centers.append((cx, cy, cz))
+
+    return centers
+
+
+def instance_cells(prototype, centers):
+    """
+    Places the prototype at every centre.
+    Each instance shares the prototype's TShape and only differs by Location.
+    """
+    return [prototype.moved(cq.Location(cq.Vector(*c))) for c in centers]
+
+
+def create_bcc_lattice_block(cell_size, strut_radius, nx, ny, nz):
+    """
+    Generates a large block of BCC lattice structure as a single Compound
+    of located unit-cell instances.
+    """
+    prototype = bcc_unit_cell(cell_size, strut_radius)
+    cells = instance_cells(prototype, cell_centers(cell_size, nx, ny, nz))
+
+    # Combine all cells into one lightweight Compound object
+    return cq.Compound.makeCompound(cells)
+
+
+# ==============================================================================
+# 3. PRE-CLIPPING AGAINST THE OUTLINE
+# ==============================================================================
+def classify_bcc_cells(outline, inset, thickness, cell_size, strut_radius, nx, ny, nz):
+    """
+    Sorts the cells of an nx * ny * nz BCC block against the inner core
+    (outline shrunk by `inset`, extruded from Z = 0 to `thickness`).
+
+    Returns (inside, straddling, n_outside):
+      inside     : cell instances that lie completely in the core, already
+                   clipped to the thickness; they need no boolean at all.
+      straddling : cell instances that cross the core wall and still have
+                   to be intersected with the core.
+      n_outside  : number of cells that were never built.
+    """
+    s = cell_size / 2.0
+    # Struts end in flat caps perpendicular to the diagonal,
+    # so a cell reaches at most one strut radius past its cube.
+    reach = s + strut_radius
+
+    inside = []
+    straddling = []
+    n_outside = 0
+
+    for cx, cy, cz in cell_centers(cell_size, nx, ny, nz):
+        if cz - reach >= thickness:
+            n_outside += 1
+            continue
+
+        state = classify_box(outline, cx - reach, cx + reach, cy - reach, cy + reach, inset)
+        if state == OUTSIDE:
+            n_outside += 1
+            continue
+
+        # Pick the cell type for this layer
+        if cz - reach < 0.0 or cz + reach > thickness:
+            prototype = trimmed_unit_cell(
+                cell_size, strut_radius, round(-cz, 9), round(thickness - cz, 9)
+            )
+        else:
+            prototype = bcc_unit_cell(cell_size, strut_radius)
+
+        cell = prototype.moved(cq.Location(cq.Vector(cx, cy, cz)))
+        if state == INSIDE:
+            inside.append(cell)
+        else:
+            straddling.append(cell)
+
+    return inside, straddling, n_outside
@@ -0,0 +1,182 @@
+"""
+Triangle mesh helpers for outputs that never go through a BRep.
+
+A mesh is a pair of NumPy arrays: vertices (V, 3) float and faces (F, 3)
+int, counter-clockwise when seen from outside.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+Mesh = namedtuple("Mesh", ["vertices", "faces"])
+
+# Binary STL record: normal, 3 vertices, attribute byte count
+STL_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+
+# ==============================================================================
+# 1. CONSTRUCTION
+# ==============================================================================
+def extrude_polygon_mesh(vertices_2d, triangles, thickness):
+    """
+    Extrudes a triangulated planar region (CCW triangles) from Z = 0 to
+    `thickness`. The side walls are built on the boundary edges of the
+    triangulation, i.e. edges without a reversed twin, so the result is
+    closed whenever the 2D triangulation is conforming.
+    """
+    vertices_2d = np.asarray(vertices_2d, dtype=float)
+    triangles = np.asarray(triangles, dtype=np.int64)
+    n = len(vertices_2d)
+
+    bottom = np.column_stack([vertices_2d, np.zeros(n)])
+    top = np.column_stack([vertices_2d, np.full(n, float(thickness))])
+    vertices = np.vstack([bottom, top])
+
+    # Caps: top keeps the CCW order, bottom is flipped
+    top_faces = triangles + n
+    bottom_faces = triangles[:, ::-1]
+
+    # Walls on the boundary edges (region on the left of a -> b)
+    a, b = boundary_edges(triangles)
+    walls = np.vstack([
+        np.column_stack([a, b, b + n]),
+        np.column_stack([a, b + n, a + n]),
+    ])
+
+    return Mesh(vertices, np.vstack([top_faces, bottom_faces, walls]))
+
+
+def boundary_edges(faces):
+    """
+    Directed edges (a, b) that are used by exactly one face and whose
+    reverse (b, a) is not used at all.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    a = faces.reshape(-1)
+    b = np.roll(faces, -1, axis=1).reshape(-1)
+
+    n = int(faces.max()) + 1 if len(faces) else 0
+    forward = a * n + b
+    reverse = b * n + a
+    unique, counts = np.unique(forward, return_counts=True)
+    single = np.isin(forward, unique[counts == 1]) & ~np.isin(forward, reverse)
+    return a[single], b[single]
+
+
+def weld(mesh, decimals=6):
+    """
+    Merges vertices that coincide after rounding to `decimals` and drops
+    the triangles that collapse.
+    """
+    vertices, inverse = np.unique(
+        np.round(mesh.vertices, decimals), axis=0, return_inverse=True
+    )
+    faces = inverse.reshape(-1)[mesh.faces]
+    keep = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+    return Mesh(vertices, faces[keep])
+
+
+# ==============================================================================
+# 2. CHECKS
+# ==============================================================================
+def is_watertight(mesh):
+    """
+    True if every directed edge appears once and its reverse appears once,
+    i.e. the surface is closed and consistently oriented.
+    """
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    a = faces.reshape(-1)
+    b = np.roll(faces, -1, axis=1).reshape(-1)
+
+    n = len(mesh.vertices)
+    forward = a * n + b
+    reverse = b * n + a
+    if len(np.unique(forward)) != len(forward):
+        return False
+    return bool(np.isin(reverse, forward).all())
+
+
+def mesh_volume(mesh):
+    """
+    Enclosed volume (divergence theorem), positive for outward normals.
+    """
+    tri = mesh.vertices[mesh.faces]
+    return float(np.einsum("ij,ij->i", tri[:, 0], np.cross(tri[:, 1], tri[:, 2])).sum() / 6.0)
+
+
+def bounding_box(mesh):
+    """
+    (min_xyz, max_xyz) of the mesh.
+    """
+    return mesh.vertices.min(axis=0), mesh.vertices.max(axis=0)
+
+
+# ==============================================================================
+# 3. OUTPUT
+# ==============================================================================
+def triangle_records(vertices, faces):
+    """
+    Packs triangles into binary STL records.
+    """
+    tri = np.asarray(vertices, dtype=float)[np.asarray(faces)]
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+    records = np.zeros(len(tri), dtype=STL_DTYPE)
+    records["normal"] = normals
+    records["vertices"] = tri
+    return records
+
+
+class StlWriter:
+    """
+    Binary STL file written in chunks. The triangle count in the header is
+    written as 0 first and patched when the file is closed, so triangles can
+    be streamed without keeping them all in memory.
+
+        with StlWriter(path) as stl:
+            for vertices, faces in chunks:
+                stl.write(vertices, faces)
+    """
+
+    def __init__(self, path, header=b"cadquery_models mesh"):
+        self.path = path
+        self.header = header
+        self.count = 0
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, "wb")
+        self.file.write(self.header[:80].ljust(80, b"\0"))
+        self.file.write(np.uint32(0).tobytes())
+        return self
+
+    def write(self, vertices, faces):
+        """
+        Appends the triangles `faces` (indices into `vertices`).
+        """
+        if len(faces) == 0:
+            return
+        records = triangle_records(vertices, faces)
+        records.tofile(self.file)
+        self.count += len(records)
+
+    def __exit__(self, *exc):
+        self.file.seek(80)
+        self.file.write(np.uint32(self.count).tobytes())
+        self.file.close()
+        self.file = None
+        return False
+
+
+def write_stl(path, mesh, header=b"cadquery_models mesh"):
+    """
+    Writes a binary STL file.
+    """
+    with StlWriter(path, header) as stl:
+        stl.write(mesh.vertices, mesh.faces)
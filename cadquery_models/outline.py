@@ -0,0 +1,203 @@
+"""
+Analytic description of the dogbone outline shared by every specimen.
+
+Only plain math lives here (no CadQuery), so pattern placement and lattice
+cell classification can ask "how wide is the specimen at this X?" without
+building or querying any BRep. The point queries are vectorized with NumPy so
+a whole candidate grid is classified in one call.
+"""
+import math
+from collections import namedtuple
+
+import numpy as np
+
+# Critical coordinates of the top-right quadrant (the outline is symmetric
+# about X = 0 and Y = 0):
+#   x_start_arc : end of the parallel narrow section
+#   x_end_arc   : end of the transition arc / start of the grip
+#   x_total     : physical end of the specimen
+#   y_narrow    : half width of the narrow section
+#   y_grip      : half width of the grip section
+#   radius      : transition radius
+Outline = namedtuple(
+    "Outline", ["x_start_arc", "x_end_arc", "x_total", "y_narrow", "y_grip", "radius"]
+)
+
+# Cell classification results
+INSIDE = "inside"
+OUTSIDE = "outside"
+STRADDLE = "straddle"
+
+
+# ==============================================================================
+# 1. OUTLINE
+# ==============================================================================
+def transition_length(radius, rise):
+    """
+    Horizontal length (dx) consumed by a tangent transition arc.
+    Pythagoras: R^2 = dx^2 + (R - dy)^2
+    """
+    if radius < rise:
+        raise ValueError(f"Radius ({radius}) is too small for the width change ({rise}).")
+    return math.sqrt(radius**2 - (radius - rise)**2)
+
+
+def dogbone_outline(overall_length, parallel_length, narrow_width, grip_width, radius):
+    """
+    Computes the critical coordinates of a dogbone specimen outline.
+    """
+    y_narrow = narrow_width / 2.0
+    y_grip = grip_width / 2.0
+    dx = transition_length(radius, y_grip - y_narrow)
+
+    x_start_arc = parallel_length / 2.0
+    x_end_arc = x_start_arc + dx
+    x_total = overall_length / 2.0
+
+    return Outline(x_start_arc, x_end_arc, x_total, y_narrow, y_grip, radius)
+
+
+def half_width(outline, x, inset=0.0):
+    """
+    Half width of the outline at position x, after shrinking the outline
+    inwards by `inset` (same result as offset2D(-inset, kind="intersection")).
+
+    The inset transition arc is concentric with the original one (radius R + inset)
+    and is capped by the inset grip line, which gives the sharp convex corner
+    where the arc meets the grip.
+    """
+    o = outline
+    ax = abs(x)
+
+    # Parallel narrow section
+    if ax <= o.x_start_arc:
+        return o.y_narrow - inset
+
+    y_grip = o.y_grip - inset
+    r_off = o.radius + inset
+    x_local = ax - o.x_start_arc
+    if x_local >= r_off:
+        return y_grip
+
+    # Transition arc: y = y_center - sqrt(R'^2 - x^2)
+    arc_center_y = o.y_narrow + o.radius
+    return min(y_grip, arc_center_y - math.sqrt(r_off**2 - x_local**2))
+
+
+# ==============================================================================
+# 2. CLASSIFICATION
+# ==============================================================================
+def classify_box(outline, x0, x1, y0, y1, inset=0.0):
+    """
+    Classifies the axis-aligned box [x0, x1] x [y0, y1] against the outline
+    shrunk by `inset`. Returns INSIDE, OUTSIDE or STRADDLE.
+
+    The half width never decreases from the centre towards the ends, so the
+    narrowest point of the box is at its smallest |x| and the widest at its
+    largest |x|; no sampling is needed.
+    """
+    x_limit = outline.x_total - inset
+
+    # Range of |x| and |y| covered by the box
+    ax_min = 0.0 if x0 <= 0.0 <= x1 else min(abs(x0), abs(x1))
+    ax_max = max(abs(x0), abs(x1))
+    ay_min = 0.0 if y0 <= 0.0 <= y1 else min(abs(y0), abs(y1))
+    ay_max = max(abs(y0), abs(y1))
+
+    if ax_min >= x_limit or ay_min >= half_width(outline, min(ax_max, x_limit), inset):
+        return OUTSIDE
+
+    if ax_max <= x_limit and ay_max <= half_width(outline, ax_min, inset):
+        return INSIDE
+
+    return STRADDLE
+
+
+# ==============================================================================
+# 3. VECTORIZED POINT QUERIES
+# ==============================================================================
+def _segment_distance(px, py, ax, ay, bx, by):
+    """
+    Distance from points (px, py) to the segment A-B.
+    """
+    ex, ey = bx - ax, by - ay
+    t = np.clip(((px - ax) * ex + (py - ay) * ey) / (ex * ex + ey * ey), 0.0, 1.0)
+    return np.hypot(px - (ax + t * ex), py - (ay + t * ey))
+
+
+def half_widths(outline, x, inset=0.0):
+    """
+    Array version of half_width().
+    """
+    o = outline
+    ax = np.abs(np.asarray(x, dtype=float))
+    r_off = o.radius + inset
+
+    x_local = np.clip(ax - o.x_start_arc, 0.0, r_off)
+    arc_y = (o.y_narrow + o.radius) - np.sqrt(r_off**2 - x_local**2)
+
+    return np.where(
+        ax <= o.x_start_arc,
+        o.y_narrow - inset,                     # Parallel narrow section
+        np.minimum(o.y_grip - inset, arc_y),    # Transition arc / grip
+    )
+
+
+def signed_distance(outline, x, y):
+    """
+    Exact Euclidean distance from each point to the outline, positive inside
+    and negative outside. Accepts scalars or arrays of any (equal) shape.
+
+    By symmetry only the four boundary pieces of the top-right quadrant are
+    needed: parallel edge, transition arc, grip edge and end face.
+    """
+    o = outline
+    # Round |x|, |y| so that mirrored candidates always get the same answer
+    ax = np.round(np.abs(np.asarray(x, dtype=float)), 9)
+    ay = np.round(np.abs(np.asarray(y, dtype=float)), 9)
+
+    # Parallel, grip and end edges
+    d_parallel = _segment_distance(ax, ay, 0.0, o.y_narrow, o.x_start_arc, o.y_narrow)
+    d_grip = _segment_distance(ax, ay, o.x_end_arc, o.y_grip, o.x_total, o.y_grip)
+    d_end = _segment_distance(ax, ay, o.x_total, 0.0, o.x_total, o.y_grip)
+
+    # Transition arc: centre above the narrow section, swept from straight
+    # below the centre up to the start of the grip
+    vx = ax - o.x_start_arc
+    vy = ay - (o.y_narrow + o.radius)
+    angle = np.arctan2(vy, vx)
+    angle_end = math.atan2(o.y_grip - o.y_narrow - o.radius, o.x_end_arc - o.x_start_arc)
+    on_arc = (angle >= -math.pi / 2.0) & (angle <= angle_end)
+    d_arc = np.where(on_arc, np.abs(np.hypot(vx, vy) - o.radius), np.inf)
+
+    distance = np.minimum(np.minimum(d_parallel, d_grip), np.minimum(d_end, d_arc))
+    inside = (ax <= o.x_total) & (ay <= half_widths(o, ax))
+
+    return np.where(inside, distance, -distance)
+
+
+def classify_points(outline, x, y, margin=0.0):
+    """
+    Containment test for candidate centres.
+    Returns (mask, clearance): mask is True where a point keeps at least
+    `margin` from every edge, clearance is its signed distance to the outline.
+    """
+    clearance = signed_distance(outline, x, y)
+    return clearance >= margin, clearance
+
+
+def classify_boxes(outline, x0, x1, y0, y1, inset=0.0):
+    """
+    Array version of classify_box(): one state per box.
+    """
+    x0, x1, y0, y1 = (np.asarray(v, dtype=float) for v in (x0, x1, y0, y1))
+    x_limit = outline.x_total - inset
+
+    ax_min = np.where((x0 <= 0.0) & (0.0 <= x1), 0.0, np.minimum(np.abs(x0), np.abs(x1)))
+    ax_max = np.maximum(np.abs(x0), np.abs(x1))
+    ay_min = np.where((y0 <= 0.0) & (0.0 <= y1), 0.0, np.minimum(np.abs(y0), np.abs(y1)))
+    ay_max = np.maximum(np.abs(y0), np.abs(y1))
+
+    outside = (ax_min >= x_limit) | (ay_min >= half_widths(outline, np.minimum(ax_max, x_limit), inset))
+    inside = (ax_max <= x_limit) & (ay_max <= half_widths(outline, ax_min, inset))
+    return np.where(outside, OUTSIDE, np.where(inside, INSIDE, STRADDLE))
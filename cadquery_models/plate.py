@@ -0,0 +1,227 @@
+"""
+Build plate layout: several specimens nested on one printer bed.
+
+A plate file lists specimens and how many copies of each to print:
+
+    [{"specimen": "iso527_1b_grid", "count": 5},
+     {"specimen": "astm_d638", "params": {"type": "TYPE_V"}, "count": 3}]
+
+(JSON or YAML; entries may also carry script "options", see registry.py)
+
+Every distinct specimen (key + resolved parameters) is built once; its
+copies are placements of the same geometry. The footprints are packed in
+shelves (rows filled left to right, rows stacked front to back) with a
+fixed spacing, long specimens turned 90 degrees when they only fit that
+way. Whatever does not fit on the bed goes to the next plate.
+
+    python -m cadquery_models.plate plate.json --bed 250x210 --spacing 5 --out build/ --formats 3mf,stl
+
+In 3MF identical specimens share one mesh; in STL each is meshed once and
+written at every placement.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from cadquery_models import registry
+from cadquery_models.batch import export_model, read_spec
+from cadquery_models.implicit import Implicit, implicit_mesh
+from cadquery_models.instances import IDENTITY, as_instanced, instance_count, merge, model_bounds, place
+
+DEFAULT_BED = (250.0, 210.0)
+DEFAULT_SPACING = 5.0
+
+# index : position in the item list, x/y : lower-left corner on the bed,
+# rotated : turned 90 degrees about Z
+Slot = namedtuple("Slot", ["index", "x", "y", "rotated"])
+
+# 90 degrees about Z
+QUARTER_TURN = np.array([[0.0, -1.0, 0.0, 0.0], [1.0, 0.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0]])
+
+
+# ==============================================================================
+# 1. PACKING
+# ==============================================================================
+def orient(width, depth, bed_width, bed_depth, prefer_turned=False):
+    """
+    True if a width x depth footprint is placed turned by 90 degrees:
+    when it only fits that way, or when it fits both ways and
+    `prefer_turned` is set. Raises ValueError if it fits neither way.
+    """
+    fits = width <= bed_width and depth <= bed_depth
+    fits_turned = depth <= bed_width and width <= bed_depth
+    if not (fits or fits_turned):
+        raise ValueError(f"A {width:.1f} x {depth:.1f} mm specimen does not fit a {bed_width} x {bed_depth} mm bed")
+    return fits_turned and (prefer_turned or not fits)
+
+
+def shelf_layout(sizes, bed_width, bed_depth, spacing):
+    """
+    Next-fit shelf packing of (width, depth, rotated) items, deepest first.
+    Returns one list of Slot per plate.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    plates = []
+    slots = []
+    x = y = shelf_depth = 0.0
+    for i in order:
+        width, depth, rotated = sizes[i]
+        if slots and x + width > bed_width:
+            # Next shelf
+            x = 0.0
+            y += shelf_depth + spacing
+            shelf_depth = 0.0
+        if slots and y + depth > bed_depth:
+            # Next plate
+            plates.append(slots)
+            slots = []
+            x = y = shelf_depth = 0.0
+        slots.append(Slot(i, x, y, rotated))
+        x += width + spacing
+        shelf_depth = max(shelf_depth, depth)
+
+    if slots:
+        plates.append(slots)
+    return plates
+
+
+def pack_shelves(footprints, bed=DEFAULT_BED, spacing=DEFAULT_SPACING):
+    """
+    Packs (width, depth) footprints on plates of size `bed`. Specimens that
+    fit both ways are tried all as is and all turned; the layout with the
+    fewest plates (then the fullest first plates) wins. Returns one list of
+    Slot per plate.
+    """
+    bed_width, bed_depth = bed
+    layouts = []
+    for prefer_turned in (False, True):
+        sizes = []
+        for width, depth in footprints:
+            rotated = orient(width, depth, bed_width, bed_depth, prefer_turned)
+            sizes.append((depth, width, rotated) if rotated else (width, depth, rotated))
+        layouts.append(shelf_layout(sizes, bed_width, bed_depth, spacing))
+    return min(layouts, key=lambda plates: (len(plates), [-len(slots) for slots in plates]))
+
+
+# ==============================================================================
+# 2. LAYOUT
+# ==============================================================================
+def load_plate(path):
+    """
+    Reads a plate file into a list of (specimen, params, count, options).
+    """
+    return [
+        (e["specimen"], e.get("params") or {}, int(e.get("count", 1)), e.get("options") or {})
+        for e in read_spec(path)
+    ]
+
+
+def build_once(items):
+    """
+    Builds every distinct (specimen, resolved params, options) of the
+    items once. Returns the instanced model of each item, copies sharing
+    one object. Implicit models are meshed here so they can be placed.
+    """
+    built = {}
+    models = []
+    for specimen, params, options in items:
+        key = json.dumps([specimen, registry.resolve_params(specimen, params), options], sort_keys=True)
+        if key not in built:
+            print(f"[INFO] Building {specimen} {params or ''}")
+            model = registry.build(specimen, params, options)
+            if isinstance(model, Implicit):
+                model = implicit_mesh(model)
+            built[key] = as_instanced(model)
+        models.append(built[key])
+    return models
+
+
+def slot_matrix(slot, low, high):
+    """
+    Placement of a model with bounding box (low, high) in its slot: turned
+    if needed, lower-left corner on the slot corner, resting on Z = 0.
+    """
+    matrix = QUARTER_TURN if slot.rotated else IDENTITY
+    corners = np.array([[x, y] for x in (low[0], high[0]) for y in (low[1], high[1])])
+    turned = corners @ matrix[:2, :2].T
+    shift = np.array([slot.x, slot.y, 0.0]) - np.array([*turned.min(axis=0), low[2]])
+    return np.hstack([matrix[:, :3], shift[:, None]])
+
+
+def layout_plates(entries, bed=DEFAULT_BED, spacing=DEFAULT_SPACING):
+    """
+    Lays out (specimen, params, count, options) entries on as many plates
+    as needed. Returns one instances.Instanced model per plate.
+    """
+    items = [
+        (specimen, params, options)
+        for specimen, params, count, options in entries for _ in range(count)
+    ]
+    models = build_once(items)
+    bounds = [model_bounds(model) for model in models]
+    footprints = [tuple(high[:2] - low[:2]) for low, high in bounds]
+
+    plates = []
+    for slots in pack_shelves(footprints, bed, spacing):
+        placed = [place(models[s.index], slot_matrix(s, *bounds[s.index])) for s in slots]
+        plates.append(merge(placed))
+    return plates
+
+
+# ==============================================================================
+# 3. EXECUTION
+# ==============================================================================
+def export_plates(plates, output_dir, formats=("3mf",), tolerance=0.01, angular_tolerance=0.1,
+                  chordal_error=None):
+    """
+    Writes plate_01.<fmt>, plate_02.<fmt>, ... and returns their paths.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for n, plate in enumerate(plates, start=1):
+        for fmt in formats:
+            path = os.path.join(output_dir, f"plate_{n:02d}.{fmt}")
+            export_model(plate, path, fmt, tolerance, angular_tolerance, chordal_error)
+            paths.append(path)
+            print(f"[SUCCESS] Plate {n} ({len(plate.parts)} parts, {instance_count(plate)} placements) -> {path}")
+    return paths
+
+
+def parse_bed(text):
+    width, depth = (float(v) for v in text.lower().split("x"))
+    return width, depth
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nest specimens on build plates.")
+    parser.add_argument("plate", help="JSON or YAML plate file")
+    parser.add_argument("--bed", type=parse_bed, default=DEFAULT_BED, help="bed size in mm, e.g. 250x210")
+    parser.add_argument("--spacing", type=float, default=DEFAULT_SPACING, help="gap between specimens in mm")
+    parser.add_argument("--out", "-o", default="build", help="output directory")
+    parser.add_argument("--formats", default="3mf", help="comma separated: 3mf,stl,step")
+    parser.add_argument("--tolerance", type=float, default=0.01)
+    parser.add_argument("--angular-tolerance", type=float, default=0.1)
+    parser.add_argument("--chordal-error", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    plates = layout_plates(load_plate(args.plate), args.bed, args.spacing)
+    print(f"[INFO] {len(plates)} plate(s) of {args.bed[0]:g} x {args.bed[1]:g} mm")
+    export_plates(
+        plates, args.out,
+        formats=[f.strip() for f in args.formats.split(",") if f.strip()],
+        tolerance=args.tolerance,
+        angular_tolerance=args.angular_tolerance,
+        chordal_error=args.chordal_error,
+    )
+    print(f"[INFO] Done in {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Dogbone profile kernel: sketches and base solids built from an Outline.
+
+The base solid is a single extrusion of the full closed outline (no mirror
+booleans, no seam edges) and is memoized on the geometric parameters (the
+Outline tuple and the thickness), so every infill variant or batch job that
+shares an outer body reuses it instead of rebuilding it.
+
+Prismatic infills (holes constant through the thickness) are built 2D-first:
+the cross-section is one face with the holes as inner wires, extruded once.
+Holes screened beforehand (cutters.cutter_problems()) skip the orientation
+fix and OCC's checks of the face, so it is built in time linear in the
+number of holes (trusted_face()). The face itself is never checked: OCC's
+check compares every pair of wires and grows quadratically.
+"""
+from functools import lru_cache
+
+import cadquery as cq
+import numpy as np
+from OCP.BRepBuilderAPI import BRepBuilderAPI_MakeFace, BRepBuilderAPI_MakePolygon
+from OCP.gp import gp_Pnt
+
+from cadquery_models.booleans import tiled_cut
+
+
+# ==============================================================================
+# 1. SKETCHES
+# ==============================================================================
+def outline_sketch(outline):
+    """
+    Full closed 2D profile (12 segments): the base body and the inner core
+    are both built from it.
+    """
+    o = outline
+    return (
+        cq.Workplane("XY")
+        .moveTo(o.x_start_arc, o.y_narrow)
+        .radiusArc((o.x_end_arc, o.y_grip), -o.radius)
+        .lineTo(o.x_total, o.y_grip)
+        .lineTo(o.x_total, -o.y_grip)
+        .lineTo(o.x_end_arc, -o.y_grip)
+        .radiusArc((o.x_start_arc, -o.y_narrow), -o.radius)
+        .lineTo(-o.x_start_arc, -o.y_narrow)
+        .radiusArc((-o.x_end_arc, -o.y_grip), -o.radius)
+        .lineTo(-o.x_total, -o.y_grip)
+        .lineTo(-o.x_total, o.y_grip)
+        .lineTo(-o.x_end_arc, o.y_grip)
+        .radiusArc((-o.x_start_arc, o.y_narrow), -o.radius)
+        .close()
+    )
+
+
+def quadrant_sketch(outline):
+    """
+    Closed top-right quarter of the profile (X >= 0, Y >= 0), bounded by the
+    two symmetry axes. Used by the quadrant symmetry mode (symmetry.py).
+    """
+    o = outline
+    return (
+        cq.Workplane("XY")
+        .moveTo(0, 0)
+        .lineTo(0, o.y_narrow)
+        .lineTo(o.x_start_arc, o.y_narrow)
+        .radiusArc((o.x_end_arc, o.y_grip), -o.radius)
+        .lineTo(o.x_total, o.y_grip)
+        .lineTo(o.x_total, 0)
+        .close()
+    )
+
+
+# ==============================================================================
+# 2. MEMOIZED SOLIDS
+# ==============================================================================
+@lru_cache(maxsize=32)
+def base_solid(outline, thickness):
+    """
+    Full specimen body: one extrusion of the closed outline, zero booleans.
+    """
+    return outline_sketch(outline).extrude(thickness).val()
+
+
+def base_body(outline, thickness):
+    """
+    Workplane holding the (cached) base solid, ready for further operations.
+    """
+    return cq.Workplane("XY").add(base_solid(outline, thickness))
+
+
+# ==============================================================================
+# 3. CROSS-SECTIONS
+# ==============================================================================
+def outline_wire(outline):
+    """
+    Closed outer wire of the specimen.
+    """
+    return outline_sketch(outline).val()
+
+
+def polygon_wires(polygons, reverse=False):
+    """
+    Closed wires of 2D polygons ((k, 2) arrays or point lists), in the XY
+    plane, built straight from the coordinates in one pass. `reverse`
+    reverses the vertex order of every polygon.
+    """
+    wires = []
+    for polygon in polygons:
+        points = np.asarray(polygon, dtype=float).tolist()
+        builder = BRepBuilderAPI_MakePolygon()
+        for x, y in reversed(points) if reverse else points:
+            builder.Add(gp_Pnt(x, y, 0.0))
+        builder.Close()
+        wires.append(cq.Wire(builder.Wire()))
+    return wires
+
+
+def holes_counter_clockwise(outer_wire):
+    """
+    True if holes of a face bounded by `outer_wire` run counter-clockwise
+    seen from +Z (the outer wire runs clockwise).
+    """
+    return cq.Face.makeFromWires(outer_wire).normalAt().z < 0.0
+
+
+def section_face(outer_wire, hole_wires, check=True):
+    """
+    Planar face bounded by `outer_wire` with `hole_wires` as holes.
+    Holes strictly inside the outline are simply added as inner wires; if
+    any of them touches the outline or another hole the face is invalid and
+    the holes are subtracted with a tiled 2D boolean instead.
+
+    The validity check compares every pair of wires; with check=False the
+    holes are trusted to be disjoint and inside the outline. Holes of any
+    orientation are accepted, which still costs an orientation fix of
+    every hole against the others (trusted_face() skips it).
+    """
+    hole_wires = list(hole_wires)
+    face = cq.Face.makeFromWires(outer_wire, hole_wires)
+    if not check or face.isValid():
+        return face
+
+    holes = [cq.Face.makeFromWires(wire) for wire in hole_wires]
+    return tiled_cut(cq.Face.makeFromWires(outer_wire), holes)
+
+
+def trusted_face(outer_wire, hole_wires):
+    """
+    Planar face bounded by `outer_wire` with `hole_wires` added as they are:
+    no orientation fix and no check, so the cost is linear in the number of
+    holes. The caller guarantees the holes are disjoint, inside the outline
+    and run in the direction given by holes_counter_clockwise(); nothing
+    here checks it, and an invalid face is returned as it is.
+    """
+    builder = BRepBuilderAPI_MakeFace(outer_wire.wrapped, True)
+    for wire in hole_wires:
+        builder.Add(wire.wrapped)
+    if not builder.IsDone():
+        raise ValueError(f"Cannot build face: {builder.Error()}")
+    return cq.Face(builder.Face())
+
+
+def extrude_section(section, thickness):
+    """
+    Workplane holding the cross-section (face or faces) extruded once along +Z.
+    """
+    direction = cq.Vector(0, 0, thickness)
+    return cq.Workplane("XY").add([cq.Solid.extrudeLinear(face, direction) for face in section.Faces()])
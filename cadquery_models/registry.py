@@ -0,0 +1,256 @@
+"""
+Registry of the specimen generators.
+
+The generator scripts live in folders such as ``iso/527-2`` that are not
+valid package names, so they are loaded from their file path. Each entry
+maps a specimen key to its script, generator function and default
+parameters; `build()` merges overrides into the defaults and calls the
+generator, which lets batch drivers run any specimen from plain data.
+
+Listing specimens, reading defaults and validating parameters or options
+only parse the scripts' source: no script is imported (and so neither
+cadquery nor OpenCascade is loaded) until `build()` is called.
+
+Script settings outside the parameter dicts (QUADRANT_SYMMETRY,
+BOOLEAN_PROCESSES, ...) are "options": `build()` sets them on the script
+module for the duration of one build and restores them afterwards. Only
+the settings the generator reads are declared as options of a specimen;
+those of the scripts' export blocks (OUTPUT_DIR, OUTPUT_MODE, ...) are not.
+"""
+import ast
+import copy
+import hashlib
+import importlib.util
+import os
+import sys
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+
+from cadquery_models.instrument import span
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# script    : path relative to this package
+# generator : name of the generator function in the script
+# defaults  : module-level parameter dict(s) of the script
+# options   : module-level settings the generator reads (build options)
+Specimen = namedtuple("Specimen", ["script", "generator", "defaults", "options"], defaults=((),))
+
+SPECIMENS = {
+    "astm_d638": Specimen("astm/ASTM638_solid.py", "generate_astm_specimen", ("ASTM_SPECS",)),
+    "iso527_1a": Specimen("iso/527-2/type1a.py", "generate_type_1a", ("params",)),
+    "iso527_1b": Specimen("iso/527-2/type1b.py", "generate_from_params", ("params",)),
+    "iso527_2": Specimen("iso/527-2/type2.py", "generate_type_2", ("params",)),
+    "iso527_1b_grid": Specimen(
+        "iso/527-2/type1b_grid.py", "generate_iso_with_wall", ("params",), ("QUADRANT_SYMMETRY",)
+    ),
+    "iso527_1b_grid_mesh": Specimen(
+        "iso/527-2/type1b_grid.py", "generate_iso_with_wall_mesh", ("params",)
+    ),
+    "iso527_1b_auxetic": Specimen(
+        "iso/527-2/type1b_auxetic.py", "generate_ultimate_specimen", ("PARAMS", "PATTERN"),
+        ("QUADRANT_SYMMETRY",),
+    ),
+    "iso527_1b_auxetic_mesh": Specimen(
+        "iso/527-2/type1b_auxetic.py", "generate_auxetic_mesh", ("PARAMS", "PATTERN")
+    ),
+    "iso527_1b_lattice": Specimen(
+        "iso/527-2/type1b_lattice.py", "generate_open_lattice_specimen", ("params",),
+        ("QUADRANT_SYMMETRY", "BOOLEAN_TILES", "BOOLEAN_PROCESSES"),
+    ),
+    "iso527_1b_lattice_instanced": Specimen(
+        "iso/527-2/type1b_lattice.py", "generate_open_lattice_instances", ("params",),
+        ("BOOLEAN_TILES", "BOOLEAN_PROCESSES"),
+    ),
+    "iso527_1b_circular": Specimen(
+        "iso/527-2/type1b_circular.py", "generate_boundary_compliant_specimen", ("params",),
+        ("QUADRANT_SYMMETRY",),
+    ),
+    "iso527_1b_circular_mesh": Specimen(
+        "iso/527-2/type1b_circular.py", "generate_circular_mesh", ("params",)
+    ),
+    "iso527_1b_tpms": Specimen(
+        "iso/527-2/type1b_tpms.py", "generate_tpms_specimen", ("params",), ("ADAPTIVE_SAMPLING",)
+    ),
+    "iso527_1b_honeycomb": Specimen(
+        "iso/527-2/type1b_honeycomb.py", "generate_honeycomb_specimen", ("params",)
+    ),
+    "iso527_1b_honeycomb_mesh": Specimen(
+        "iso/527-2/type1b_honeycomb.py", "generate_honeycomb_mesh", ("params",)
+    ),
+}
+
+
+# ==============================================================================
+# 1. LOADING
+# ==============================================================================
+def load_script(key):
+    """
+    Imports the generator script of a specimen (once per process).
+    """
+    spec = SPECIMENS[key]
+    module_name = f"cadquery_models.scripts.{key}"
+    if module_name not in sys.modules:
+        path = os.path.join(PACKAGE_DIR, spec.script)
+        module_spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(module_spec)
+        sys.modules[module_name] = module
+        try:
+            module_spec.loader.exec_module(module)
+        except Exception:
+            del sys.modules[module_name]
+            raise
+    return sys.modules[module_name]
+
+
+@lru_cache(maxsize=None)
+def _read_constants(path):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    constants = {}
+    for node in tree.body:
+        if not isinstance(node, ast.Assign):
+            continue
+        try:
+            value = ast.literal_eval(node.value)
+        except ValueError:
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                constants[target.id] = value
+    return constants
+
+
+def script_constants(key):
+    """
+    Literal values assigned at the top level of a specimen's script, read
+    from its source without importing it.
+    """
+    return copy.deepcopy(_read_constants(os.path.join(PACKAGE_DIR, SPECIMENS[key].script)))
+
+
+def default_params(key):
+    """
+    Flat copy of a specimen's default parameters.
+    The ASTM entry adds a "type" key selecting the row of ASTM_SPECS.
+    """
+    constants = script_constants(key)
+    if key == "astm_d638":
+        params = {"type": constants["SELECTED_TYPE"]}
+        params.update(constants["ASTM_SPECS"][constants["SELECTED_TYPE"]])
+        return params
+
+    params = {}
+    for name in SPECIMENS[key].defaults:
+        params.update(constants[name])
+    return params
+
+
+def resolve_params(key, overrides=None):
+    """
+    Full, flat parameter set of a job: defaults updated with `overrides`.
+    For ASTM D638 the defaults are the row selected by the "type" override.
+    """
+    overrides = dict(overrides or {})
+
+    if key == "astm_d638":
+        constants = script_constants(key)
+        spec_name = overrides.get("type", constants["SELECTED_TYPE"])
+        if spec_name not in constants["ASTM_SPECS"]:
+            raise ValueError(f"Unknown ASTM D638 type: {spec_name}")
+        params = {"type": spec_name}
+        params.update(constants["ASTM_SPECS"][spec_name])
+    else:
+        params = default_params(key)
+
+    unknown = set(overrides) - set(params)
+    if unknown:
+        raise ValueError(f"Unknown parameter(s) for {key}: {', '.join(sorted(unknown))}")
+
+    params.update(overrides)
+    return params
+
+
+def default_options(key):
+    """
+    Declared options of a specimen with their default values, read from
+    its script.
+    """
+    constants = script_constants(key)
+    return {name: constants[name] for name in SPECIMENS[key].options}
+
+
+def check_options(key, options=None):
+    """
+    Default options of a specimen; raises ValueError for unknown names.
+    """
+    defaults = default_options(key)
+    unknown = set(options or {}) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown option(s) for {key}: {', '.join(sorted(unknown))}")
+    return defaults
+
+
+@contextmanager
+def script_options(key, options=None):
+    """
+    Sets script options for the enclosed block and restores them after.
+    """
+    options = dict(options or {})
+    defaults = check_options(key, options)
+
+    module = load_script(key)
+    for name, value in options.items():
+        setattr(module, name, value)
+    try:
+        yield module
+    finally:
+        for name in options:
+            setattr(module, name, defaults[name])
+
+
+def generator_fingerprint(key):
+    """
+    Hash of the code that produces a specimen: its script plus the shared
+    kernels of this package. Changes whenever either is edited.
+    """
+    digest = hashlib.sha256()
+    paths = [os.path.join(PACKAGE_DIR, SPECIMENS[key].script)]
+    paths += sorted(
+        os.path.join(PACKAGE_DIR, name) for name in os.listdir(PACKAGE_DIR) if name.endswith(".py")
+    )
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# ==============================================================================
+# 2. BUILDING
+# ==============================================================================
+def build(key, overrides=None, options=None):
+    """
+    Builds a specimen from its defaults updated with `overrides`, with the
+    script `options` applied for this build only.
+    Returns whatever the generator returns (Workplane, Shape, mesh.Mesh,
+    instances.Instanced or implicit.Implicit).
+    The build is reported as an instrumentation span named after `key`,
+    with the generator phases nested in it.
+    """
+    module = load_script(key)
+    generator = getattr(module, SPECIMENS[key].generator)
+    params = resolve_params(key, overrides)
+
+    with script_options(key, options), span(key) as phase:
+        if key == "astm_d638":
+            spec_name = params.pop("type")
+            return phase.output(generator(spec_name, params))
+
+        if SPECIMENS[key].defaults == ("PARAMS", "PATTERN"):
+            p = {k: params[k] for k in module.PARAMS}
+            pattern = {k: params[k] for k in module.PATTERN}
+            return phase.output(generator(p, pattern))
+
+        return phase.output(generator(params))
@@ -0,0 +1,111 @@
+"""
+Quadrant symmetry mode.
+
+Every specimen is symmetric about X = 0 and Y = 0, and so are the pattern
+layouts: grid and lattice cells are centred on the origin, and the circular
+and auxetic centres form mirror-symmetric sets. A patterned specimen can
+therefore be built and booleaned in the top-right quadrant only. The
+finished quadrant is then mirrored twice and the copies are fused, with the
+seams on the symmetry planes removed.
+
+Features that cross a symmetry axis are clipped to the quadrant; their
+mirror images rebuild them exactly. The mirrored part has its faces split
+differently from a full build, so Shape.Volume(), a numerical integration
+with a loose default precision, can differ by a few 1e-5 of the volume
+(0.07 mm3 of 2680 mm3 for a 6 mm lattice with 0.7 mm struts). Integrated
+to 1e-6 (BRepGProp.VolumeProperties_s(shape, props, 1e-6)), the two builds
+agree to 1e-4 mm3.
+"""
+import numpy as np
+
+import cadquery as cq
+
+from cadquery_models.outline import INSIDE, OUTSIDE, STRADDLE
+from cadquery_models.profile import quadrant_sketch, section_face
+
+
+# ==============================================================================
+# 1. QUADRANT TESTS
+# ==============================================================================
+def quadrant_mask(x, y, reach):
+    """
+    True for features centred at (x, y) that reach into the quadrant,
+    i.e. whose half-extent `reach` crosses X = 0 / Y = 0 or lies beyond.
+    """
+    return (np.asarray(x) + reach > 0.0) & (np.asarray(y) + reach > 0.0)
+
+
+def quadrant_state(bb):
+    """
+    Classifies a bounding box against the quadrant X >= 0, Y >= 0.
+    """
+    if bb.xmax <= 0.0 or bb.ymax <= 0.0:
+        return OUTSIDE
+    if bb.xmin > 0.0 and bb.ymin > 0.0:
+        return INSIDE
+    return STRADDLE
+
+
+def split_by_quadrant(shapes):
+    """
+    (inside, crossing): shapes completely in the quadrant and shapes that
+    cross one of the symmetry planes. Shapes outside are dropped.
+    """
+    inside = []
+    crossing = []
+    for shape in shapes:
+        state = quadrant_state(shape.BoundingBox())
+        if state == INSIDE:
+            inside.append(shape)
+        elif state == STRADDLE:
+            crossing.append(shape)
+    return inside, crossing
+
+
+def quadrant_box(outline, z_min, z_max, margin=1.0):
+    """
+    Box covering the quadrant of the specimen between z_min and z_max.
+    """
+    return cq.Solid.makeBox(
+        outline.x_total + margin,
+        outline.y_grip + margin,
+        z_max - z_min + 2.0 * margin,
+        cq.Vector(0, 0, z_min - margin),
+    )
+
+
+# ==============================================================================
+# 2. QUADRANT SECTION / MIRRORING
+# ==============================================================================
+def quadrant_section(outline, hole_wires):
+    """
+    Cross-section of the top-right quadrant: holes inside it become inner
+    wires, holes crossing a symmetry axis are cut with a 2D boolean.
+    """
+    inner, crossing = split_by_quadrant(hole_wires)
+    face = section_face(quadrant_sketch(outline).val(), inner)
+    if crossing:
+        face = face.cut(*[cq.Face.makeFromWires(wire) for wire in crossing])
+    return face
+
+
+def mirror(shape, plane):
+    """
+    Mirror image of a solid or a section in the XY plane. The symmetry
+    planes contain Z, so a mirrored section must keep its normal; faces that
+    come out flipped are reversed (otherwise the halves cannot be merged).
+    """
+    image = shape.mirror(plane)
+    if not shape.Solids() and image.Faces()[0].normalAt().z != shape.Faces()[0].normalAt().z:
+        image = cq.Shape.cast(image.wrapped.Reversed())
+    return image
+
+
+def mirror_quadrant(shape):
+    """
+    Rebuilds the full part from its top-right quadrant: mirror across YZ,
+    fuse, mirror the half across XZ, fuse, and merge the faces split by the
+    symmetry planes.
+    """
+    half = shape.fuse(mirror(shape, "YZ"))
+    return half.fuse(mirror(half, "XZ")).clean()
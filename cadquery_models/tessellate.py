@@ -0,0 +1,259 @@
+"""
+BRep tessellation streamed straight to disk.
+
+``cq.exporters.export`` meshes the whole model and then assembles one
+triangulation of every face before writing it, so a dense lattice is held in
+memory twice. Here each solid is meshed on its own, its faces are written to
+a binary STL as they are read, and the solid's triangulation is dropped again
+before the next one. Peak memory therefore follows the largest solid, not the
+whole model (a plate of specimens costs as much as one specimen).
+
+With `processes` the pieces are meshed in a process pool instead - solids,
+or chunks of faces of a single solid - and the triangle buffers are stitched
+into the file in their original order.
+
+The meshing settings are the ones ``cq.exporters.export`` uses (relative
+linear deflection, parallel BRepMesh), so both paths give the same triangles.
+
+With a `chordal_error` the deflection is chosen per face instead: a curved
+face of radius r (hole, strut, transition arc) gets the chord angle whose
+sagitta is the chordal error, 2 acos(1 - e / r), so large arcs keep their
+accuracy while small holes and struts are no longer meshed with the angular
+step of the whole model. Planes only follow their edges.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import cadquery as cq
+from OCP.BRep import BRep_Tool
+from OCP.BRepAdaptor import BRepAdaptor_Surface
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.BRepTools import BRepTools
+from OCP.GeomAbs import GeomAbs_Cylinder, GeomAbs_Plane, GeomAbs_Sphere, GeomAbs_Torus
+from OCP.TopAbs import TopAbs_REVERSED
+from OCP.TopLoc import TopLoc_Location
+
+from cadquery_models.instances import Instanced, apply_transform, trsf_matrix
+from cadquery_models.mesh import Mesh, StlWriter, weld
+
+# Coarsest chord angle on a curved face (about 13 segments per circle)
+MAX_CHORD_ANGLE = 0.5
+
+
+# ==============================================================================
+# 1. MESHING
+# ==============================================================================
+def mesh_shape(shape, tolerance, angular_tolerance):
+    """
+    Tessellates a shape in place with the exporter settings.
+    """
+    BRepMesh_IncrementalMesh(shape.wrapped, tolerance, True, angular_tolerance, True)
+
+
+def feature_radius(face):
+    """
+    Smallest radius of curvature of a face: inf for planes, None for
+    surfaces without a constant one.
+    """
+    surface = BRepAdaptor_Surface(face.wrapped)
+    kind = surface.GetType()
+    if kind == GeomAbs_Plane:
+        return math.inf
+    if kind == GeomAbs_Cylinder:
+        return surface.Cylinder().Radius()
+    if kind == GeomAbs_Sphere:
+        return surface.Sphere().Radius()
+    if kind == GeomAbs_Torus:
+        return surface.Torus().MinorRadius()
+    return None
+
+
+def chord_angle(radius, chordal_error):
+    """
+    Largest chord angle on an arc of `radius` whose sagitta stays below
+    `chordal_error`, capped at MAX_CHORD_ANGLE.
+    """
+    if chordal_error >= radius or math.isinf(radius):
+        return MAX_CHORD_ANGLE
+    return min(MAX_CHORD_ANGLE, 2.0 * math.acos(1.0 - chordal_error / radius))
+
+
+def mesh_adaptive(shape, chordal_error, angular_tolerance):
+    """
+    Tessellates a shape with a chord angle chosen from each face's radius.
+    BRepMesh only keeps a shared edge consistent between faces meshed in the
+    same call, so the faces are meshed in passes from the finest angle up:
+    every pass meshes the next group together with the faces already done,
+    whose edge polygons are then reused instead of being rediscretised.
+    Faces without a constant radius use `angular_tolerance`.
+    """
+    groups = {}
+    for face in shape.Faces():
+        radius = feature_radius(face)
+        angle = angular_tolerance if radius is None else chord_angle(radius, chordal_error)
+        groups.setdefault(angle, []).append(face)
+
+    meshed = []
+    for angle in sorted(groups):
+        meshed.extend(groups[angle])
+        BRepMesh_IncrementalMesh(cq.Compound.makeCompound(meshed).wrapped, chordal_error, False, angle, False)
+
+
+def face_triangles(face):
+    """
+    (vertices (N, 3), faces (M, 3)) of a meshed face, in model coordinates
+    and oriented outwards; None if the face has no triangulation.
+    """
+    location = TopLoc_Location()
+    triangulation = BRep_Tool.Triangulation_s(face.wrapped, location)
+    if triangulation is None:
+        return None
+
+    vertices = np.array([triangulation.Node(i).Coord() for i in range(1, triangulation.NbNodes() + 1)])
+    if not location.IsIdentity():
+        vertices = apply_transform(vertices, trsf_matrix(location.Transformation()))
+    faces = np.array([
+        triangulation.Triangle(i).Get()
+        for i in range(1, triangulation.NbTriangles() + 1)
+    ], dtype=np.int64).reshape(-1, 3) - 1
+
+    if face.wrapped.Orientation() == TopAbs_REVERSED:
+        faces = faces[:, ::-1]
+    return vertices, faces
+
+
+def mesh_units(model):
+    """
+    The pieces a model is meshed in: its solids, or the shapes themselves
+    if they hold no solid (faces, shells).
+    """
+    if isinstance(model, cq.Workplane):
+        shapes = [v for v in model.vals() if isinstance(v, cq.Shape)]
+    elif isinstance(model, (list, tuple)):
+        shapes = list(model)
+    else:
+        shapes = [model]
+
+    units = []
+    for shape in shapes:
+        units.extend(shape.Solids() or [shape])
+    return units
+
+
+def mesh_unit(unit, tolerance, angular_tolerance, chordal_error=None):
+    """
+    Tessellates one unit with uniform or adaptive (chordal_error) settings.
+    """
+    if chordal_error:
+        mesh_adaptive(unit, chordal_error, angular_tolerance)
+    else:
+        mesh_shape(unit, tolerance, angular_tolerance)
+
+
+def unit_triangles(unit):
+    """
+    Triangles of every meshed face of a unit, face by face.
+    """
+    for face in unit.Faces():
+        triangles = face_triangles(face)
+        if triangles is not None:
+            yield triangles
+
+
+def stacked_triangles(pieces):
+    """
+    One (vertices, faces) buffer from per-face (vertices, faces) pieces.
+    """
+    vertices = []
+    faces = []
+    offset = 0
+    for v, f in pieces:
+        vertices.append(v)
+        faces.append(f + offset)
+        offset += len(v)
+    if not faces:
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+    return np.vstack(vertices), np.vstack(faces)
+
+
+def shape_mesh(shape, tolerance=0.01, angular_tolerance=0.1, chordal_error=None):
+    """
+    Tessellates a shape into one mesh.Mesh. The face triangulations share
+    their edge nodes, so coincident vertices are merged and the mesh is
+    indexed like a closed surface.
+    """
+    pieces = []
+    for unit in mesh_units(shape):
+        mesh_unit(unit, tolerance, angular_tolerance, chordal_error)
+        pieces.extend(unit_triangles(unit))
+        BRepTools.Clean_s(unit.wrapped)
+    return weld(Mesh(*stacked_triangles(pieces)))
+
+
+# ==============================================================================
+# 2. PARALLEL TESSELLATION
+# ==============================================================================
+def parallel_units(model, n_chunks, chordal_error=None):
+    """
+    Independent pieces for a process pool: the solids of the model, or -
+    for a single solid with uniform settings - chunks of its faces. With
+    uniform settings every face is meshed the same way on its own, so
+    shared edges still match across chunks. Adaptive meshing relies on
+    meshing neighbouring faces together and is only split by solid.
+    """
+    units = mesh_units(model)
+    if len(units) > 1 or chordal_error:
+        return units
+
+    faces = units[0].Faces()
+    bounds = np.linspace(0, len(faces), min(n_chunks, len(faces)) + 1).astype(int)
+    return [cq.Compound.makeCompound(faces[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _mesh_job(job):
+    """
+    Worker: meshes one unit and returns its triangles as one buffer.
+    """
+    unit, tolerance, angular_tolerance, chordal_error = job
+    mesh_unit(unit, tolerance, angular_tolerance, chordal_error)
+    return stacked_triangles(unit_triangles(unit))
+
+
+# ==============================================================================
+# 3. STREAMED STL
+# ==============================================================================
+def stream_stl(model, path, tolerance=0.01, angular_tolerance=0.1, chordal_error=None, processes=None):
+    """
+    Writes a Workplane, Shape or list of shapes to a binary STL, one solid
+    at a time. The triangulation of each solid is removed once it is
+    written. Pass `chordal_error` (mm) for per-face deflection, see
+    mesh_adaptive. With `processes` > 1 the pieces from parallel_units are
+    meshed in a process pool and their triangle buffers are written in
+    order. Instanced models (instances.Instanced) are meshed once per part
+    and written at every placement. Returns the number of triangles.
+    """
+    with StlWriter(path, b"cadquery_models streamed BRep") as stl:
+        if isinstance(model, Instanced):
+            for part in model.parts:
+                mesh = part.geometry
+                if not isinstance(mesh, Mesh):
+                    mesh = shape_mesh(mesh, tolerance, angular_tolerance, chordal_error)
+                for matrix in part.transforms:
+                    stl.write(apply_transform(mesh.vertices, matrix), mesh.faces)
+        elif processes and processes > 1:
+            jobs = [
+                (unit, tolerance, angular_tolerance, chordal_error)
+                for unit in parallel_units(model, 4 * processes, chordal_error)
+            ]
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                for triangles in pool.map(_mesh_job, jobs):
+                    stl.write(*triangles)
+        else:
+            for unit in mesh_units(model):
+                mesh_unit(unit, tolerance, angular_tolerance, chordal_error)
+                for triangles in unit_triangles(unit):
+                    stl.write(*triangles)
+                BRepTools.Clean_s(unit.wrapped)
+    return stl.count
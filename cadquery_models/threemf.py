@@ -0,0 +1,127 @@
+"""
+3MF export with instancing.
+
+A 3MF package is a zip holding one XML model. Every distinct geometry is
+written once as a mesh object; an instanced model (instances.Instanced)
+then becomes one component object that places those meshes with their
+transforms. A BCC lattice therefore stores the unit cell once instead of
+the triangles of every cell, and slicers treat the components as one part.
+
+The XML is written in chunks straight into the zip entry, so large meshes
+are never formatted in one piece.
+"""
+import zipfile
+
+import numpy as np
+
+from cadquery_models.instances import IDENTITY, Instanced
+from cadquery_models.mesh import Mesh
+from cadquery_models.tessellate import shape_mesh
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+ <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+ <Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+</Types>
+"""
+
+RELATIONSHIPS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+ <Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>
+"""
+
+MODEL_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<model unit="millimeter" xml:lang="en-US" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">
+ <resources>
+"""
+
+# Rows formatted per write
+CHUNK = 20000
+
+
+# ==============================================================================
+# 1. XML PIECES
+# ==============================================================================
+def transform_attribute(matrix):
+    """
+    3MF transform of a [R | t] matrix: the 3MF matrix acts on row vectors,
+    so it is R transposed followed by t ("m00 m01 m02 ... m30 m31 m32").
+    """
+    values = np.vstack([matrix[:, :3].T, matrix[:, 3]]).ravel()
+    return " ".join(f"{v:.9g}" for v in values)
+
+
+def _write_rows(stream, template, rows):
+    for start in range(0, len(rows), CHUNK):
+        block = rows[start:start + CHUNK]
+        stream.write(((template * len(block)) % tuple(block.ravel())).encode("utf-8"))
+
+
+def write_mesh_object(stream, object_id, mesh):
+    """
+    Writes one mesh object.
+    """
+    stream.write(f'  <object id="{object_id}" type="model">\n   <mesh>\n    <vertices>\n'.encode("utf-8"))
+    _write_rows(stream, '     <vertex x="%.6f" y="%.6f" z="%.6f"/>\n', np.asarray(mesh.vertices, dtype=float))
+    stream.write(b"    </vertices>\n    <triangles>\n")
+    _write_rows(stream, '     <triangle v1="%d" v2="%d" v3="%d"/>\n', np.asarray(mesh.faces, dtype=np.int64))
+    stream.write(b"    </triangles>\n   </mesh>\n  </object>\n")
+
+
+def write_components_object(stream, object_id, components):
+    """
+    Writes an object made of (mesh object id, [R | t]) components.
+    """
+    stream.write(f'  <object id="{object_id}" type="model">\n   <components>\n'.encode("utf-8"))
+    for mesh_id, matrix in components:
+        stream.write(
+            f'    <component objectid="{mesh_id}" transform="{transform_attribute(matrix)}"/>\n'.encode("utf-8")
+        )
+    stream.write(b"   </components>\n  </object>\n")
+
+
+# ==============================================================================
+# 2. EXPORT
+# ==============================================================================
+def as_mesh(geometry, tolerance, angular_tolerance, chordal_error):
+    if isinstance(geometry, Mesh):
+        return geometry
+    return shape_mesh(geometry, tolerance, angular_tolerance, chordal_error)
+
+
+def write_3mf(path, model, tolerance=0.01, angular_tolerance=0.1, chordal_error=None):
+    """
+    Writes a Workplane, Shape, mesh.Mesh or instances.Instanced model to a
+    3MF file. BRep geometry is tessellated once per distinct geometry.
+    Returns the number of triangles stored in the file.
+    """
+    if isinstance(model, Instanced):
+        parts = model.parts
+    else:
+        parts = [(model, IDENTITY[None])]
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", CONTENT_TYPES)
+        package.writestr("_rels/.rels", RELATIONSHIPS)
+
+        n_triangles = 0
+        components = []
+        with package.open("3D/3dmodel.model", "w") as stream:
+            stream.write(MODEL_HEADER.encode("utf-8"))
+            for mesh_id, (geometry, transforms) in enumerate(parts, start=1):
+                mesh = as_mesh(geometry, tolerance, angular_tolerance, chordal_error)
+                write_mesh_object(stream, mesh_id, mesh)
+                n_triangles += len(mesh.faces)
+                components.extend((mesh_id, matrix) for matrix in transforms)
+
+            # A single unplaced mesh is the build item itself
+            if len(components) == 1 and np.allclose(components[0][1], IDENTITY):
+                item_id = components[0][0]
+            else:
+                item_id = len(parts) + 1
+                write_components_object(stream, item_id, components)
+
+            stream.write(f' </resources>\n <build>\n  <item objectid="{item_id}"/>\n </build>\n</model>\n'.encode("utf-8"))
+
+    return n_triangles
@@ -0,0 +1,268 @@
+"""
+2D cell tilings for prismatic infills: honeycomb and Voronoi foam.
+
+Cells are produced in bulk as one polygon array (N, K, 2): N cells of at
+most K vertices, counter-clockwise, shorter polygons padded by repeating
+their last vertex (see cutters.py). Every cell is already inset by half
+the wall, so neighbouring holes are one wall apart, and the cells that
+reach past the core (outline shrunk by the perimeter wall) are clipped to
+it analytically.
+The holes can therefore go straight into one cross-section face
+(profile.section_face), without a boolean per cell.
+
+    honeycomb : regular hexagons, one template broadcast over the centres
+    voronoi   : cells of jittered seeds (needs SciPy), inset by intersecting
+                the half-planes of their edges, all cells at once
+
+Only the cells on the border of the core are clipped one by one; there are
+O(sqrt N) of them, so the cost stays near-linear in the cell count.
+"""
+import math
+
+import numpy as np
+
+from cadquery_models.cutters import EPS, MIN_AREA, core_profile, pad_polygons, polygon_areas, unpadded, widen
+from cadquery_models.outline import INSIDE, OUTSIDE, classify_boxes
+
+PATTERNS = ("honeycomb", "voronoi")
+
+
+# ==============================================================================
+# 1. CELLS
+# ==============================================================================
+def hex_centres(x_extent, y_extent, cell_size):
+    """
+    Centres of flat-topped hexagons `cell_size` across flats, covering
+    [-x_extent, x_extent] x [-y_extent, y_extent] with one spare ring.
+    Odd columns are shifted by half a cell, so the set is symmetric about
+    both axes (up to the spare ring).
+    """
+    pitch = 1.5 * cell_size / math.sqrt(3.0)
+    nx = int(x_extent / pitch) + 2
+    ny = int(y_extent / cell_size) + 2
+    i, j = np.meshgrid(np.arange(-nx, nx + 1), np.arange(-ny, ny + 1), indexing="ij")
+    return np.column_stack([(i * pitch).ravel(), (j * cell_size + (i % 2) * cell_size / 2.0).ravel()])
+
+
+def honeycomb_cells(x_extent, y_extent, cell_size, wall):
+    """
+    Hexagonal holes (N, 6, 2): a hexagon `cell_size - wall` across flats
+    at every centre.
+    """
+    radius = (cell_size - wall) / math.sqrt(3.0)
+    angles = np.arange(6) * (math.pi / 3.0)
+    template = radius * np.column_stack([np.cos(angles), np.sin(angles)])
+    return hex_centres(x_extent, y_extent, cell_size)[:, None, :] + template[None]
+
+
+def jittered_seeds(x_extent, y_extent, cell_size, randomness, seed):
+    """
+    Hexagon centres moved by up to `randomness` x half a cell in a random
+    direction. Randomness 0 gives the honeycomb back.
+    """
+    centres = hex_centres(x_extent, y_extent, cell_size)
+    rng = np.random.default_rng(seed)
+    reach = randomness * cell_size / 2.0 * np.sqrt(rng.random(len(centres)))
+    angle = rng.random(len(centres)) * (2.0 * math.pi)
+    return centres + reach[:, None] * np.column_stack([np.cos(angle), np.sin(angle)])
+
+
+def halfplane_polygons(normals, offsets):
+    """
+    Convex polygons {p : n . p <= d for every (n, d) of the row}, for rows
+    of unit `normals` (N, K, 2) and `offsets` (N, K); a row may repeat a
+    half-plane as padding. Every pair of lines is intersected and the
+    points inside all half-planes are the vertices, sorted by angle.
+    Returns (polygons (N, K', 2), keep (N,)): rows whose region is empty
+    or smaller than MIN_AREA are not kept.
+    """
+    a, b = np.triu_indices(normals.shape[1], 1)
+    na, nb = normals[:, a], normals[:, b]
+    da, db = offsets[:, a], offsets[:, b]
+    det = na[..., 0] * nb[..., 1] - na[..., 1] * nb[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        points = np.stack([
+            (da * nb[..., 1] - db * na[..., 1]) / det,
+            (na[..., 0] * db - nb[..., 0] * da) / det,
+        ], axis=-1)
+        slack = np.einsum("npc,nkc->npk", points, normals) - offsets[:, None, :]
+        valid = (np.abs(det) > EPS) & np.all(slack <= EPS, axis=2)
+    points = np.where(valid[..., None], points, 0.0)
+
+    # Counter-clockwise order around the mean of the vertices
+    count = valid.sum(axis=1)
+    centre = points.sum(axis=1) / np.maximum(count, 1)[:, None]
+    offset = points - centre[:, None, :]
+    angle = np.where(valid, np.arctan2(offset[..., 1], offset[..., 0]), np.inf)
+    order = np.argsort(angle, axis=1)
+    points = np.take_along_axis(points, order[..., None], axis=1)
+    valid = np.take_along_axis(valid, order, axis=1)
+
+    # Several lines through one vertex give repeated points
+    last = np.take_along_axis(points, np.maximum(count - 1, 0)[:, None, None], axis=1)
+    previous = np.concatenate([last, points[:, :-1]], axis=1)
+    repeat = np.all(np.abs(points - previous) <= EPS, axis=2) & (np.arange(points.shape[1]) < count[:, None])
+    repeat[:, 0] &= count > 1
+    unique = valid & ~repeat
+
+    # Unique vertices first, padded with the last one
+    order = np.argsort(~unique, axis=1, kind="stable")
+    points = np.take_along_axis(points, order[..., None], axis=1)
+    count = unique.sum(axis=1)
+    k = max(int(count.max(initial=0)), 3)
+    index = np.minimum(np.arange(k)[None], np.maximum(count - 1, 0)[:, None])
+    polygons = np.take_along_axis(points, index[..., None], axis=1)
+    return polygons, (count >= 3) & (polygon_areas(polygons) > MIN_AREA)
+
+
+def voronoi_cells(x_extent, y_extent, cell_size, wall, randomness=0.5, seed=0):
+    """
+    Voronoi holes (N, K, 2) of jittered seeds, each cell inset by half the
+    wall. The seeds reach two cells past the extent, so every kept cell is
+    closed by its neighbours.
+    """
+    try:
+        from scipy.spatial import Voronoi
+    except ImportError:
+        raise ValueError("Voronoi cells need SciPy (pip install scipy)") from None
+
+    margin = 2.0 * cell_size
+    seeds = jittered_seeds(x_extent + margin, y_extent + margin, cell_size, randomness, seed)
+    pairs = Voronoi(seeds).ridge_points
+    pairs = np.vstack([pairs, pairs[:, ::-1]])
+
+    # Cells of the seeds within one cell of the extent
+    kept = (np.abs(seeds[:, 0]) <= x_extent + cell_size) & (np.abs(seeds[:, 1]) <= y_extent + cell_size)
+    pairs = pairs[kept[pairs[:, 0]]]
+    pairs = pairs[np.argsort(pairs[:, 0], kind="stable")]
+    owners, start, count = np.unique(pairs[:, 0], return_index=True, return_counts=True)
+
+    # Neighbour table (N, K), short rows padded with their first neighbour
+    row = np.repeat(np.arange(len(owners)), count)
+    column = np.arange(len(pairs)) - np.repeat(start, count)
+    neighbours = np.repeat(pairs[start, 1][:, None], count.max(), axis=1)
+    neighbours[row, column] = pairs[:, 1]
+
+    # Edge of a cell: bisector with a neighbour, moved in by half the wall
+    p = seeds[owners][:, None, :]
+    q = seeds[neighbours]
+    normals = (q - p) / np.linalg.norm(q - p, axis=2, keepdims=True)
+    offsets = np.einsum("nkc,nkc->nk", normals, (p + q) / 2.0) - wall / 2.0
+    polygons, keep = halfplane_polygons(normals, offsets)
+    return polygons[keep]
+
+
+# ==============================================================================
+# 2. CLIPPING TO THE CORE
+# ==============================================================================
+def vertical_extent(polygon, xs):
+    """
+    Lowest and highest y of a convex polygon on the vertical lines `xs`.
+    """
+    a, b = polygon, np.roll(polygon, -1, axis=0)
+    dx = b[:, 0] - a[:, 0]
+    x = xs[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (x - a[:, 0]) / dx
+        y = a[:, 1] + t * (b[:, 1] - a[:, 1])
+    on_edge = (np.abs(dx) > EPS) & (t >= -EPS) & (t <= 1.0 + EPS)
+    on_vertex = np.abs(x - a[:, 0]) <= EPS
+    y = np.where(on_edge, y, np.nan)
+    y_vertex = np.where(on_vertex, a[:, 1], np.nan)
+    candidates = np.concatenate([y, y_vertex], axis=1)
+    return np.nanmin(candidates, axis=1), np.nanmax(candidates, axis=1)
+
+
+def crossings(xs, values):
+    """
+    X where the piecewise linear `values` (sampled on `xs`) change sign.
+    """
+    a, b = values[:-1], values[1:]
+    change = a * b < 0.0
+    return xs[:-1][change] + (xs[1:] - xs[:-1])[change] * a[change] / (a - b)[change]
+
+
+def clip_to_core(polygon, profile):
+    """
+    Pieces of a convex polygon inside the core {|y| <= h(x)} of a core
+    profile (xs, h). Between the breakpoints (polygon vertices, profile
+    vertices and the crossings between them) every boundary is linear, so
+    each piece is its lower boundary followed by its upper boundary.
+    """
+    px, ph = profile
+    x_low = max(polygon[:, 0].min(), px[0])
+    x_high = min(polygon[:, 0].max(), px[-1])
+    if x_high - x_low <= EPS:
+        return []
+
+    def bounds(xs):
+        lo, hi = vertical_extent(polygon, xs)
+        h = np.interp(xs, px, ph)
+        return lo, hi, h
+
+    xs = np.concatenate([[x_low, x_high], polygon[:, 0], px])
+    xs = np.unique(xs[(xs >= x_low) & (xs <= x_high)])
+    lo, hi, h = bounds(xs)
+    xs = np.unique(np.concatenate([xs, crossings(xs, hi - h), crossings(xs, lo + h)]))
+    lo, hi, h = bounds(xs)
+    lower, upper = np.maximum(lo, -h), np.minimum(hi, h)
+    xs = np.unique(np.concatenate([xs, crossings(xs, upper - lower)]))
+    lo, hi, h = bounds(xs)
+    lower, upper = np.maximum(lo, -h), np.minimum(hi, h)
+
+    # Runs of lines where the section is not empty
+    filled = upper - lower >= -EPS
+    pieces = []
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], filled.astype(np.int8), [0]])))
+    for start, stop in zip(edges[::2], edges[1::2]):
+        ring = np.concatenate([
+            np.column_stack([xs[start:stop], lower[start:stop]]),
+            np.column_stack([xs[start:stop], upper[start:stop]])[::-1],
+        ])
+        ring = unpadded(ring)
+        if len(ring) > 1 and np.all(np.abs(ring[0] - ring[-1]) <= EPS):
+            ring = ring[:-1]
+        if len(ring) >= 3 and polygon_areas(ring) > MIN_AREA:
+            pieces.append(ring)
+    return pieces
+
+
+# ==============================================================================
+# 3. SPECIMEN LAYOUT
+# ==============================================================================
+def specimen_cells(outline, pattern, cell_size, wall, perimeter_wall,
+                   rotate=False, randomness=0.5, seed=0, tolerance=0.01):
+    """
+    Hole polygons (N, K, 2) of a honeycomb or Voronoi infill, clipped to
+    the outline shrunk by `perimeter_wall`. `rotate` turns the tiling by 90
+    degrees (pointy-topped hexagons).
+    """
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unknown cell pattern: {pattern} (use {', '.join(PATTERNS)})")
+    if not 0.0 <= wall < cell_size:
+        raise ValueError(f"Wall thickness ({wall}) must be smaller than the cell size ({cell_size})")
+
+    x_extent, y_extent = outline.x_total, outline.y_grip
+    if rotate:
+        x_extent, y_extent = y_extent, x_extent
+    if pattern == "honeycomb":
+        cells = honeycomb_cells(x_extent, y_extent, cell_size, wall)
+    else:
+        cells = voronoi_cells(x_extent, y_extent, cell_size, wall, randomness, seed)
+    if rotate:
+        # Swapping X and Y mirrors the cells: restore counter-clockwise order
+        cells = cells[:, ::-1, ::-1]
+
+    low, high = cells.min(axis=1), cells.max(axis=1)
+    state = classify_boxes(outline, low[:, 0], high[:, 0], low[:, 1], high[:, 1], perimeter_wall)
+    inside = cells[state == INSIDE]
+
+    profile = core_profile(outline, perimeter_wall, tolerance)
+    clipped = [
+        piece
+        for cell in cells[(state != INSIDE) & (state != OUTSIDE)]
+        for piece in clip_to_core(unpadded(cell), profile)
+    ]
+    clipped = pad_polygons(clipped)
+    k = max(inside.shape[1], clipped.shape[1])
+    return np.concatenate([widen(inside, k), widen(clipped, k)])
@@ -0,0 +1,212 @@
+"""
+TPMS infill (gyroid, Schwarz diamond) and BCC struts as implicit fields.
+
+A triply periodic minimal surface is the zero level of a trigonometric
+function f. The infill is a sheet of constant wall thickness around that
+surface: |f| / |grad f| approximates the distance to the surface, so
+
+    sheet = |f| / |grad f| - wall / 2
+
+is negative inside the wall. The "bcc" infill uses the exact distance to
+the struts of a body-centred cubic cell instead (wall = strut diameter).
+The specimen is the same open frame as the strut lattice (outline minus the
+core inset by the perimeter wall, through the full thickness) with the
+infill filling the core:
+
+    specimen = max(body, min(-core, sheet))
+
+All terms broadcast over the grid axes (see implicit.py): the trigonometry
+runs on the axes only and the outline distances on one XY layer.
+
+For adaptive sampling every term is bounded over a ball: the outline
+distance and the strut distance are 1-Lipschitz, the core field is
+Lipschitz with the steepest slope of the inset arc, and a TPMS sheet is
+decided from f and grad f at the centre with global bounds of the gradient
+and Hessian of f.
+"""
+import math
+from functools import partial
+
+import numpy as np
+
+from cadquery_models.implicit import Implicit, lipschitz_state, state_max, state_min
+from cadquery_models.outline import half_widths, signed_distance
+
+
+# ==============================================================================
+# 1. SURFACES
+# ==============================================================================
+def gyroid(x, y, z, period):
+    """
+    Gyroid sin X cos Y + sin Y cos Z + sin Z cos X and its gradient (per mm).
+    """
+    k = 2.0 * math.pi / period
+    sx, cx, sy, cy, sz, cz = np.sin(k * x), np.cos(k * x), np.sin(k * y), np.cos(k * y), np.sin(k * z), np.cos(k * z)
+    value = sx * cy + sy * cz + sz * cx
+    gradient = (k * (cx * cy - sz * sx), k * (cy * cz - sx * sy), k * (cz * cx - sy * sz))
+    return value, gradient
+
+
+def diamond(x, y, z, period):
+    """
+    Schwarz D surface sXsYsZ + sXcYcZ + cXsYcZ + cXcYsZ and its gradient.
+    """
+    k = 2.0 * math.pi / period
+    sx, cx, sy, cy, sz, cz = np.sin(k * x), np.cos(k * x), np.sin(k * y), np.cos(k * y), np.sin(k * z), np.cos(k * z)
+    value = sx * sy * sz + sx * cy * cz + cx * sy * cz + cx * cy * sz
+    gradient = (
+        k * (cx * sy * sz + cx * cy * cz - sx * sy * cz - sx * cy * sz),
+        k * (sx * cy * sz - sx * sy * cz + cx * cy * cz - cx * sy * sz),
+        k * (sx * sy * cz - sx * cy * sz - cx * sy * sz + cx * cy * cz),
+    )
+    return value, gradient
+
+
+SURFACES = {"gyroid": gyroid, "diamond": diamond}
+
+# Bounds of |grad f| / k and of the Frobenius norm of the Hessian / k^2
+# (Cauchy-Schwarz on each component; for the diamond f_xx = -f with
+# f^2 <= 2 and f_xy^2 + f_xz^2 <= 2)
+SURFACE_BOUNDS = {
+    "gyroid": (math.sqrt(3.0), math.sqrt(5.0)),
+    "diamond": (math.sqrt(6.0), 2.0 * math.sqrt(3.0)),
+}
+
+INFILLS = tuple(SURFACES) + ("bcc",)
+
+# Samples across the sheet (or strut): with fewer the mesh has not converged
+# (the sheet volume of a 0.5 mm gyroid is 2.5% low at 0.2 mm voxels, 0.8%
+# at 0.125 mm)
+VOXELS_PER_WALL = 4
+
+
+def bcc_distance(x, y, z, period):
+    """
+    Distance to the struts (corner to centre) of body-centred cubic cells
+    of size `period`, one cell centred on the origin. The strut set is
+    symmetric about every cell face and axis, so the point is folded into
+    one octant of its cell, where only the strut to (h, h, h) is nearest.
+    """
+    h = period / 2.0
+    qx, qy, qz = (np.abs(np.mod(c + h, period) - h) for c in (x, y, z))
+    t = (qx + qy + qz) / (3.0 * h)
+    return np.sqrt((qx - t * h) ** 2 + (qy - t * h) ** 2 + (qz - t * h) ** 2)
+
+
+def sheet_field(surface, x, y, z, period, wall):
+    """
+    Negative inside a sheet of thickness `wall` around a TPMS, or inside
+    BCC struts of diameter `wall`.
+    """
+    if surface == "bcc":
+        return bcc_distance(x, y, z, period) - wall / 2.0
+
+    value, (gx, gy, gz) = SURFACES[surface](x, y, z, period)
+    slope = np.sqrt(gx * gx + gy * gy + gz * gz)
+    return np.abs(value) / np.maximum(slope, 1e-9) - wall / 2.0
+
+
+def sheet_state(surface, x, y, z, period, wall, radius):
+    """
+    State (see implicit.py) of the sheet in balls of `radius`. Within the
+    ball |grad f| stays within slope +- H r (H: Hessian bound) and |f|
+    moves by at most slope r + H r^2 / 2 (Taylor); the sheet is absent if
+    |f| beats the wall everywhere, and present if it never does.
+    """
+    if surface == "bcc":
+        return lipschitz_state(bcc_distance(x, y, z, period) - wall / 2.0, 1.0, radius)
+
+    k = 2.0 * math.pi / period
+    gradient_bound, hessian_bound = SURFACE_BOUNDS[surface]
+    value, (gx, gy, gz) = SURFACES[surface](x, y, z, period)
+    slope = np.sqrt(gx * gx + gy * gy + gz * gz)
+
+    spread = hessian_bound * k * k * radius
+    slope_max = np.minimum(slope + spread, gradient_bound * k) * (1.0 + 1e-9)
+    slope_min = (slope - spread) * (1.0 - 1e-9)
+    change = (slope + spread / 2.0) * radius * (1.0 + 1e-9) + 1e-12
+    low = np.abs(value) - change
+    high = np.abs(value) + change
+
+    empty = low > wall / 2.0 * slope_max
+    solid = high < wall / 2.0 * slope_min
+    return np.where(empty, 1, np.where(solid, -1, 0)).astype(np.int8)
+
+
+# ==============================================================================
+# 2. SPECIMEN
+# ==============================================================================
+def wall_voxel(wall):
+    """
+    Largest voxel size that puts VOXELS_PER_WALL samples across a sheet
+    (or strut diameter) of `wall` mm.
+    """
+    return wall / VOXELS_PER_WALL
+
+
+def core_field(outline, x, y, inset):
+    """
+    Negative inside the outline shrunk by `inset` (the lattice core).
+    """
+    return np.maximum(np.abs(y) - half_widths(outline, x, inset), np.abs(x) - (outline.x_total - inset))
+
+
+def core_lipschitz(outline, inset):
+    """
+    Lipschitz constant of core_field: its steepest slope is where the inset
+    transition arc meets the inset grip line.
+    """
+    r_off = outline.radius + inset
+    depth = outline.y_narrow + outline.radius - (outline.y_grip - inset)
+    return math.hypot(1.0, math.sqrt(max(r_off**2 - depth**2, 0.0)) / depth)
+
+
+def tpms_field(x, y, z, outline, thickness, perimeter_wall, surface, period, wall):
+    """
+    Field of the framed TPMS specimen (Z from 0 to thickness, surface
+    centred on the middle of the specimen).
+    """
+    body = np.maximum(-signed_distance(outline, x, y), np.abs(z - thickness / 2.0) - thickness / 2.0)
+    core = core_field(outline, x, y, perimeter_wall)
+    sheet = sheet_field(surface, x, y, z - thickness / 2.0, period, wall)
+    return np.maximum(body, np.minimum(-core, sheet))
+
+
+def tpms_classify(x, y, z, radius, outline, thickness, perimeter_wall, surface, period, wall):
+    """
+    State of tpms_field in balls of `radius` around (x, y, z).
+    """
+    body = np.maximum(-signed_distance(outline, x, y), np.abs(z - thickness / 2.0) - thickness / 2.0)
+    core = core_field(outline, x, y, perimeter_wall)
+    return state_max(
+        lipschitz_state(body, 1.0, radius),
+        state_min(
+            -lipschitz_state(core, core_lipschitz(outline, perimeter_wall), radius),
+            sheet_state(surface, x, y, z - thickness / 2.0, period, wall, radius),
+        ),
+    )
+
+
+def tpms_specimen(outline, thickness, perimeter_wall, surface, period, wall, voxel, adaptive=True):
+    """
+    Implicit model of a dogbone with a TPMS sheet (or BCC strut) infill,
+    sampled every `voxel` mm (None: wall_voxel(wall)) with at least one
+    empty layer around the specimen. The margin of 1.5 voxels keeps the
+    samples off the flat faces, whose points would otherwise coincide.
+    With `adaptive` only the blocks that tpms_classify cannot decide are
+    sampled.
+    """
+    if surface not in INFILLS:
+        raise ValueError(f"Unknown TPMS surface: {surface} (use {', '.join(INFILLS)})")
+
+    if voxel is None:
+        voxel = wall_voxel(wall)
+    margin = 1.5 * voxel
+    settings = dict(
+        outline=outline, thickness=thickness, perimeter_wall=perimeter_wall,
+        surface=surface, period=period, wall=wall,
+    )
+    low = (-outline.x_total - margin, -outline.y_grip - margin, -margin)
+    high = (outline.x_total + margin, outline.y_grip + margin, thickness + margin)
+    classify = partial(tpms_classify, **settings) if adaptive else None
+    return Implicit(partial(tpms_field, **settings), low, high, voxel, classify)
@@ -0,0 +1,46 @@
+"""
+Export cache keys follow what determines the file; eviction is LRU.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from cadquery_models.cache import ExportCache
+
+SPECIMEN = "iso527_1b_circular"
+
+
+def test_key_follows_resolved_options(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    key = cache.key(SPECIMEN, {}, "step")
+    assert cache.key(SPECIMEN, {}, "step", options={"QUADRANT_SYMMETRY": False}) == key
+    assert cache.key(SPECIMEN, {}, "step", options={"QUADRANT_SYMMETRY": True}) != key
+
+
+def test_hit_on_equal_options_and_miss_on_changed(tmp_path):
+    cache = ExportCache(str(tmp_path / "cache"))
+    src = tmp_path / "model.stl"
+    src.write_bytes(b"solid")
+    cache.put(cache.key(SPECIMEN, {"hole_radius": 1.0}, "stl", 0.01, 0.1), "stl", str(src))
+
+    assert cache.get(cache.key(SPECIMEN, {"hole_radius": 1.0}, "stl", 0.01, 0.1), "stl") is not None
+    assert cache.get(cache.key(SPECIMEN, {"hole_radius": 1.5}, "stl", 0.01, 0.1), "stl") is None
+    assert cache.get(cache.key(SPECIMEN, {"hole_radius": 1.0}, "stl", 0.02, 0.1), "stl") is None
+    # STEP output does not depend on the tessellation settings
+    assert cache.key(SPECIMEN, {}, "step", 0.01, 0.1) == cache.key(SPECIMEN, {}, "step", 0.02, 0.1)
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ExportCache(str(tmp_path / "cache"), max_bytes=250)
+    src = tmp_path / "model.stl"
+    src.write_bytes(b"x" * 100)
+    keys = [f"{i:02x}" * 32 for i in range(3)]
+    for age, key in enumerate(keys[:2]):
+        cache.put(key, "stl", str(src))
+        os.utime(cache.path(key, "stl"), (1000 + age, 1000 + age))
+    cache.get(keys[0], "stl")  # keys[1] is now the least recently used
+
+    cache.put(keys[2], "stl", str(src))
+    assert [os.path.exists(cache.path(key, "stl")) for key in keys] == [True, False, True]
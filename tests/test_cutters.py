@@ -0,0 +1,67 @@
+"""
+Holes screened by cutter_problems() must give valid cross-sections and
+watertight meshes.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import cadquery as cq
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from cadquery_models import registry
+from cadquery_models.cutters import Cutters, cutter_polygons, cutter_problems, polygon_areas, polygon_cutters, section_mesh, section_triangles
+from cadquery_models.mesh import is_watertight, mesh_volume
+from cadquery_models.outline import dogbone_outline, signed_distance
+from cadquery_models.profile import outline_wire
+from cadquery_models.tiling import specimen_cells
+
+OUTLINE = (150.0, 60.0, 10.0, 20.0, 60.0)
+
+
+def solid(model):
+    return model.val() if hasattr(model, "val") else model
+
+
+@pytest.mark.parametrize("key, options", [
+    # holes tangent to the outline
+    ("iso527_1b_circular", {"hole_spacing": 3.5, "hole_radius": 1.5, "perimeter_clearance": 0.0}),
+    # cells slightly outside the outline
+    ("iso527_1b_auxetic", {"margin": -0.5}),
+])
+def test_holes_on_the_outline_build_valid(key, options):
+    assert solid(registry.build(key, options)).isValid()
+
+
+def test_tangent_hole_is_flagged():
+    outline = dogbone_outline(*OUTLINE)
+    # gauge edge at y = 5: the first hole touches it, the second keeps 0.5 mm
+    cutters = Cutters(np.array([[0.0, 4.0], [20.0, 0.0]]), None, 1.0)
+    problems = cutter_problems(outline, cutters)
+    assert len(problems) == 1 and problems[0].startswith("1 holes touch")
+    assert not cutter_problems(outline, cutters._replace(centres=cutters.centres[1:]))
+
+
+@pytest.mark.parametrize("pattern", ["honeycomb", "circles"])
+def test_section_mesh_is_watertight(pattern):
+    outline = dogbone_outline(*OUTLINE)
+    if pattern == "honeycomb":
+        cutters = polygon_cutters(specimen_cells(outline, "honeycomb", 3.0, 0.6, 0.8))
+    else:
+        x, y = np.meshgrid(np.arange(-66.0, 67.0, 3.0), np.arange(-6.0, 7.0, 3.0))
+        centres = np.column_stack([x.ravel(), y.ravel()])
+        cutters = Cutters(centres[signed_distance(outline, *centres.T) > 1.5], None, 1.0)
+    assert not cutter_problems(outline, cutters)
+
+    points, triangles = section_triangles(outline, cutters)
+    assert np.all(polygon_areas(points[triangles]) > 0.0)
+
+    mesh = section_mesh(outline, cutters, 4.0)
+    assert is_watertight(mesh)
+    # The arcs of the outline and the circles are chorded to 0.01 mm
+    face = cq.Face.makeFromWires(outline_wire(outline))
+    holes = polygon_areas(cutter_polygons(cutters)).sum()
+    assert mesh_volume(mesh) == pytest.approx(4.0 * (face.Area() - holes), rel=1e-3)
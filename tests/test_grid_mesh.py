@@ -0,0 +1,31 @@
+"""
+The direct grid mesh must be watertight and match the BRep grid specimen.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from cadquery_models import registry
+from cadquery_models.batch import run_job
+from cadquery_models.mesh import is_watertight, mesh_volume
+
+
+def test_grid_mesh_matches_brep():
+    mesh = registry.build("iso527_1b_grid_mesh")
+    solid = registry.build("iso527_1b_grid")
+    solid = solid.val() if hasattr(solid, "val") else solid
+
+    assert is_watertight(mesh)
+    # Arcs are chorded to 0.01 mm in the mesh
+    assert abs(mesh_volume(mesh) - solid.Volume()) < 0.5
+
+
+def test_grid_mesh_job_skips_step(tmp_path):
+    job = {"name": "grid_mesh", "specimen": "iso527_1b_grid_mesh", "params": {}}
+    result = run_job(job, str(tmp_path), ("stl", "step"), 0.01, 0.1)
+
+    assert result["status"] == "ok", result.get("error")
+    assert list(result["files"]) == ["stl"] and list(result["skipped"]) == ["step"]
+    assert os.path.getsize(result["files"]["stl"]["path"]) > 0
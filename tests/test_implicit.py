@@ -0,0 +1,36 @@
+"""
+Adaptive sampling must give the mesh of dense sampling.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from cadquery_models.implicit import implicit_mesh
+from cadquery_models.outline import dogbone_outline
+from cadquery_models.tpms import tpms_specimen
+
+
+def sorted_vertices(mesh):
+    vertices = np.asarray(mesh.vertices)
+    return vertices[np.lexsort(vertices.T[::-1])]
+
+
+@pytest.mark.parametrize("period", [3.0, 4.0, 5.0])
+def test_adaptive_bcc_matches_dense(period):
+    # 40 mm of the ISO 527-2 Type 1B gauge and shoulder, 0.25 mm voxels: the
+    # slab boundaries cross the struts, where the shared sample layer is used
+    # by both slabs
+    outline = dogbone_outline(150.0, 60.0, 10.0, 20.0, 60.0)
+    model = tpms_specimen(outline, 4.0, 0.8, "bcc", period, 0.5, 0.25, adaptive=True)
+    model = model._replace(low=(-30.0,) + tuple(model.low[1:]), high=(10.0,) + tuple(model.high[1:]))
+
+    adaptive = implicit_mesh(model)
+    dense = implicit_mesh(model._replace(classify=None))
+
+    assert len(adaptive.faces) == len(dense.faces)
+    np.testing.assert_array_equal(sorted_vertices(adaptive), sorted_vertices(dense))
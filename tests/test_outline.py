@@ -0,0 +1,62 @@
+"""
+The vectorized outline queries must agree with the exact outline.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from cadquery_models.outline import classify_box, classify_boxes, dogbone_outline, half_widths, signed_distance
+
+# ISO 527-2 Type 1B
+OUTLINE = dogbone_outline(150.0, 60.0, 10.0, 20.0, 60.0)
+
+
+def boundary_points(outline, count=200001):
+    """
+    Dense samples of the top-right quadrant of the outline: sides, then end.
+    """
+    x = np.linspace(0.0, outline.x_total, count)
+    y = np.linspace(0.0, outline.y_grip, count // 10)
+    sides = np.column_stack([x, half_widths(outline, x)])
+    end = np.column_stack([np.full_like(y, outline.x_total), y])
+    return np.vstack([sides, end])
+
+
+def test_signed_distance_known_points():
+    o = OUTLINE
+    x = np.array([0.0, 0.0, 0.0, o.x_total, o.x_total - 1.0, -o.x_total - 2.0])
+    y = np.array([0.0, o.y_narrow, o.y_narrow + 1.0, 0.0, 0.0, 0.0])
+    np.testing.assert_allclose(signed_distance(o, x, y), [o.y_narrow, 0.0, -1.0, 0.0, 1.0, -2.0], atol=1e-9)
+
+
+def test_signed_distance_matches_dense_samples():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-80.0, 80.0, 500)
+    y = rng.uniform(-12.0, 12.0, 500)
+    boundary = boundary_points(OUTLINE)
+
+    distance = signed_distance(OUTLINE, x, y)
+    nearest = np.array([np.hypot(*(boundary - (abs(px), abs(py))).T).min() for px, py in zip(x, y)])
+    # Sample spacing is below 1e-3 mm
+    np.testing.assert_allclose(np.abs(distance), nearest, atol=1e-3)
+    inside = (np.abs(x) < OUTLINE.x_total) & (np.abs(y) < half_widths(OUTLINE, x))
+    assert np.all((distance > 0) == inside)
+
+
+@pytest.mark.parametrize("inset", [0.0, 0.8])
+def test_classify_boxes_matches_classify_box(inset):
+    rng = np.random.default_rng(1)
+    x0 = rng.uniform(-80.0, 80.0, 2000)
+    y0 = rng.uniform(-12.0, 12.0, 2000)
+    x1 = x0 + rng.uniform(0.0, 6.0, 2000)
+    y1 = y0 + rng.uniform(0.0, 6.0, 2000)
+
+    states = classify_boxes(OUTLINE, x0, x1, y0, y1, inset)
+    expected = [classify_box(OUTLINE, *box, inset) for box in zip(x0, x1, y0, y1)]
+    assert states.tolist() == expected
+    assert len(set(expected)) == 3
@@ -0,0 +1,31 @@
+"""
+Quadrant builds must give the same solid as full builds.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from cadquery_models import registry
+
+
+def build_solid(key, quadrant):
+    model = registry.build(key, options={"QUADRANT_SYMMETRY": quadrant})
+    return model.val() if hasattr(model, "val") else model
+
+
+@pytest.mark.parametrize("key", ["iso527_1b_circular", "iso527_1b_auxetic", "iso527_1b_grid"])
+def test_quadrant_matches_full(key):
+    full = build_solid(key, False)
+    quadrant = build_solid(key, True)
+
+    assert quadrant.isValid()
+    assert len(quadrant.Solids()) == 1
+    # Volume() can differ by a few 1e-5 of the volume (see symmetry.py)
+    assert quadrant.Volume() == pytest.approx(full.Volume(), rel=1e-4)
+    full_box, quadrant_box = full.BoundingBox(), quadrant.BoundingBox()
+    assert (quadrant_box.xmin, quadrant_box.xmax, quadrant_box.ymin, quadrant_box.ymax) == pytest.approx(
+        (full_box.xmin, full_box.xmax, full_box.ymin, full_box.ymax), abs=1e-6)
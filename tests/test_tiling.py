@@ -0,0 +1,49 @@
+"""
+Tiled cells must be disjoint holes inside the core of the outline.
+
+    python -m pytest tests
+"""
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from cadquery_models.cutters import cutter_problems, polygon_areas, polygon_cutters
+from cadquery_models.outline import dogbone_outline, signed_distance
+from cadquery_models.tiling import specimen_cells
+
+OUTLINE = dogbone_outline(150.0, 60.0, 10.0, 20.0, 60.0)
+PERIMETER_WALL = 0.8
+
+
+@pytest.mark.parametrize("pattern, rotate", [("honeycomb", False), ("honeycomb", True), ("voronoi", False)])
+def test_cells_are_disjoint_and_inside(pattern, rotate):
+    if pattern == "voronoi":
+        pytest.importorskip("scipy")
+    cells = specimen_cells(OUTLINE, pattern, 2.0, 0.4, PERIMETER_WALL, rotate=rotate)
+
+    assert len(cells) > 100
+    assert np.all(polygon_areas(cells) > 0.0)
+    # Clipped cells follow the core with chords of the 0.01 mm tolerance
+    assert np.all(signed_distance(OUTLINE, cells[..., 0], cells[..., 1]) >= PERIMETER_WALL - 0.01)
+    assert cutter_problems(OUTLINE, polygon_cutters(cells), PERIMETER_WALL) == []
+
+
+def test_honeycomb_cells_are_inset_by_half_the_wall():
+    cell_size, wall = 2.0, 0.4
+    cells = specimen_cells(OUTLINE, "honeycomb", cell_size, wall, PERIMETER_WALL)
+    # Unclipped cells: hexagons `cell_size - wall` across flats
+    full = math.sqrt(3.0) / 2.0 * (cell_size - wall) ** 2
+    areas = polygon_areas(cells)
+    assert np.sum(np.isclose(areas, full)) > 0.7 * len(cells)
+    assert np.all(areas <= full + 1e-9)
+
+
+def test_voronoi_cells_follow_the_seed():
+    pytest.importorskip("scipy")
+    first = specimen_cells(OUTLINE, "voronoi", 2.0, 0.4, PERIMETER_WALL, seed=3)
+    assert np.array_equal(first, specimen_cells(OUTLINE, "voronoi", 2.0, 0.4, PERIMETER_WALL, seed=3))
+    assert not np.array_equal(first, specimen_cells(OUTLINE, "voronoi", 2.0, 0.4, PERIMETER_WALL, seed=4))